@@ -0,0 +1,175 @@
+"""
+Check YAML backend parity and measure frontmatter parse throughput.
+
+Every note in the corpus is parsed with each backend and compared with the
+pure-Python PyYAML result (values, types and errors). Then each backend is
+timed over the whole corpus.
+
+Usage:
+    python bench_yaml.py [corpus_dir] [options]
+
+Examples:
+    # Parity check and benchmark on the bundled corpus
+    python bench_yaml.py
+
+    # Benchmark a real vault, 3 rounds, JSON output
+    python bench_yaml.py "d:\vault" --repeat 3 --format json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from utils import find_markdown_files, HEADER_RE
+from yaml_backend import BACKENDS, CSafeLoader, FastPathUnsupported, fast_load, load_yaml
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / 'tests' / 'yaml_corpus'
+
+
+def load_headers(corpus_path: str) -> List[Tuple[str, str]]:
+    """Return (file_path, yaml_block) for every note with frontmatter."""
+    headers = []
+    for file_path in sorted(find_markdown_files(corpus_path)):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            match = HEADER_RE.match(f.read())
+        if match:
+            headers.append((file_path, match.group(1)))
+    return headers
+
+
+def _normalize(value: Any) -> Any:
+    """Make values comparable with their types, so 1, 1.0 and True differ."""
+    if isinstance(value, dict):
+        return ('dict', [(_normalize(k), _normalize(v)) for k, v in value.items()])
+    if isinstance(value, list):
+        return ('list', [_normalize(v) for v in value])
+    return (type(value).__name__, repr(value))
+
+
+def _outcome(text: str, backend: str) -> Any:
+    try:
+        return ('ok', _normalize(load_yaml(text, backend)))
+    except Exception as e:
+        return ('error', type(e).__name__, str(e))
+
+
+def check_parity(headers: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+    """Return the files where each backend disagrees with pure PyYAML."""
+    mismatches = {backend: [] for backend in BACKENDS}
+    for file_path, text in headers:
+        reference = _outcome(text, 'pyyaml')
+        for backend in BACKENDS:
+            if _outcome(text, backend) != reference:
+                mismatches[backend].append(file_path)
+    return mismatches
+
+
+def fast_path_coverage(headers: List[Tuple[str, str]]) -> int:
+    """Count headers the fast path parses without falling back."""
+    handled = 0
+    for _, text in headers:
+        try:
+            fast_load(text)
+            handled += 1
+        except FastPathUnsupported:
+            pass
+    return handled
+
+
+def measure_throughput(headers: List[Tuple[str, str]], repeat: int) -> Dict[str, float]:
+    """Return headers parsed per second for each backend (best of repeat rounds)."""
+    throughput = {}
+    texts = [text for _, text in headers]
+    for backend in BACKENDS:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for text in texts:
+                try:
+                    load_yaml(text, backend)
+                except Exception:
+                    pass
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        throughput[backend] = len(texts) / best if best else 0.0
+    return throughput
+
+
+def format_results_table(report: Dict[str, Any]) -> str:
+    """Format parity and throughput results as a table."""
+    output = []
+    output.append(f"\nCorpus: {report['corpus']}")
+    output.append(f"Headers: {report['headers']}")
+    output.append(f"Fast path coverage: {report['fast_path_handled']}/{report['headers']}")
+    output.append(f"libyaml available: {'yes' if report['libyaml_available'] else 'no'}\n")
+    output.append("=" * 80)
+    output.append(f"{'Backend':<12} {'Parity':<10} {'Headers/s':>15} {'vs pyyaml':>12}")
+    output.append("=" * 80)
+
+    baseline = report['throughput']['pyyaml'] or 1.0
+    for backend in BACKENDS:
+        mismatches = report['mismatches'][backend]
+        parity = 'ok' if not mismatches else f"{len(mismatches)} diff"
+        rate = report['throughput'][backend]
+        output.append(f"{backend:<12} {parity:<10} {rate:>15,.0f} {rate / baseline:>11.1f}x")
+
+    output.append("=" * 80)
+
+    for backend in BACKENDS:
+        for file_path in report['mismatches'][backend]:
+            output.append(f"Mismatch ({backend}): {file_path}")
+
+    return "\n".join(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check YAML backend parity and benchmark frontmatter parsing',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    parser.add_argument('corpus', nargs='?', default=str(DEFAULT_CORPUS),
+                        help='Folder of notes to parse (default: tests/yaml_corpus)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timing rounds per backend; the best round is reported (default: 5)')
+    parser.add_argument('--format', choices=['json', 'table'], default='table',
+                        help='Output format (default: table)')
+
+    args = parser.parse_args()
+
+    try:
+        headers = load_headers(args.corpus)
+        if not headers:
+            print(f"Error: No notes with frontmatter found in {args.corpus}", file=sys.stderr)
+            sys.exit(2)
+
+        report = {
+            'corpus': args.corpus,
+            'headers': len(headers),
+            'libyaml_available': CSafeLoader is not None,
+            'fast_path_handled': fast_path_coverage(headers),
+            'mismatches': check_parity(headers),
+            'throughput': measure_throughput(headers, args.repeat),
+        }
+
+        if args.format == 'json':
+            print(json.dumps(report, indent=2, ensure_ascii=False))
+        else:
+            print(format_results_table(report))
+
+        # Exit code: 0 if every backend matches PyYAML, 1 otherwise
+        sys.exit(1 if any(report['mismatches'].values()) else 0)
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+"""
+Plan-then-apply changesets for frontmatter edits.
+
+frontmatter_modify.py --changeset and fix_tags.py --changeset write the
+edits they would make to a changeset file instead of the notes. The file
+can be reviewed, then applied later by this script without running the
+query again. It is JSON lines: a header record, then one record per note:
+
+    {"changeset": 1, "root": "/vault", "source": "frontmatter_modify", "created": "..."}
+    {"path": "projects/a.md", "sha256": "...", "edits": [{"op": "set", "key": "status", "value": "done"}]}
+
+Paths are relative to root and must stay inside it, and each note has at
+most one record; a changeset that breaks either rule is rejected. Each
+value is YAML text, exactly as it would be written after "key: ", so dates
+and quoted strings keep their type. "sha256" is the hash of the note text
+the plan was made from. A note that has changed since (or is gone) is a
+conflict and is skipped; every other note is written in one transaction
+(see note_writer.py).
+
+Usage:
+    python changeset.py <changeset.jsonl> [options]
+
+Examples:
+    # Check which notes would still apply cleanly
+    python changeset.py changes.jsonl --check
+
+    # Apply, in 4 processes, without the confirmation prompt
+    python changeset.py changes.jsonl --jobs 4 --force
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import posixpath
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from utils import split_frontmatter, set_property_value, delete_property
+from frontmatter_edit import render_note
+from note_writer import NoteTransaction, stage_note, warn_pending
+from scan import map_chunks, resolve_jobs
+from yaml_backend import load_yaml
+
+FORMAT_VERSION = 1
+
+# (path, status, error) for one record of an apply run, where status is
+# 'applied' ('ready' with check), 'conflict' or 'error'
+ApplyRecord = Tuple[str, str, Optional[str]]
+
+
+def content_hash(content: str) -> str:
+    """Return the hash a changeset records for a note's text."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def encode_value(value: Any) -> str:
+    """Serialize a property value as flow-style YAML (one line unless it is multi-line text)."""
+    text = yaml.dump(value, default_flow_style=True, allow_unicode=True, width=float('inf'))
+    # Plain scalars are dumped as a document with an explicit end marker
+    if text.endswith('\n...\n'):
+        text = text[:-len('\n...\n')]
+    return text.rstrip('\n')
+
+
+def set_edit(key: str, value: Any) -> Dict[str, Any]:
+    """Edit that sets a property (dot notation for nested) to value."""
+    return {'op': 'set', 'key': key, 'value': encode_value(value)}
+
+
+def delete_edit(key: str) -> Dict[str, Any]:
+    """Edit that removes a property."""
+    return {'op': 'delete', 'key': key}
+
+
+def make_record(root: str, file_path: str, content: str, edits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the changeset record for one note.
+
+    Args:
+        root: Folder the changeset's paths are relative to
+        file_path: Path to the note
+        content: The note text the edits were planned against
+        edits: set_edit()/delete_edit() entries, applied in order
+    """
+    return {
+        'path': Path(os.path.relpath(file_path, root)).as_posix(),
+        'sha256': content_hash(content),
+        'edits': edits,
+    }
+
+
+def write_changeset(output_path: str, root: str, records: Iterable[Dict[str, Any]],
+                    source: str) -> int:
+    """
+    Write a changeset file.
+
+    Args:
+        output_path: File to write
+        root: Folder the records' paths are relative to
+        records: Records from make_record()
+        source: Name of the script that planned the edits
+
+    Returns:
+        Number of note records written
+    """
+    header = {
+        'changeset': FORMAT_VERSION,
+        'root': os.path.abspath(root),
+        'source': source,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    count = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header, ensure_ascii=False) + '\n')
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+def read_changeset(changeset_path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Open a changeset file.
+
+    Returns:
+        Tuple of (header, records), where records is read lazily
+
+    Raises:
+        ValueError: If the file is not a changeset; reading records raises it
+            for an invalid record, a path outside the vault or a note listed
+            a second time
+    """
+    with open(changeset_path, 'r', encoding='utf-8') as f:
+        try:
+            header = json.loads(f.readline() or 'null')
+        except ValueError:
+            header = None
+    if not isinstance(header, dict) or header.get('changeset') != FORMAT_VERSION:
+        raise ValueError(f"Not a changeset file (version {FORMAT_VERSION}): {changeset_path}")
+
+    def records() -> Iterator[Dict[str, Any]]:
+        # Each note may appear once; a second record would overwrite the
+        # first one's staged text
+        seen = set()
+        with open(changeset_path, 'r', encoding='utf-8') as f:
+            f.readline()
+            for line_number, line in enumerate(f, start=2):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    path = posixpath.normpath(record['path'])
+                except (ValueError, TypeError, KeyError):
+                    raise ValueError(f"Invalid record on line {line_number} of {changeset_path}")
+                if posixpath.isabs(path) or os.path.isabs(path) or path == '..' or path.startswith('../'):
+                    raise ValueError(f"{record['path']} is outside the vault "
+                                     f"(line {line_number} of {changeset_path})")
+                if path in seen:
+                    raise ValueError(f"{record['path']} is listed more than once "
+                                     f"(line {line_number} of {changeset_path})")
+                seen.add(path)
+                yield record
+
+    return header, records()
+
+
+def apply_edits(frontmatter: Optional[Dict[str, Any]], edits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return a copy of frontmatter with a record's edits applied."""
+    modified = copy.deepcopy(frontmatter) if frontmatter is not None else {}
+    for edit in edits:
+        if edit['op'] == 'set':
+            set_property_value(modified, edit['key'], load_yaml(edit['value']))
+        elif edit['op'] == 'delete':
+            delete_property(modified, edit['key'])
+        else:
+            raise ValueError(f"Unknown edit operation: {edit['op']}")
+    return modified
+
+
+def _apply_chunk(chunk: List[Dict[str, Any]], root: str,
+                 journal: Optional[str]) -> List[Tuple[ApplyRecord, Optional[Dict[str, Any]]]]:
+    """Worker entry point: verify, render and optionally stage a chunk of records."""
+    results = []
+    real_root = os.path.realpath(root)
+    for record in chunk:
+        path = record['path']
+        file_path = os.path.join(root, *path.split('/'))
+        try:
+            # A symlink may still lead out of the vault
+            if os.path.commonpath([real_root, os.path.realpath(file_path)]) != real_root:
+                results.append(((path, 'error', 'note is outside the vault'), None))
+                continue
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    original = f.read()
+            except FileNotFoundError:
+                results.append(((path, 'conflict', 'note no longer exists'), None))
+                continue
+            if content_hash(original) != record['sha256']:
+                results.append(((path, 'conflict', 'note changed since the plan was made'), None))
+                continue
+
+            frontmatter, body = split_frontmatter(original, file_path)
+            modified = render_note(original, frontmatter, apply_edits(frontmatter, record['edits']), body)
+            if journal is None:
+                results.append(((path, 'ready', None), None))
+                continue
+            results.append(((path, 'applied', None), stage_note(journal, file_path, modified)))
+        except Exception as e:
+            results.append(((path, 'error', str(e)), None))
+    return results
+
+
+def apply_changeset(changeset_path: str, jobs: int = 1, check: bool = False,
+                    root: Optional[str] = None) -> Iterator[ApplyRecord]:
+    """
+    Apply a changeset's edits to every note that is unchanged since planning.
+
+    Notes are verified and rendered across jobs worker processes and written
+    together as one transaction once every record has been processed.
+
+    Args:
+        changeset_path: Changeset file
+        jobs: Number of worker processes
+        check: Only verify hashes and edits; write nothing
+        root: Vault folder, if it has moved since the plan was made
+
+    Yields:
+        Tuples of (path, status, error) in changeset order, where status is
+        'applied' ('ready' with check), 'conflict' or 'error'
+    """
+    header, records = read_changeset(changeset_path)
+    root = os.path.abspath(root or header['root'])
+
+    if check:
+        for result, _ in map_chunks(_apply_chunk, records, jobs, root, None):
+            yield result
+        return
+
+    with NoteTransaction(root) as transaction:
+        for result, entry in map_chunks(_apply_chunk, records, jobs, root, transaction.journal):
+            if entry is not None:
+                transaction.add(entry)
+            yield result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Apply a frontmatter changeset planned with --changeset',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    parser.add_argument('changeset', help='Changeset file written by --changeset')
+    parser.add_argument('--check', action='store_true',
+                        help='Only report which notes would apply and which conflict')
+    parser.add_argument('--vault', metavar='PATH',
+                        help='Vault folder, if it is not where the plan was made')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='Process notes in N worker processes (0 = all CPUs, default: 1)')
+    parser.add_argument('--force', action='store_true',
+                        help='Skip confirmation (use with caution!)')
+
+    args = parser.parse_args()
+
+    try:
+        header, _ = read_changeset(args.changeset)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    root = args.vault or header['root']
+
+    print(f"\n{'='*80}")
+    print(f"Changeset: {args.changeset}")
+    print(f"Planned by: {header.get('source', 'unknown')} at {header.get('created', 'unknown')}")
+    print(f"Vault: {root}")
+    print(f"Mode: {'CHECK' if args.check else 'APPLY'}")
+    print(f"{'='*80}\n")
+
+    if not args.check:
+        warn_pending(root)
+        if not args.force:
+            response = input(f"Apply the changeset to {root}? [y/N]: ")
+            if response.lower() != 'y':
+                print("Cancelled")
+                sys.exit(0)
+
+    counts = {'applied': 0, 'ready': 0, 'conflict': 0, 'error': 0}
+    try:
+        for path, status, error in apply_changeset(args.changeset, jobs=resolve_jobs(args.jobs),
+                                                   check=args.check, root=args.vault):
+            counts[status] += 1
+            if status == 'conflict':
+                print(f"⊘ Skipped {path}: {error}")
+            elif status == 'error':
+                print(f"✗ Error processing {path}: {error}", file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    print(f"\n{'='*80}")
+    print(f"Summary:")
+    if args.check:
+        print(f"  Would apply: {counts['ready']}")
+    else:
+        print(f"  Applied: {counts['applied']}")
+    print(f"  Conflicts skipped: {counts['conflict']}")
+    print(f"  Errors: {counts['error']}")
+    print(f"{'='*80}\n")
+
+    sys.exit(1 if counts['conflict'] or counts['error'] else 0)
+
+
+if __name__ == '__main__':
+    main()
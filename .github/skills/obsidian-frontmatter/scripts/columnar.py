@@ -0,0 +1,420 @@
+"""
+Columnar property cache with vectorized filtering (needs NumPy).
+
+For each property a query reads, the cache keeps typed columns over every
+note in the vault:
+
+- numbers: float64 (booleans as 0/1), NaN where a note has no number
+- times: dates and datetimes as float64 epoch seconds (naive values as UTC)
+- codes: int32 indexes into the property's string vocabulary, -1 for none
+- present: the null mask, False where the property is missing or null
+- kinds: each value's original type, so matches report it unchanged
+
+Strings are typed with infer_property_type, the rules the CLI flags use:
+a quoted "3" or "2024-05-01" also goes into the numbers or times column,
+so `priority > 2` matches it. Dates and datetimes also compare with each
+other, where plain Python comparisons raise TypeError and silently fail.
+Lists and mappings stay plain values and are checked one by one with
+property_matches, as are the values a wildcard path selects in each note.
+Each query condition then becomes a boolean mask over the whole vault, and
+the masks are combined with &, | and ~ following the plan.
+
+The cache lives in .obsidian/frontmatter-columns.npz together with each
+note's mtime and size. It is rebuilt through the frontmatter index when any
+note changed or a query needs a property it does not have yet.
+"""
+
+import calendar
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from index import FrontmatterIndex, decode_object, encode_value
+from query import And, Condition, Node, Not, Or, QueryPlan
+from scan import parse_files
+from property_path import compile_path
+from utils import infer_property_type, property_matches
+from vault_walk import walk_markdown
+
+COLUMNS_DIR = '.obsidian'
+COLUMNS_FILENAME = 'frontmatter-columns.npz'
+
+# Bump when the saved layout changes; older caches are rebuilt.
+COLUMNS_VERSION = 1
+
+# Original type of a value, stored per row
+KIND_NONE, KIND_BOOL, KIND_INT, KIND_FLOAT, KIND_DATE, KIND_DATETIME, KIND_STRING, KIND_OTHER = range(8)
+
+# Integers beyond this are not exact as float64
+_EXACT_INT = 2 ** 53
+
+_EPOCH = datetime(1970, 1, 1)
+
+_COMPARE = {
+    'equals': 'equal',
+    'gt': 'greater',
+    'lt': 'less',
+    'gte': 'greater_equal',
+    'lte': 'less_equal',
+}
+
+
+def numpy_available() -> bool:
+    """Return True if NumPy is installed, which the columnar cache needs."""
+    return np is not None
+
+
+def default_columns_path(vault_path: str) -> Path:
+    """Return the cache location inside the vault's hidden directory."""
+    return Path(vault_path) / COLUMNS_DIR / COLUMNS_FILENAME
+
+
+def _epoch(value: Any) -> Optional[float]:
+    """Epoch seconds of a date or datetime (naive datetimes are taken as UTC)."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None and value.utcoffset() is not None:
+            return value.timestamp()
+        return calendar.timegm(value.timetuple()) + value.microsecond / 1e6
+    if isinstance(value, date):
+        return float(calendar.timegm(value.timetuple()))
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (bool, int, float)):
+        try:
+            return float(value)
+        except OverflowError:
+            return None
+    return None
+
+
+def _infer_string(text: str) -> Tuple[Optional[float], Optional[float]]:
+    """(number, epoch) a string reads as under infer_property_type, if any."""
+    inferred = infer_property_type(text)
+    if isinstance(inferred, bool):
+        return None, None
+    return _number(inferred), _epoch(inferred)
+
+
+class Column:
+    """Typed columns of one property over every note of the vault."""
+
+    def __init__(self, present, numbers, times, codes, kinds, vocabulary: List[str],
+                 others: Dict[int, Any], exact: Dict[int, Any], multi: bool = False):
+        self.present = present
+        self.numbers = numbers
+        self.times = times
+        self.codes = codes
+        self.kinds = kinds
+        self.vocabulary = vocabulary
+        # Row -> value for lists, mappings and scalars without a column
+        self.others = others
+        # Row -> value the columns cannot give back exactly (time zones,
+        # microseconds, huge integers); used for reporting only
+        self.exact = exact
+        # Rows hold the list of values a wildcard path selected
+        self.multi = multi
+        self._vocabulary_array = None
+
+    @classmethod
+    def build_multi(cls, values: List[Optional[List[Any]]]) -> 'Column':
+        """Build a column for a wildcard path from each note's selected values."""
+        size = len(values)
+        present = np.array([bool(selected) for selected in values], dtype=bool)
+        kinds = np.where(present, KIND_OTHER, KIND_NONE).astype(np.int8)
+        others = {row: selected for row, selected in enumerate(values) if selected}
+        return cls(present, np.full(size, np.nan), np.full(size, np.nan),
+                   np.full(size, -1, dtype=np.int32), kinds, [], others, {}, multi=True)
+
+    @classmethod
+    def build(cls, values: List[Any]) -> 'Column':
+        """Build the columns from each note's value (None where missing)."""
+        size = len(values)
+        present = np.zeros(size, dtype=bool)
+        numbers = np.full(size, np.nan)
+        times = np.full(size, np.nan)
+        codes = np.full(size, -1, dtype=np.int32)
+        kinds = np.zeros(size, dtype=np.int8)
+        vocabulary: Dict[str, int] = {}
+        others: Dict[int, Any] = {}
+        exact: Dict[int, Any] = {}
+
+        for row, value in enumerate(values):
+            if value is None:
+                continue
+            present[row] = True
+            if isinstance(value, str):
+                code = vocabulary.get(value)
+                if code is None:
+                    code = vocabulary[value] = len(vocabulary)
+                codes[row] = code
+                kinds[row] = KIND_STRING
+                continue
+            number = _number(value)
+            if number is not None:
+                numbers[row] = number
+                if isinstance(value, bool):
+                    kinds[row] = KIND_BOOL
+                elif isinstance(value, int):
+                    kinds[row] = KIND_INT
+                    if abs(value) > _EXACT_INT:
+                        exact[row] = value
+                else:
+                    kinds[row] = KIND_FLOAT
+                continue
+            epoch = _epoch(value)
+            if epoch is not None:
+                times[row] = epoch
+                if isinstance(value, datetime):
+                    kinds[row] = KIND_DATETIME
+                    if value.tzinfo is not None or value.microsecond:
+                        exact[row] = value
+                else:
+                    kinds[row] = KIND_DATE
+                continue
+            others[row] = value
+            kinds[row] = KIND_OTHER
+
+        # Each distinct string is typed once, then spread to its rows
+        if vocabulary:
+            inferred = [_infer_string(text) for text in vocabulary]
+            string_rows = codes >= 0
+            string_codes = codes[string_rows]
+            numbers[string_rows] = np.array([n if n is not None else np.nan for n, _ in inferred])[string_codes]
+            times[string_rows] = np.array([t if t is not None else np.nan for _, t in inferred])[string_codes]
+
+        return cls(present, numbers, times, codes, kinds, list(vocabulary), others, exact)
+
+    def value(self, row: int) -> Any:
+        """Return a note's value as it was parsed from its frontmatter."""
+        if row in self.exact:
+            return self.exact[row]
+        kind = self.kinds[row]
+        if kind == KIND_STRING:
+            return self.vocabulary[self.codes[row]]
+        if kind == KIND_OTHER:
+            return self.others[row]
+        if kind == KIND_BOOL:
+            return bool(self.numbers[row])
+        if kind == KIND_INT:
+            return int(self.numbers[row])
+        if kind == KIND_FLOAT:
+            return float(self.numbers[row])
+        if kind == KIND_DATE:
+            return (_EPOCH + timedelta(seconds=float(self.times[row]))).date()
+        if kind == KIND_DATETIME:
+            return _EPOCH + timedelta(seconds=float(self.times[row]))
+        return None
+
+    def _vocabulary_mask(self, per_string) -> Any:
+        # Code -1 picks the appended False
+        return np.append(per_string, False)[self.codes]
+
+    def mask(self, operator: str, target: Any) -> Any:
+        """Return a boolean array of the notes whose value matches the condition."""
+        if operator == 'exists':
+            return self.present.copy()
+        if operator == 'not-exists':
+            return ~self.present
+
+        result = np.zeros(len(self.present), dtype=bool)
+        if self.multi:
+            # Any selected value may satisfy the condition
+            for row, selected in self.others.items():
+                if any(property_matches(value, operator, target) for value in selected):
+                    result[row] = True
+            return result
+
+        if self._vocabulary_array is None:
+            self._vocabulary_array = np.array(self.vocabulary, dtype=str)
+        strings = self._vocabulary_array
+
+        if operator in _COMPARE:
+            compare = getattr(np, _COMPARE[operator])
+            number, epoch = _number(target), _epoch(target)
+            if number is not None:
+                result |= compare(self.numbers, number)
+            elif epoch is not None:
+                result |= compare(self.times, epoch)
+            elif isinstance(target, str) and len(strings):
+                result |= self._vocabulary_mask(compare(strings, target))
+        elif operator == 'contains' and isinstance(target, str) and len(strings):
+            result |= self._vocabulary_mask(np.char.find(strings, target) >= 0)
+
+        for row, value in self.others.items():
+            if property_matches(value, operator, target):
+                result[row] = True
+        return result
+
+
+class ColumnStore:
+    """Columnar cache of frontmatter properties for one vault."""
+
+    def __init__(self, paths: List[str], mtimes, sizes, errors: Dict[int, str],
+                 columns: Dict[str, Column]):
+        self.paths = paths
+        self.mtimes = mtimes
+        self.sizes = sizes
+        # Row -> parse error, reported like a full scan reports it
+        self.errors = errors
+        self.columns = columns
+
+    def evaluate(self, node: Node) -> Any:
+        """Return the boolean mask of notes matching a plan node."""
+        if isinstance(node, Condition):
+            return self.columns[node.prop].mask(node.operator, node.target)
+        if isinstance(node, Not):
+            return ~self.evaluate(node.child)
+        if isinstance(node, And):
+            result = self.evaluate(node.children[0])
+            for child in node.children[1:]:
+                result &= self.evaluate(child)
+            return result
+        if isinstance(node, Or):
+            result = self.evaluate(node.children[0])
+            for child in node.children[1:]:
+                result |= self.evaluate(child)
+            return result
+        raise TypeError(f"Unknown plan node: {node!r}")
+
+    def scan(self, plan: QueryPlan) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Evaluate a plan over the whole vault at once.
+
+        Yields:
+            Tuples of (file_path, properties, error) in vault walk order for
+            matching notes, with the values of the properties the plan
+            references, and for notes that could not be parsed (properties None)
+        """
+        matched = self.evaluate(plan.root)
+        rows = set(np.flatnonzero(matched).tolist()) | set(self.errors)
+        for row in sorted(rows):
+            error = self.errors.get(row)
+            if error is not None:
+                yield self.paths[row], None, error
+                continue
+            properties = {prop: self.columns[prop].value(row) for prop in plan.properties}
+            yield self.paths[row], properties, None
+
+    def save(self, path: Path) -> bool:
+        """Write the cache; returns False if a value cannot be stored exactly."""
+        arrays = {
+            'paths': np.array(self.paths, dtype=str),
+            'mtimes': self.mtimes,
+            'sizes': self.sizes,
+        }
+        meta = {'version': COLUMNS_VERSION, 'errors': self.errors, 'columns': []}
+        try:
+            for i, (prop, column) in enumerate(self.columns.items()):
+                arrays[f'present{i}'] = column.present
+                arrays[f'numbers{i}'] = column.numbers
+                arrays[f'times{i}'] = column.times
+                arrays[f'codes{i}'] = column.codes
+                arrays[f'kinds{i}'] = column.kinds
+                meta['columns'].append({
+                    'property': prop,
+                    'vocabulary': column.vocabulary,
+                    'others': {row: encode_value(value) for row, value in column.others.items()},
+                    'exact': {row: encode_value(value) for row, value in column.exact.items()},
+                    'multi': column.multi,
+                })
+        except TypeError:
+            return False
+        arrays['meta'] = np.array(json.dumps(meta, ensure_ascii=False))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+        return True
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['ColumnStore']:
+        """Read a saved cache, or None if it is missing or from another version."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']), object_hook=decode_object)
+                if meta.get('version') != COLUMNS_VERSION:
+                    return None
+                columns = {}
+                for i, info in enumerate(meta['columns']):
+                    columns[info['property']] = Column(
+                        data[f'present{i}'], data[f'numbers{i}'], data[f'times{i}'],
+                        data[f'codes{i}'], data[f'kinds{i}'], info['vocabulary'],
+                        {int(row): value for row, value in info['others'].items()},
+                        {int(row): value for row, value in info['exact'].items()},
+                        info['multi'])
+                errors = {int(row): error for row, error in meta['errors'].items()}
+                return cls(data['paths'].tolist(), data['mtimes'], data['sizes'], errors, columns)
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def open_store(vault_path: str, properties: List[str], jobs: int = 1) -> ColumnStore:
+    """
+    Return an up-to-date column store holding at least the given properties.
+
+    The saved cache is used as is when every note's mtime and size still
+    match. Otherwise it is rebuilt from the frontmatter index, which re-parses
+    only the notes that changed.
+
+    Args:
+        vault_path: Path to Obsidian vault
+        properties: Property names (dot notation for nested) the caller needs
+        jobs: Number of worker processes used to parse changed notes
+    """
+    if np is None:
+        raise RuntimeError("The columnar cache needs NumPy. Install with: pip install numpy")
+
+    entries = list(walk_markdown(vault_path))
+    paths = [entry.path for entry in entries]
+    mtimes = np.zeros(len(entries), dtype=np.int64)
+    sizes = np.zeros(len(entries), dtype=np.int64)
+    for row, entry in enumerate(entries):
+        try:
+            stat = entry.stat()
+        except OSError:
+            # Gone since the walk; never matches a saved stat
+            mtimes[row] = sizes[row] = -1
+            continue
+        mtimes[row] = stat.st_mtime_ns
+        sizes[row] = stat.st_size
+
+    cache_path = default_columns_path(vault_path)
+    cached = ColumnStore.load(cache_path)
+    if (cached is not None and cached.paths == paths
+            and np.array_equal(cached.mtimes, mtimes) and np.array_equal(cached.sizes, sizes)):
+        if all(prop in cached.columns for prop in properties):
+            return cached
+        # Keep what earlier queries needed, so they stay cached as well
+        properties = list(dict.fromkeys(list(cached.columns) + list(properties)))
+
+    parse_many = None
+    if jobs != 1:
+        def parse_many(stale_files):
+            return parse_files(stale_files, jobs=jobs)
+
+    accessors = {prop: compile_path(prop) for prop in properties}
+    values: Dict[str, List[Any]] = {prop: [] for prop in properties}
+    errors: Dict[int, str] = {}
+    with FrontmatterIndex(vault_path) as index:
+        for row, (file_path, frontmatter, error) in enumerate(index.refresh(entries, parse_many=parse_many)):
+            if error is not None:
+                errors[row] = str(error)
+            for prop, column in values.items():
+                column.append(accessors[prop].get(frontmatter) if error is None else None)
+
+    columns = {prop: (Column.build_multi(column) if accessors[prop].wildcard else Column.build(column))
+               for prop, column in values.items()}
+    store = ColumnStore(paths, mtimes, sizes, errors, columns)
+    store.save(cache_path)
+    return store
@@ -0,0 +1,166 @@
+"""
+Client side of the vault daemon (see vault_daemon.py).
+
+Scripts ask the daemon for notes when one is running for the vault. Every
+function here returns None when there is no usable daemon, so callers fall
+back to scanning the vault themselves.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from index import decode_object, encode_value
+from query import QueryPlan
+from utils import read_frontmatter
+
+# Seconds to wait for the daemon before giving up on a response
+CLIENT_TIMEOUT = 60.0
+
+
+def socket_path(vault_path: str) -> str:
+    """Return the per-user socket path for a vault."""
+    real_path = os.path.realpath(vault_path)
+    digest = hashlib.sha1(real_path.encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f'obsidian-frontmatter-{uid}-{digest}.sock')
+
+
+def encode_message(message: Any) -> bytes:
+    """Encode one protocol message as a JSON line."""
+    return json.dumps(encode_value(message), ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def decode_message(line: bytes) -> Any:
+    return json.loads(line, object_hook=decode_object)
+
+
+def _open(vault_path: str, request: Dict[str, Any]) -> Optional[Tuple[socket.socket, Any, Dict[str, Any]]]:
+    """Send a request; return (socket, reader, header) or None without a daemon."""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = socket_path(vault_path)
+    try:
+        # Only trust a socket created by this user
+        if os.stat(path).st_uid != (os.getuid() if hasattr(os, 'getuid') else 0):
+            return None
+    except OSError:
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CLIENT_TIMEOUT)
+    try:
+        sock.connect(path)
+        request = dict(request, vault=os.path.realpath(vault_path))
+        sock.sendall(encode_message(request))
+        reader = sock.makefile('rb')
+        header = decode_message(reader.readline())
+    except (OSError, ValueError, TypeError):
+        # TypeError: a query target that cannot be sent as JSON
+        sock.close()
+        return None
+
+    if not isinstance(header, dict) or not header.get('ok'):
+        sock.close()
+        return None
+    return sock, reader, header
+
+
+def _items(sock: socket.socket, reader: Any) -> Iterator[Any]:
+    """Yield the records of a response, raising IOError if it is cut short."""
+    try:
+        for line in reader:
+            item = decode_message(line)
+            if isinstance(item, dict) and item.get('done'):
+                return
+            yield item
+        raise IOError("Lost connection to the vault daemon")
+    except (OSError, ValueError) as e:
+        raise IOError(f"Lost connection to the vault daemon: {e}")
+    finally:
+        reader.close()
+        sock.close()
+
+
+def _abs_path(root: str, rel_path: str) -> str:
+    return os.path.join(root, *rel_path.split('/'))
+
+
+def daemon_status(vault_path: str) -> Optional[Dict[str, Any]]:
+    """Return the daemon's status header, or None if no daemon is running."""
+    opened = _open(vault_path, {'op': 'status'})
+    if opened is None:
+        return None
+    sock, reader, header = opened
+    reader.close()
+    sock.close()
+    return header
+
+
+def daemon_stop(vault_path: str) -> bool:
+    """Ask the daemon to exit. Returns False if none was running."""
+    opened = _open(vault_path, {'op': 'stop'})
+    if opened is None:
+        return False
+    sock, reader, _ = opened
+    reader.close()
+    sock.close()
+    return True
+
+
+def daemon_scan(vault_path: str, keys: Optional[Iterable[str]] = None,
+                plan: Optional[QueryPlan] = None
+                ) -> Optional[Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]]:
+    """
+    Ask the daemon for the vault's frontmatter.
+
+    Args:
+        vault_path: Path to Obsidian vault
+        keys: Top-level property names to send back; None sends everything
+        plan: Query the caller will apply; the daemon leaves out notes that
+            do not match it. Callers still check each note against the plan.
+
+    Returns:
+        An iterator of (file_path, frontmatter, error) in vault walk order,
+        or None when no daemon is running for the vault
+    """
+    request = {
+        'op': 'scan',
+        'keys': sorted(keys) if keys is not None else None,
+        'plan': plan.root.to_dict() if plan is not None else None,
+    }
+    opened = _open(vault_path, request)
+    if opened is None:
+        return None
+    sock, reader, _ = opened
+    root = os.path.abspath(vault_path)
+
+    def records():
+        for rel_path, frontmatter, error, local in _items(sock, reader):
+            file_path = _abs_path(root, rel_path)
+            if local:
+                # The daemon cannot send this note's values; read it here
+                try:
+                    frontmatter, _ = read_frontmatter(file_path)
+                except Exception as e:
+                    frontmatter, error = None, str(e)
+            yield file_path, frontmatter, error
+    return records()
+
+
+def daemon_files(vault_path: str) -> Optional[List[str]]:
+    """
+    Ask the daemon for the vault's note paths, in vault walk order.
+
+    Returns:
+        Absolute paths to .md files, or None when no daemon is running
+    """
+    opened = _open(vault_path, {'op': 'files'})
+    if opened is None:
+        return None
+    sock, reader, _ = opened
+    root = os.path.abspath(vault_path)
+    return [_abs_path(root, rel_path) for rel_path in _items(sock, reader)]
@@ -0,0 +1,249 @@
+"""
+Surgical frontmatter edits.
+
+Instead of re-dumping the whole header with yaml.dump, only the lines of the
+properties that changed are rewritten. Quoting, comments, dates and key order
+of everything else stay exactly as they were, so a one-property change is a
+one-line diff.
+
+The header is scanned as block mappings: a property owns its key line plus
+every following line that is indented deeper (or a '- ' item at the same
+indent). Changed properties are replaced with their serialized value,
+deleted ones are cut out, new ones are appended to their mapping, and
+changes inside a nested block mapping recurse into it. Anything the scanner
+does not understand, and any result that does not parse back to exactly the
+intended frontmatter, makes these functions return None so the caller can
+fall back to a full dump.
+"""
+
+import functools
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from utils import FRONTMATTER_RE
+from yaml_backend import load_yaml
+
+# A key at the start of a line: quoted, or a plain scalar ending at ': '
+_KEY_RE = re.compile(r'''
+    (?P<key>"(?:[^"\\]|\\.)*"
+          | '(?:[^']|'')*'
+          | [^\s\-?:,\[\]{}\#&*!|>'"%@`].*?
+          | -\S.*?)
+    [^\S\n]*:(?=\s|$)(?P<rest>.*)''', re.VERBOSE)
+
+# A block sequence item, which may sit at its parent key's indent
+_ITEM_RE = re.compile(r'-(?:\s|$)')
+
+# (first line, end line, replacement lines) of one edit
+Edit = Tuple[int, int, List[str]]
+
+_UNSET = object()
+
+
+def same_value(a: Any, b: Any) -> bool:
+    """Compare parsed YAML values, telling apart 1, 1.0 and True."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same_value(a[key], b[key]) for key in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same_value(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+@functools.lru_cache(maxsize=4096)
+def _load_key(token: str) -> Any:
+    # Notes share most of their keys, so each spelling is resolved once
+    return load_yaml(token)
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(' '))
+
+
+def _is_filler(line: str) -> bool:
+    """Blank and comment-only lines belong to no property."""
+    stripped = line.strip()
+    return not stripped or stripped.startswith('#')
+
+
+def _scan_block(lines: List[str], start: int, end: int, indent: int) -> Optional[List[list]]:
+    """
+    Split lines[start:end] into the entries of a block mapping at `indent`.
+
+    Returns:
+        [key, first line, end line, text after the colon] per entry, or None
+        if the lines are not a plain block mapping
+    """
+    entries = []
+    for i in range(start, end):
+        line = lines[i]
+        if _is_filler(line):
+            continue
+        column = _indent(line)
+        if entries and (column > indent or (column == indent and _ITEM_RE.match(line, column))):
+            entries[-1][2] = i + 1
+            continue
+        if column != indent:
+            return None
+        match = _KEY_RE.match(line, indent)
+        if not match:
+            return None
+        try:
+            key = _load_key(match.group('key'))
+        except yaml.YAMLError:
+            return None
+        entries.append([key, i, i + 1, match.group('rest').strip()])
+    return entries
+
+
+def _dump_entry(key: Any, value: Any, indent: int, flow: bool) -> List[str]:
+    """Serialize one property the way a full dump would, indented for its block."""
+    # Flow style only applies to the value; a scalar would make the whole
+    # {key: value} mapping flow style
+    flow = flow and isinstance(value, (list, dict))
+    text = yaml.dump({key: value},
+                     default_flow_style=None if flow else False,
+                     allow_unicode=True,
+                     sort_keys=False)
+    prefix = ' ' * indent
+    return [prefix + line for line in text.rstrip('\n').split('\n')]
+
+
+def _edit_block(lines: List[str], start: int, end: int, indent: int,
+                old: Any, new: Any, edits: List[Edit]) -> bool:
+    """Queue the edits turning the mapping in lines[start:end] from old into new."""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return False
+    entries = _scan_block(lines, start, end, indent)
+    if not entries:
+        return False
+    try:
+        keys = {entry[0] for entry in entries}
+    except TypeError:
+        return False
+    if len(keys) != len(entries) or keys != set(old):
+        return False
+
+    block_edits: List[Edit] = []
+    for key, first, last, rest in entries:
+        if key not in new:
+            block_edits.append((first, last, []))
+            continue
+        if same_value(old[key], new[key]):
+            continue
+
+        if (not rest or rest.startswith('#')) and isinstance(old[key], dict) and isinstance(new[key], dict):
+            # Nested block mapping: edit inside it rather than replacing it
+            child = next((i for i in range(first + 1, last) if not _is_filler(lines[i])), None)
+            if child is not None:
+                child_indent = _indent(lines[child])
+                if child_indent > indent and not _ITEM_RE.match(lines[child], child_indent):
+                    nested: List[Edit] = []
+                    if _edit_block(lines, first + 1, last, child_indent, old[key], new[key], nested):
+                        block_edits.extend(nested)
+                        continue
+
+        block_edits.append((first, last, _dump_entry(key, new[key], indent, rest[:1] in ('[', '{'))))
+
+    added = [key for key in new if key not in old]
+    if added:
+        position = entries[-1][2]
+        if entries[-1][3][:1] in ('|', '>'):
+            # A block scalar that ends the header has no final line break, so
+            # keys appended after it would change its value; add them before it
+            position = entries[-1][1]
+        inserted = []
+        for key in added:
+            inserted.extend(_dump_entry(key, new[key], indent, False))
+        block_edits.append((position, position, inserted))
+
+    edits.extend(block_edits)
+    return True
+
+
+def splice_frontmatter(header: str, new: Dict[str, Any], old: Any = _UNSET) -> Optional[str]:
+    """
+    Rewrite only the changed properties of a YAML header.
+
+    Args:
+        header: Header text between the '---' delimiters
+        new: Frontmatter the header should parse to afterwards
+        old: The header's parsed frontmatter, if the caller already has it
+
+    Returns:
+        The edited header text, or None if the change cannot be made in place
+    """
+    try:
+        if old is _UNSET:
+            old = load_yaml(header)
+    except yaml.YAMLError:
+        return None
+
+    lines = header.split('\n')
+    edits: List[Edit] = []
+    if not _edit_block(lines, 0, len(lines), 0, old, new, edits):
+        return None
+
+    # Apply from the bottom up so earlier line numbers stay valid
+    for first, last, replacement in sorted(edits, key=lambda edit: (edit[0], edit[1]), reverse=True):
+        lines[first:last] = replacement
+    result = '\n'.join(lines)
+
+    try:
+        parsed = load_yaml(result)
+    except yaml.YAMLError:
+        return None
+    return result if same_value(parsed, new) else None
+
+
+def edit_note(content: str, new: Dict[str, Any], old: Any = _UNSET) -> Optional[str]:
+    """
+    Splice new frontmatter into note text, keeping the delimiters and body as is.
+
+    Args:
+        content: Full note text with an existing frontmatter block
+        new: Frontmatter the note should have afterwards
+        old: The note's parsed frontmatter, if the caller already has it
+
+    Returns:
+        The edited note text, or None if the caller should dump the header in full
+    """
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return None
+    header = splice_frontmatter(match.group(1), new, old)
+    if header is None:
+        return None
+    return content[:match.start(1)] + header + content[match.end(1):]
+
+
+def render_note(original: str, frontmatter: Optional[Dict[str, Any]],
+                modified_frontmatter: Dict[str, Any], body: str) -> str:
+    """
+    Produce the modified note text.
+
+    Only the changed properties are rewritten when the header allows it;
+    otherwise the whole frontmatter is dumped again.
+
+    Args:
+        original: Full note text
+        frontmatter: The note's parsed frontmatter (None if it has none)
+        modified_frontmatter: Frontmatter the note should have afterwards
+        body: Note text after the frontmatter block
+
+    Returns:
+        The new note text
+    """
+    if frontmatter is not None:
+        edited = edit_note(original, modified_frontmatter, frontmatter)
+        if edited is not None:
+            return edited
+
+    yaml_str = yaml.dump(modified_frontmatter,
+                         default_flow_style=False,
+                         allow_unicode=True,
+                         sort_keys=False)
+    return f"---\n{yaml_str}---\n{body}"
@@ -1,8 +1,8 @@
 """
-List all unique values for a frontmatter property across the vault.
+List all unique values for frontmatter properties across the vault.
 
 Usage:
-    python frontmatter_list.py <vault_path> --property <name> [options]
+    python frontmatter_list.py <vault_path> --property <name> [<name> ...] [options]
 
 Examples:
     # List all tag values
@@ -10,52 +10,114 @@ Examples:
     
     # List status values used at least 5 times
     python frontmatter_list.py "d:\vault" --property status --min-count 5
+    
+    # Count several properties in one pass, showing the 10 most used values of each
+    python frontmatter_list.py "d:\vault" --property status type tags project --top 10
+    
+    # Tag counts grouped by status
+    python frontmatter_list.py "d:\vault" --property tags --by status
+    
+    # Distinct count and top 20 of a huge-cardinality property in fixed memory
+    python frontmatter_list.py "d:\vault" --property source url --approx --top 20
+    
+    # Status counts from a 5% sample, or whatever is counted in 20 seconds
+    python frontmatter_list.py "d:\vault" --property status --sample 0.05 --time-budget 20
 """
 
 import argparse
+import heapq
 import json
 import sys
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
-from utils import (
-    find_markdown_files,
-    parse_frontmatter,
-    get_property_value,
-    format_value
-)
+from utils import DEFAULT_MAX_HEADER_SIZE, format_value
+from property_path import PropertyPath, compile_path
+from scan import ScanBudget, iter_frontmatter, property_keys, resolve_jobs
+from sketches import DEFAULT_CAPACITY, HyperLogLog, SpaceSaving
 
 
-def list_property_values(vault_path: str, property_name: str, min_count: int = 1) -> Dict[Any, int]:
+# Group for notes without the --by property
+MISSING_GROUP = '(none)'
+
+
+def _note_values(frontmatter: Optional[Dict[str, Any]], path: PropertyPath) -> List[str]:
     """
-    List all unique values for a property with usage counts.
+    Return a property's display values in one note (each list item separately).
+    
+    A wildcard path contributes each value it selects, lists expanded the same way.
+    """
+    values = []
+    for prop_value in path.values(frontmatter):
+        if isinstance(prop_value, list):
+            values.extend(format_value(item) for item in prop_value)
+        else:
+            values.append(format_value(prop_value))
+    return values
+
+
+def count_facets(vault_path: str, property_names: List[str], min_count: int = 1,
+                 use_index: bool = False, jobs: int = 1, use_daemon: bool = False,
+                 by: Optional[str] = None,
+                 budget: Optional[ScanBudget] = None,
+                 max_header_size: Optional[int] = DEFAULT_MAX_HEADER_SIZE) -> Tuple[Dict[str, Dict[Any, int]],
+                                                               Dict[str, Dict[str, Dict[Any, int]]]]:
+    """
+    Count the values of several properties in one pass over the vault.
     
     Args:
         vault_path: Path to Obsidian vault
-        property_name: Property name to list
+        property_names: Property names to count
         min_count: Minimum usage count to include
+        use_index: Answer from the persistent frontmatter index
+        jobs: Number of worker processes used to parse notes
+        use_daemon: Ask the vault daemon when one is running
+        by: Also count each property's values grouped by this property's values
+        budget: Time budget, sample and progress reporting for the scan; the
+            counts then cover only the notes it scanned
+        max_header_size: Bytes read looking for the end of each note's
+            frontmatter before the whole note is parsed (None for no limit)
         
     Returns:
-        Dictionary mapping values to counts
+        Tuple of (counts, cross_tabs): counts maps each property to its value
+        counts; cross_tabs maps each property to {by value: value counts}
+        (empty without by). Notes without the by property are grouped under
+        '(none)'; the by property itself has no cross-tab.
     """
-    value_counts = defaultdict(int)
-    md_files = find_markdown_files(vault_path)
+    value_counts = {name: defaultdict(int) for name in property_names}
+    # The by property is not grouped by itself
+    grouped = {name: defaultdict(lambda: defaultdict(int))
+               for name in property_names if by and name != by}
+    
+    keys = property_keys(list(property_names) + ([by] if by else []))
+    # Each path is compiled once for the whole scan
+    paths = {name: compile_path(name) for name in property_names}
+    by_path = compile_path(by) if by else None
     
-    for file_path in md_files:
+    for file_path, frontmatter, error in iter_frontmatter(vault_path, use_index=use_index,
+                                                          jobs=jobs, keys=keys,
+                                                          use_daemon=use_daemon, budget=budget,
+                                                          max_header_size=max_header_size):
+        if error is not None:
+            print(f"Warning: Skipping {file_path}: {error}", file=sys.stderr)
+            continue
+        
         try:
-            frontmatter, _ = parse_frontmatter(file_path)
-            prop_value = get_property_value(frontmatter, property_name)
-            
-            if prop_value is not None:
-                # Handle list properties (count each item separately)
-                if isinstance(prop_value, list):
-                    for item in prop_value:
-                        value_counts[format_value(item)] += 1
-                else:
-                    value_counts[format_value(prop_value)] += 1
+            if by:
+                groups = _note_values(frontmatter, by_path) or [MISSING_GROUP]
+            for property_name, counts in value_counts.items():
+                values = _note_values(frontmatter, paths[property_name])
+                for value in values:
+                    counts[value] += 1
+                if values and property_name in grouped:
+                    cross_tab = grouped[property_name]
+                    for group in groups:
+                        cells = cross_tab[group]
+                        for value in values:
+                            cells[value] += 1
         
         except Exception as e:
             # Skip files with errors
@@ -63,12 +125,112 @@ def list_property_values(vault_path: str, property_name: str, min_count: int = 1
             continue
     
     # Filter by min_count
-    filtered = {k: v for k, v in value_counts.items() if v >= min_count}
+    counts = {name: {k: v for k, v in value_counts[name].items() if v >= min_count}
+              for name in property_names}
+    cross_tabs = {}
+    for name, cross_tab in grouped.items():
+        filtered_groups = {}
+        for group, cells in cross_tab.items():
+            filtered = {k: v for k, v in cells.items() if v >= min_count}
+            if filtered:
+                filtered_groups[group] = filtered
+        cross_tabs[name] = filtered_groups
     
-    return filtered
+    return counts, cross_tabs
 
 
-def format_results_table(property_name: str, value_counts: Dict[Any, int]) -> str:
+def approx_facets(vault_path: str, property_names: List[str], use_index: bool = False,
+                  jobs: int = 1, use_daemon: bool = False,
+                  capacity: int = DEFAULT_CAPACITY,
+                  budget: Optional[ScanBudget] = None,
+                  max_header_size: Optional[int] = DEFAULT_MAX_HEADER_SIZE) -> Dict[str, Tuple[HyperLogLog, SpaceSaving]]:
+    """
+    Summarize the values of several properties in one pass, in fixed memory.
+    
+    Args:
+        vault_path: Path to Obsidian vault
+        property_names: Property names to count
+        use_index: Answer from the persistent frontmatter index
+        jobs: Number of worker processes used to parse notes
+        use_daemon: Ask the vault daemon when one is running
+        capacity: Values tracked per property for the frequency estimates
+        budget: Time budget, sample and progress reporting for the scan
+        max_header_size: Bytes read looking for the end of each note's
+            frontmatter before the whole note is parsed (None for no limit)
+        
+    Returns:
+        Property name -> (distinct-count sketch, top-values sketch); see sketches.py
+    """
+    sketches = {name: (HyperLogLog(), SpaceSaving(capacity)) for name in property_names}
+    
+    keys = property_keys(property_names)
+    paths = {name: compile_path(name) for name in property_names}
+    
+    for file_path, frontmatter, error in iter_frontmatter(vault_path, use_index=use_index,
+                                                          jobs=jobs, keys=keys,
+                                                          use_daemon=use_daemon, budget=budget,
+                                                          max_header_size=max_header_size):
+        if error is not None:
+            print(f"Warning: Skipping {file_path}: {error}", file=sys.stderr)
+            continue
+        
+        try:
+            for property_name, (distinct, frequent) in sketches.items():
+                for value in _note_values(frontmatter, paths[property_name]):
+                    distinct.add(value)
+                    frequent.add(value)
+        
+        except Exception as e:
+            # Skip files with errors
+            print(f"Warning: Skipping {file_path}: {e}", file=sys.stderr)
+            continue
+    
+    return sketches
+
+
+def list_property_values(vault_path: str, property_name: str, min_count: int = 1,
+                         use_index: bool = False, jobs: int = 1,
+                         use_daemon: bool = False,
+                         budget: Optional[ScanBudget] = None,
+                         max_header_size: Optional[int] = DEFAULT_MAX_HEADER_SIZE) -> Dict[Any, int]:
+    """
+    List all unique values for a property with usage counts.
+    
+    Args:
+        vault_path: Path to Obsidian vault
+        property_name: Property name to list
+        min_count: Minimum usage count to include
+        use_index: Answer from the persistent frontmatter index
+        jobs: Number of worker processes used to parse notes
+        use_daemon: Ask the vault daemon when one is running
+        budget: Time budget, sample and progress reporting for the scan; check
+            budget.partial afterwards to see if the counts cover every note
+        max_header_size: Bytes read looking for the end of each note's
+            frontmatter before the whole note is parsed (None for no limit)
+        
+    Returns:
+        Dictionary mapping values to counts
+    """
+    counts, _ = count_facets(vault_path, [property_name], min_count, use_index=use_index,
+                             jobs=jobs, use_daemon=use_daemon, budget=budget,
+                             max_header_size=max_header_size)
+    return counts[property_name]
+
+
+def top_values(value_counts: Dict[Any, int], top: Optional[int] = None) -> List[Tuple[Any, int]]:
+    """
+    Return (value, count) pairs by descending count, keeping the first `top`.
+    
+    With top, a heap selects them without sorting every value; ties keep
+    the same order as a full sort.
+    """
+    if top is None:
+        return sorted(value_counts.items(), key=lambda x: x[1], reverse=True)
+    return heapq.nlargest(top, value_counts.items(), key=lambda x: x[1])
+
+
+def format_results_table(property_name: str, value_counts: Dict[Any, int],
+                         top: Optional[int] = None) -> str:
     """Format results as a table."""
     if not value_counts:
         return f"No values found for property '{property_name}'."
@@ -82,29 +244,173 @@ def format_results_table(property_name: str, value_counts: Dict[Any, int]) -> st
     output.append("=" * 80)
     
     # Sort by count (descending)
-    sorted_items = sorted(value_counts.items(), key=lambda x: x[1], reverse=True)
+    sorted_items = top_values(value_counts, top)
     
     for value, count in sorted_items:
         value_str = str(value)[:50]  # Truncate long values
         output.append(f"{value_str:<50} {count:>10}")
     
+    if len(sorted_items) < len(value_counts):
+        output.append(f"... {len(value_counts) - len(sorted_items)} more value(s)")
+    
     output.append("=" * 80)
     
     return "\n".join(output)
 
 
-def format_results_json(property_name: str, value_counts: Dict[Any, int]) -> str:
-    """Format results as JSON."""
+def format_cross_tab_table(property_name: str, by: str, cross_tab: Dict[str, Dict[Any, int]],
+                           top: Optional[int] = None) -> str:
+    """Format one property's values grouped by another property as a table."""
+    if not cross_tab:
+        return f"No values found for property '{property_name}' by '{by}'."
+    
+    output = []
+    output.append(f"\nProperty: {property_name} by {by}")
+    output.append(f"Groups: {len(cross_tab)}\n")
+    
+    group_totals = {group: sum(cells.values()) for group, cells in cross_tab.items()}
+    for group, total in top_values(group_totals):
+        cells = cross_tab[group]
+        output.append("=" * 80)
+        output.append(f"{by}: {group}  ({len(cells)} unique, {total} total)")
+        output.append("-" * 80)
+        items = top_values(cells, top)
+        for value, count in items:
+            value_str = str(value)[:48]  # Truncate long values
+            output.append(f"  {value_str:<48} {count:>10}")
+        if len(items) < len(cells):
+            output.append(f"  ... {len(cells) - len(items)} more value(s)")
+    
+    output.append("=" * 80)
+    
+    return "\n".join(output)
+
+
+def facet_result(property_name: str, value_counts: Dict[Any, int], top: Optional[int] = None,
+                 by: Optional[str] = None,
+                 cross_tab: Optional[Dict[str, Dict[Any, int]]] = None) -> Dict[str, Any]:
+    """Build the JSON object for one property."""
     result = {
         'property': property_name,
         'total_unique_values': len(value_counts),
         'total_usage_count': sum(value_counts.values()),
         'values': [
             {'value': str(k), 'count': v}
-            for k, v in sorted(value_counts.items(), key=lambda x: x[1], reverse=True)
+            for k, v in top_values(value_counts, top)
         ]
     }
-    return json.dumps(result, indent=2, ensure_ascii=False)
+    if by and cross_tab is not None:
+        group_totals = {group: sum(cells.values()) for group, cells in cross_tab.items()}
+        result['cross_tab'] = {
+            'by': by,
+            'groups': [
+                {
+                    'value': group,
+                    'total_unique_values': len(cross_tab[group]),
+                    'total_usage_count': total,
+                    'values': [{'value': str(k), 'count': v}
+                               for k, v in top_values(cross_tab[group], top)]
+                }
+                for group, total in top_values(group_totals)
+            ]
+        }
+    return result
+
+
+def format_results_json(property_name: str, value_counts: Dict[Any, int],
+                        top: Optional[int] = None) -> str:
+    """Format results as JSON."""
+    return json.dumps(facet_result(property_name, value_counts, top), indent=2, ensure_ascii=False)
+
+
+def approx_facet_result(property_name: str, distinct: HyperLogLog, frequent: SpaceSaving,
+                        top: Optional[int] = None, min_count: int = 1) -> Dict[str, Any]:
+    """Build the JSON object for one property summarized with --approx."""
+    return {
+        'property': property_name,
+        'total_unique_values': distinct.estimate(),
+        'total_usage_count': frequent.total,
+        'values': [
+            {'value': value, 'count': count, 'error': error}
+            for value, count, error in frequent.top(top or 0) if count >= min_count
+        ],
+        'approximate': {
+            'unique_values_relative_error': round(distinct.standard_error, 4),
+            'count_max_overestimate': frequent.error_bound,
+        }
+    }
+
+
+def format_approx_table(property_name: str, distinct: HyperLogLog, frequent: SpaceSaving,
+                        top: Optional[int] = None, min_count: int = 1) -> str:
+    """Format a property summarized with --approx as a table."""
+    if not frequent.total:
+        return f"No values found for property '{property_name}'."
+    
+    items = [item for item in frequent.top(top or 0) if item[1] >= min_count]
+    
+    output = []
+    output.append(f"\nProperty: {property_name} (approximate)")
+    output.append(f"Total unique values: ~{distinct.estimate()} "
+                  f"(±{distinct.standard_error * 200:.1f}% at 95% confidence)")
+    output.append(f"Total usage count: {frequent.total}")
+    output.append(f"Counts are upper bounds, at most the Error column above the true count "
+                  f"(never more than {frequent.error_bound})\n")
+    output.append("=" * 80)
+    output.append(f"{'Value':<50} {'Count':>10} {'Error':>10}")
+    output.append("=" * 80)
+    
+    for value, count, error in items:
+        value_str = str(value)[:50]  # Truncate long values
+        output.append(f"{value_str:<50} {count:>10} {error:>10}")
+    
+    output.append("=" * 80)
+    
+    return "\n".join(output)
+
+
+def format_facets_json(counts: Dict[str, Dict[Any, int]], top: Optional[int] = None,
+                       by: Optional[str] = None,
+                       cross_tabs: Optional[Dict[str, Dict[str, Dict[Any, int]]]] = None,
+                       budget: Optional[ScanBudget] = None) -> str:
+    """
+    Format several properties as JSON: one object per property (a single object for one).
+    
+    With a budget, the results are wrapped with a "scan" summary (see with_scan).
+    """
+    results = [facet_result(name, value_counts, top, by, (cross_tabs or {}).get(name))
+               for name, value_counts in counts.items()]
+    return json.dumps(with_scan(results[0] if len(results) == 1 else results, budget),
+                      indent=2, ensure_ascii=False)
+
+
+def format_facets_table(counts: Dict[str, Dict[Any, int]], top: Optional[int] = None,
+                        by: Optional[str] = None,
+                        cross_tabs: Optional[Dict[str, Dict[str, Dict[Any, int]]]] = None) -> str:
+    """Format several properties (and their cross-tabs) as tables."""
+    output = []
+    for name, value_counts in counts.items():
+        output.append(format_results_table(name, value_counts, top))
+        if by and name in cross_tabs:
+            output.append(format_cross_tab_table(name, by, cross_tabs[name], top))
+    return "\n".join(output)
+
+
+def with_scan(payload: Any, budget: Optional[ScanBudget]) -> Any:
+    """Wrap a JSON payload as {"scan": ..., "results": payload} when a budget limited the scan."""
+    if budget is None:
+        return payload
+    return {'scan': budget.summary(), 'results': payload}
+
+
+def write_output(output: str, output_path: Optional[str] = None) -> None:
+    """Write to file or print."""
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"Results saved to: {output_path}")
+    else:
+        print(output)
 
 
 def main():
@@ -115,34 +421,103 @@ def main():
     )
     
     parser.add_argument('vault_path', help='Path to Obsidian vault')
-    parser.add_argument('--property', required=True,
-                        help='Property name to list')
+    parser.add_argument('--property', required=True, nargs='+', action='extend',
+                        dest='properties', metavar='NAME',
+                        help='Property names to list, counted in one pass (can repeat)')
     parser.add_argument('--min-count', type=int, default=1,
                         help='Minimum usage count (default: 1)')
+    parser.add_argument('--top', type=int, metavar='K',
+                        help='Show only the K most used values of each property (and group)')
+    parser.add_argument('--by', metavar='NAME',
+                        help='Also count each property\'s values grouped by this property\'s values')
+    parser.add_argument('--approx', action='store_true',
+                        help='Estimate unique values and top counts in fixed memory, with error bounds')
+    parser.add_argument('--approx-capacity', type=int, default=DEFAULT_CAPACITY, metavar='N',
+                        help=f'With --approx, values tracked per property (default: {DEFAULT_CAPACITY})')
     parser.add_argument('--format', choices=['json', 'table'], default='table',
                         help='Output format (default: table)')
     parser.add_argument('--output', metavar='FILE',
                         help='Save output to file instead of printing to console')
+    parser.add_argument('--index', action=argparse.BooleanOptionalAction, default=False,
+                        help='Answer from the persistent frontmatter index (default: --no-index)')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='Parse notes in N worker processes (0 = all CPUs, default: 1)')
+    parser.add_argument('--daemon', action=argparse.BooleanOptionalAction, default=True,
+                        help='Ask the vault daemon when one is running (default: --daemon)')
+    parser.add_argument('--max-header-size', type=int, default=DEFAULT_MAX_HEADER_SIZE,
+                        metavar='BYTES', dest='max_header_size',
+                        help='Read at most BYTES looking for the end of a note\'s frontmatter '
+                             'before parsing the whole note (0 = no limit, default: %(default)s)')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS', dest='time_budget',
+                        help='Stop scanning after SECONDS and count only the notes scanned so far')
+    parser.add_argument('--sample', type=float, metavar='FRACTION',
+                        help='Count only this fraction of notes (0-1], picked the same way every run')
+    parser.add_argument('--progress', action=argparse.BooleanOptionalAction, default=None,
+                        help='Show a progress line with throughput and ETA on stderr '
+                             '(default: when stderr is a terminal)')
     
     args = parser.parse_args()
     
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    if args.approx and args.by:
+        parser.error("--by cannot be combined with --approx")
+    if args.approx_capacity < 1:
+        parser.error("--approx-capacity must be at least 1")
+    if args.max_header_size < 0:
+        parser.error("--max-header-size must not be negative")
+    
+    # Partial-result limits; the output is marked with how much was scanned
+    limited = args.time_budget is not None or args.sample is not None
+    progress = args.progress if args.progress is not None else sys.stderr.isatty()
+    budget = None
+    if limited or progress:
+        try:
+            budget = ScanBudget(time_budget=args.time_budget, sample=args.sample,
+                                progress=progress)
+        except ValueError as e:
+            parser.error(str(e))
+    marked = budget if limited else None
+    
+    # Each property once, in the order given
+    properties = list(dict.fromkeys(args.properties))
+    
     try:
-        value_counts = list_property_values(args.vault_path, args.property, args.min_count)
+        if args.approx:
+            # Ranking more values than are tracked would only show noise
+            capacity = max(args.approx_capacity, args.top or 0)
+            sketches = approx_facets(args.vault_path, properties, use_index=args.index,
+                                     jobs=resolve_jobs(args.jobs), use_daemon=args.daemon,
+                                     capacity=capacity, budget=budget,
+                                     max_header_size=args.max_header_size or None)
+            if args.format == 'json':
+                results = [approx_facet_result(name, distinct, frequent, args.top, args.min_count)
+                           for name, (distinct, frequent) in sketches.items()]
+                output = json.dumps(with_scan(results[0] if len(results) == 1 else results, marked),
+                                    indent=2, ensure_ascii=False)
+            else:
+                output = "\n".join(format_approx_table(name, distinct, frequent, args.top, args.min_count)
+                                   for name, (distinct, frequent) in sketches.items())
+                if budget is not None and budget.partial:
+                    output = budget.describe() + "\n" + output
+            write_output(output, args.output)
+            sys.exit(0)
+        
+        counts, cross_tabs = count_facets(args.vault_path, properties, args.min_count,
+                                          use_index=args.index,
+                                          jobs=resolve_jobs(args.jobs),
+                                          use_daemon=args.daemon, by=args.by, budget=budget,
+                                          max_header_size=args.max_header_size or None)
         
         # Format output
         if args.format == 'json':
-            output = format_results_json(args.property, value_counts)
-        else:
-            output = format_results_table(args.property, value_counts)
-        
-        # Write to file or print
-        if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(output)
-            print(f"Results saved to: {args.output}")
+            output = format_facets_json(counts, args.top, args.by, cross_tabs, marked)
         else:
-            print(output)
+            output = format_facets_table(counts, args.top, args.by, cross_tabs)
+            if budget is not None and budget.partial:
+                output = budget.describe() + "\n" + output
         
+        write_output(output, args.output)
         sys.exit(0)
     
     except Exception as e:
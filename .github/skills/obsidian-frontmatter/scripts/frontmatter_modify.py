@@ -4,6 +4,7 @@ Supports create, update, and delete operations with preview mode.
 
 Usage:
     python frontmatter_modify.py <file_or_pattern> [operation] [options]
+    python frontmatter_modify.py --vault <vault_path> --where <query> [operation] [options]
 
 Examples:
     # Preview adding a property (shows diff)
@@ -17,23 +18,51 @@ Examples:
     
     # Delete a property
     python frontmatter_modify.py "note.md" --delete "draft" --apply
+    
+    # Preview marking every draft project note as reviewed, in 4 processes
+    python frontmatter_modify.py --vault "d:\\vault" --where "status = draft and tags contains project" --update "reviewed:true" --jobs 4
+    
+    # One line per note (key: old → new) instead of diffs
+    python frontmatter_modify.py --vault "d:\\vault" --where "status = draft" --update "status:review" --summary
+    
+    # Plan the change now, apply it later with changeset.py
+    python frontmatter_modify.py --vault "d:\\vault" --where "status = draft" --update "status:review" --changeset changes.jsonl
 """
 
 import argparse
+import contextlib
+import copy
+import os
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import difflib
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 from utils import (
-    parse_frontmatter,
-    write_frontmatter,
+    HEADER_RE,
+    iter_markdown_files,
+    split_frontmatter,
     set_property_value,
     delete_property,
-    infer_property_type
+    infer_property_type,
+    format_value
 )
+from frontmatter_edit import render_note
+from note_writer import NoteTransaction, find_vault_root, stage_note, warn_pending
+from changeset import delete_edit, make_record, set_edit, write_changeset
+from scan import map_chunks, resolve_jobs
+from query import QueryPlan, QuerySyntaxError, compile_query, node_from_dict
+from property_path import compile_path
+
+
+# (file_path, status, detail, error) for one note of a bulk run, where detail
+# is the diff or, in summary mode, the summary line
+BulkRecord = Tuple[str, str, Optional[str], Optional[str]]
+
+# (file_path, status, changeset record, error) for one note of a planning run
+PlanRecord = Tuple[str, str, Optional[Dict[str, Any]], Optional[str]]
 
 
 def parse_key_value(kv_string: str) -> Tuple[str, Any]:
@@ -59,70 +88,215 @@ def parse_key_value(kv_string: str) -> Tuple[str, Any]:
     return key, value
 
 
-def modify_file(file_path: str, operation: str, key: str, value: Any = None) -> Tuple[str, str, bool]:
+def apply_operation(frontmatter: Optional[Dict[str, Any]], operation: str, key: str,
+                    value: Any = None) -> Optional[Dict[str, Any]]:
     """
-    Modify frontmatter in a file.
+    Apply one operation to parsed frontmatter.
     
     Args:
-        file_path: Path to markdown file
+        frontmatter: Parsed frontmatter (None for a note without any)
         operation: 'create', 'update', or 'delete'
         key: Property name
         value: Property value (for create/update)
         
     Returns:
-        Tuple of (original_content, modified_content, changed)
+        The modified frontmatter, or None if the note needs no change
     """
-    # Read original file
-    with open(file_path, 'r', encoding='utf-8') as f:
-        original_content = f.read()
-    
-    # Parse frontmatter
-    frontmatter, body = parse_frontmatter(file_path)
-    
     # Initialize frontmatter if it doesn't exist
     if frontmatter is None:
         frontmatter = {}
     
-    # Make a copy for modification
-    modified_frontmatter = frontmatter.copy()
-    changed = False
+    # Make a copy for modification (deep, so the original stays comparable)
+    modified_frontmatter = copy.deepcopy(frontmatter)
+    
+    # Nested, indexed and wildcard paths count as present if they select anything
+    exists = bool(compile_path(key).select(modified_frontmatter))
     
     # Apply operation
     if operation == 'create' or operation == 'update':
         # Check if property exists for 'create'
-        if operation == 'create' and key in modified_frontmatter:
+        if operation == 'create' and exists:
             # Skip if already exists
-            return original_content, original_content, False
+            return None
         
-        modified_frontmatter = set_property_value(modified_frontmatter, key, value)
-        changed = True
-    
-    elif operation == 'delete':
-        if key in modified_frontmatter:
-            modified_frontmatter = delete_property(modified_frontmatter, key)
-            changed = True
-        else:
-            # Property doesn't exist, no change
-            return original_content, original_content, False
-    
-    if not changed:
+        return set_property_value(modified_frontmatter, key, value)
+    
+    if operation == 'delete' and exists:
+        return delete_property(modified_frontmatter, key)
+    
+    # Property doesn't exist, no change
+    return None
+
+
+def modify_file(file_path: str, operation: str, key: str, value: Any = None) -> Tuple[str, str, bool]:
+    """
+    Modify frontmatter in a file.
+    
+    Args:
+        file_path: Path to markdown file
+        operation: 'create', 'update', or 'delete'
+        key: Property name
+        value: Property value (for create/update)
+        
+    Returns:
+        Tuple of (original_content, modified_content, changed)
+    """
+    # Read the file once and parse the frontmatter from memory
+    with open(file_path, 'r', encoding='utf-8') as f:
+        original_content = f.read()
+    frontmatter, body = split_frontmatter(original_content, file_path)
+    
+    modified_frontmatter = apply_operation(frontmatter, operation, key, value)
+    if modified_frontmatter is None:
         return original_content, original_content, False
     
-    # Generate modified content
-    import yaml
-    yaml_str = yaml.dump(modified_frontmatter, 
-                         default_flow_style=False, 
-                         allow_unicode=True,
-                         sort_keys=False)
-    modified_content = f"---\n{yaml_str}---\n{body}"
+    return original_content, render_note(original_content, frontmatter, modified_frontmatter, body), True
+
+
+def _modify_chunk(chunk: List[str], plan_data: Dict[str, Any], operation: str, key: str,
+                  value: Any, journal: Optional[str],
+                  summary: bool) -> List[Tuple[BulkRecord, Optional[Dict[str, Any]]]]:
+    """Worker entry point: select, modify and optionally stage a chunk of notes."""
+    plan = QueryPlan(node_from_dict(plan_data))
+    records = []
+    for file_path in chunk:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                original = f.read()
+            frontmatter, body = split_frontmatter(original, file_path)
+            if not plan.matches(frontmatter):
+                records.append(((file_path, 'unmatched', None, None), None))
+                continue
+            
+            modified_frontmatter = apply_operation(frontmatter, operation, key, value)
+            if modified_frontmatter is None:
+                records.append(((file_path, 'unchanged', None, None), None))
+                continue
+            
+            if summary and journal is None:
+                # A summary preview never needs the new note text
+                detail = format_summary(summarize_change(frontmatter, modified_frontmatter, key))
+                records.append(((file_path, 'changed', detail, None), None))
+                continue
+            
+            modified = render_note(original, frontmatter, modified_frontmatter, body)
+            # Stage into the run's transaction; notes change only when it commits
+            entry = stage_note(journal, file_path, modified) if journal is not None else None
+            if summary:
+                detail = format_summary(summarize_change(frontmatter, modified_frontmatter, key))
+            else:
+                detail = show_diff(file_path, original, modified)
+            records.append(((file_path, 'changed', detail, None), entry))
+        except Exception as e:
+            records.append(((file_path, 'error', None, str(e)), None))
+    return records
+
+
+def operation_edits(operation: str, key: str, value: Any = None) -> List[Dict[str, Any]]:
+    """Return the changeset edits that make an operation's change."""
+    if operation == 'delete':
+        return [delete_edit(key)]
+    return [set_edit(key, value)]
+
+
+def _plan_chunk(chunk: List[str], plan_data: Dict[str, Any], operation: str, key: str,
+                value: Any, root: str) -> List[PlanRecord]:
+    """Worker entry point: select notes and record their edits without writing."""
+    plan = QueryPlan(node_from_dict(plan_data))
+    records = []
+    for file_path in chunk:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                original = f.read()
+            frontmatter, _ = split_frontmatter(original, file_path)
+            if not plan.matches(frontmatter):
+                records.append((file_path, 'unmatched', None, None))
+            elif apply_operation(frontmatter, operation, key, value) is None:
+                records.append((file_path, 'unchanged', None, None))
+            else:
+                record = make_record(root, file_path, original, operation_edits(operation, key, value))
+                records.append((file_path, 'changed', record, None))
+        except Exception as e:
+            records.append((file_path, 'error', None, str(e)))
+    return records
+
+
+def plan_bulk_modify(vault_path: str, plan: QueryPlan, operation: str, key: str, value: Any = None,
+                     jobs: int = 1) -> Iterator[PlanRecord]:
+    """
+    Plan a vault-wide modification as changeset records, writing no note.
     
-    return original_content, modified_content, True
+    Args:
+        vault_path: Path to Obsidian vault
+        plan: Compiled query selecting the notes to modify
+        operation: 'create', 'update', or 'delete'
+        key: Property name
+        value: Property value (for create/update)
+        jobs: Number of worker processes
+        
+    Yields:
+        Tuples of (file_path, status, record, error) in vault walk order, with
+        a changeset record (see changeset.py) for every 'changed' note
+    """
+    yield from map_chunks(_plan_chunk, iter_markdown_files(vault_path), jobs,
+                          plan.root.to_dict(), operation, key, value, vault_path)
+
+
+def bulk_modify(vault_path: str, plan: QueryPlan, operation: str, key: str, value: Any = None,
+                jobs: int = 1, apply: bool = False, summary: bool = False) -> Iterator[BulkRecord]:
+    """
+    Apply one operation to every note in the vault that matches a query.
+    
+    Each note is read once; selection, modification and (with apply)
+    staging the new text happen in the same pass, spread over jobs worker
+    processes. The staged notes are then committed as one transaction (see
+    note_writer.py), so a crash never leaves the vault half-edited.
+    
+    Args:
+        vault_path: Path to Obsidian vault
+        plan: Compiled query selecting the notes to modify
+        operation: 'create', 'update', or 'delete'
+        key: Property name
+        value: Property value (for create/update)
+        jobs: Number of worker processes
+        apply: Write the changes (default: preview only)
+        summary: Report each change as a "key: old → new" line instead of a diff
+        
+    Yields:
+        Tuples of (file_path, status, detail, error) in vault walk order, where
+        status is 'changed', 'unchanged', 'unmatched' or 'error'
+    """
+    if not apply:
+        for record, _ in map_chunks(_modify_chunk, iter_markdown_files(vault_path), jobs,
+                                    plan.root.to_dict(), operation, key, value, None, summary):
+            yield record
+        return
+    
+    # All notes are written together once the pass completes; an error or an
+    # interrupted run rolls the whole batch back
+    with NoteTransaction(vault_path) as transaction:
+        for record, entry in map_chunks(_modify_chunk, iter_markdown_files(vault_path), jobs,
+                                        plan.root.to_dict(), operation, key, value,
+                                        transaction.journal, summary):
+            if entry is not None:
+                transaction.add(entry)
+            yield record
+
+
+def _header_length(content: str) -> int:
+    """Length of the frontmatter block including its delimiters (0 if there is none)."""
+    match = HEADER_RE.match(content)
+    return match.end() if match else 0
 
 
 def show_diff(file_path: str, original: str, modified: str) -> str:
     """
     Generate a diff between original and modified content.
     
+    When only the frontmatter changed, just the header lines are diffed and
+    the unchanged body is reported by a marker line, so the cost does not
+    grow with the size of the note.
+    
     Args:
         file_path: Path to file
         original: Original content
@@ -131,18 +305,179 @@ def show_diff(file_path: str, original: str, modified: str) -> str:
     Returns:
         Diff string
     """
+    original_end = _header_length(original)
+    modified_end = _header_length(modified)
+    marker = ''
+    if original[original_end:] == modified[modified_end:]:
+        body = original[original_end:]
+        if body:
+            body_lines = body.count('\n') + (not body.endswith('\n'))
+            first_line = original.count('\n', 0, original_end) + 1
+            new_first_line = modified.count('\n', 0, modified_end) + 1
+            marker = (f"... body unchanged: {body_lines} line(s) from line {first_line}"
+                      f" (line {new_first_line} after the change)\n")
+        original = original[:original_end]
+        modified = modified[:modified_end]
+    
     original_lines = original.splitlines(keepends=True)
     modified_lines = modified.splitlines(keepends=True)
     
-    diff = difflib.unified_diff(
+    diff = []
+    for line in difflib.unified_diff(
         original_lines,
         modified_lines,
         fromfile=f"a/{Path(file_path).name}",
-        tofile=f"b/{Path(file_path).name}",
-        lineterm=''
-    )
+        tofile=f"b/{Path(file_path).name}"
+    ):
+        # Keep a last line without a line break from running into the next one
+        diff.append(line if line.endswith('\n') else line + '\n')
+    
+    return ''.join(diff) + marker
+
+
+_MISSING = object()
+
+
+def _lookup(frontmatter: Optional[Dict[str, Any]], key: str) -> Any:
+    """Like get_property_value, but tells a missing property apart from null."""
+    path = compile_path(key)
+    selected = path.select(frontmatter)
+    if not selected:
+        return _MISSING
+    return selected if path.wildcard else selected[0]
+
+
+def summarize_change(frontmatter: Optional[Dict[str, Any]], modified_frontmatter: Dict[str, Any],
+                     key: str) -> Tuple[str, str, str]:
+    """
+    Describe a change to one property.
+    
+    Returns:
+        Tuple of (key, old_value, new_value) for display, where a missing
+        property shows as '(none)'
+    """
+    def describe(value: Any) -> str:
+        return '(none)' if value is _MISSING else format_value(value)
     
-    return ''.join(diff)
+    return key, describe(_lookup(frontmatter, key)), describe(_lookup(modified_frontmatter, key))
+
+
+def format_summary(change: Tuple[str, str, str]) -> str:
+    """Format a (key, old, new) change as one line."""
+    key, old, new = change
+    return f"{key}: {old} → {new}"
+
+
+def common_folder(files: List[str]) -> str:
+    """Return the deepest folder containing every file (the first file's on other drives)."""
+    folders = [os.path.dirname(os.path.abspath(file_path)) for file_path in files]
+    try:
+        return os.path.commonpath(folders)
+    except ValueError:
+        return folders[0]
+
+
+def run_bulk_plan(vault_path: str, plan: QueryPlan, operation: str, key: str, value: Any,
+                  changeset_path: str, jobs: int = 1) -> None:
+    """Plan a vault-wide modification into a changeset file and print a summary."""
+    print(f"\n{'='*80}")
+    print(f"Operation: {operation.upper()}")
+    print(f"Property: {key}")
+    if value is not None:
+        print(f"Value: {value}")
+    print(f"Vault: {vault_path}")
+    print(f"Where: {plan}")
+    print(f"Mode: PLAN")
+    print(f"{'='*80}\n")
+    
+    counts = {'changed': 0, 'unchanged': 0, 'unmatched': 0, 'error': 0}
+    
+    def planned():
+        for file_path, status, record, error in plan_bulk_modify(vault_path, plan, operation, key,
+                                                                 value, jobs=jobs):
+            counts[status] += 1
+            if error is not None:
+                print(f"✗ Error processing {file_path}: {error}", file=sys.stderr)
+            elif record is not None:
+                yield record
+    
+    try:
+        write_changeset(changeset_path, vault_path, planned(), 'frontmatter_modify')
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    print(f"\n{'='*80}")
+    print(f"Summary:")
+    print(f"  Notes scanned: {sum(counts.values())}")
+    print(f"  Matched: {counts['changed'] + counts['unchanged']}")
+    print(f"  Planned changes: {counts['changed']}")
+    print(f"  No changes needed: {counts['unchanged']}")
+    print(f"  Errors: {counts['error']}")
+    print(f"{'='*80}\n")
+    print(f"Changeset saved to: {changeset_path}")
+    print(f"Apply it with: python changeset.py \"{changeset_path}\"")
+
+
+def run_bulk_modify(vault_path: str, plan: QueryPlan, operation: str, key: str, value: Any,
+                    jobs: int = 1, apply: bool = False, force: bool = False,
+                    summary: bool = False) -> None:
+    """Run a vault-wide modification and print one combined diff and summary at the end."""
+    print(f"\n{'='*80}")
+    print(f"Operation: {operation.upper()}")
+    print(f"Property: {key}")
+    if value is not None:
+        print(f"Value: {value}")
+    print(f"Vault: {vault_path}")
+    print(f"Where: {plan}")
+    print(f"Mode: {'APPLY' if apply else 'PREVIEW'}")
+    print(f"{'='*80}\n")
+    
+    if apply:
+        warn_pending(vault_path)
+    
+    if apply and not force:
+        # One confirmation for the whole run instead of one per file
+        response = input(f"Apply changes to every matching note in {vault_path}? [y/N]: ")
+        if response.lower() != 'y':
+            print("Cancelled")
+            return
+    
+    counts = {'changed': 0, 'unchanged': 0, 'unmatched': 0, 'error': 0}
+    details = []
+    try:
+        for file_path, status, detail, error in bulk_modify(vault_path, plan, operation, key, value,
+                                                            jobs=jobs, apply=apply, summary=summary):
+            counts[status] += 1
+            if error is not None:
+                print(f"✗ Error processing {file_path}: {error}", file=sys.stderr)
+            elif detail is not None:
+                details.append((file_path, detail))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    for file_path, detail in details:
+        if summary:
+            print(f"{file_path}: {detail}")
+            continue
+        print(f"{'─'*80}")
+        print(f"File: {file_path}")
+        print(f"{'─'*80}")
+        print(detail)
+    
+    print(f"\n{'='*80}")
+    print(f"Summary:")
+    print(f"  Notes scanned: {sum(counts.values())}")
+    print(f"  Matched: {counts['changed'] + counts['unchanged']}")
+    print(f"  Changed files: {counts['changed']}")
+    print(f"  No changes needed: {counts['unchanged']}")
+    print(f"  Errors: {counts['error']}")
+    print(f"  Mode: {'APPLIED' if apply else 'PREVIEW ONLY'}")
+    print(f"{'='*80}\n")
+    
+    if not apply and counts['changed'] > 0:
+        print("⚠ Changes were NOT applied. Add --apply flag to apply changes.")
 
 
 def main():
@@ -154,6 +489,12 @@ def main():
     
     parser.add_argument('file', nargs='?', help='Path to markdown file')
     parser.add_argument('--files', nargs='+', help='Multiple file paths')
+    parser.add_argument('--vault', metavar='PATH',
+                        help='Modify every note in the vault that matches --where')
+    parser.add_argument('--where', metavar='QUERY',
+                        help='Boolean query selecting notes in --vault, e.g. "status = draft and tags contains project"')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='With --vault, process notes in N worker processes (0 = all CPUs, default: 1)')
     
     # Operations
     parser.add_argument('--create', metavar='KEY:VALUE',
@@ -168,12 +509,25 @@ def main():
                         help='Actually apply changes (default: preview only)')
     parser.add_argument('--force', action='store_true',
                         help='Skip confirmation (use with caution!)')
+    parser.add_argument('--summary', action='store_true',
+                        help='Print one "key: old → new" line per changed note instead of diffs')
+    parser.add_argument('--changeset', metavar='FILE',
+                        help='Write the planned edits to a changeset file for changeset.py instead of previewing')
     
     args = parser.parse_args()
     
     # Validate arguments
-    if not args.file and not args.files:
-        parser.error("Must specify either file or --files")
+    if args.vault:
+        if args.file or args.files:
+            parser.error("--vault cannot be combined with file or --files")
+        if not args.where:
+            parser.error("--vault requires a --where query selecting the notes to modify")
+    elif args.where:
+        parser.error("--where needs --vault")
+    elif not args.file and not args.files:
+        parser.error("Must specify either file, --files, or --vault with --where")
+    if args.changeset and args.apply:
+        parser.error("--changeset plans the edits; apply them later with changeset.py instead of --apply")
     
     # Determine operation
     operations = []
@@ -198,6 +552,20 @@ def main():
         key = operation_value
         value = None
     
+    if args.vault:
+        try:
+            plan = compile_query(query=args.where)
+        except QuerySyntaxError as e:
+            parser.error(f"Invalid --where query: {e}")
+        if args.changeset:
+            run_bulk_plan(args.vault, plan, operation_type, key, value, args.changeset,
+                          jobs=resolve_jobs(args.jobs))
+            sys.exit(0)
+        run_bulk_modify(args.vault, plan, operation_type, key, value,
+                        jobs=resolve_jobs(args.jobs), apply=args.apply, force=args.force,
+                        summary=args.summary)
+        sys.exit(0)
+    
     # Get file list
     files = []
     if args.file:
@@ -215,53 +583,83 @@ def main():
     if value is not None:
         print(f"Value: {value}")
     print(f"Files to process: {total_files}")
-    print(f"Mode: {'APPLY' if args.apply else 'PREVIEW'}")
+    print(f"Mode: {'APPLY' if args.apply else 'PLAN' if args.changeset else 'PREVIEW'}")
     print(f"{'='*80}\n")
     
-    for file_path in files:
-        try:
-            original, modified, changed = modify_file(file_path, operation_type, key, value)
+    # Accepted changes are staged and written together as one transaction
+    transaction = contextlib.nullcontext()
+    root = find_vault_root(common_folder(files))
+    if args.apply:
+        warn_pending(root)
+        transaction = NoteTransaction(root)
+    staged = []
+    planned = []
+    
+    with transaction:
+        for file_path in files:
+            try:
+                original, modified, changed = modify_file(file_path, operation_type, key, value)
+                
+                if not changed:
+                    print(f"⊘ {file_path}: No changes needed")
+                    continue
+                
+                changed_files += 1
+                
+                if args.summary:
+                    frontmatter, _ = split_frontmatter(original, file_path)
+                    modified_frontmatter, _ = split_frontmatter(modified, file_path)
+                    print(f"{file_path}: {format_summary(summarize_change(frontmatter, modified_frontmatter, key))}")
+                else:
+                    # Show diff
+                    print(f"\n{'─'*80}")
+                    print(f"File: {file_path}")
+                    print(f"{'─'*80}")
+                    diff = show_diff(file_path, original, modified)
+                    print(diff)
+                
+                if args.changeset:
+                    planned.append(make_record(root, file_path, original,
+                                               operation_edits(operation_type, key, value)))
+                
+                # Apply changes if requested
+                if args.apply:
+                    if not args.force:
+                        # Ask for confirmation
+                        response = input(f"\nApply changes to {Path(file_path).name}? [y/N]: ")
+                        if response.lower() != 'y':
+                            print("  Skipped")
+                            continue
+                    
+                    transaction.stage(file_path, modified)
+                    staged.append(file_path)
             
-            if not changed:
-                print(f"⊘ {file_path}: No changes needed")
+            except Exception as e:
+                print(f"✗ Error processing {file_path}: {e}", file=sys.stderr)
                 continue
-            
-            changed_files += 1
-            
-            # Show diff
-            print(f"\n{'─'*80}")
-            print(f"File: {file_path}")
-            print(f"{'─'*80}")
-            diff = show_diff(file_path, original, modified)
-            print(diff)
-            
-            # Apply changes if requested
-            if args.apply:
-                if not args.force:
-                    # Ask for confirmation
-                    response = input(f"\nApply changes to {Path(file_path).name}? [y/N]: ")
-                    if response.lower() != 'y':
-                        print("  Skipped")
-                        continue
-                
-                # Write changes
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(modified)
-                print(f"✓ Applied changes to {file_path}")
-        
-        except Exception as e:
-            print(f"✗ Error processing {file_path}: {e}", file=sys.stderr)
-            continue
+    
+    for file_path in staged:
+        print(f"✓ Applied changes to {file_path}")
+    
+    if args.changeset:
+        try:
+            write_changeset(args.changeset, root, planned, 'frontmatter_modify')
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
     
     # Summary
     print(f"\n{'='*80}")
     print(f"Summary:")
     print(f"  Total files: {total_files}")
     print(f"  Changed files: {changed_files}")
-    print(f"  Mode: {'APPLIED' if args.apply else 'PREVIEW ONLY'}")
+    print(f"  Mode: {'APPLIED' if args.apply else 'PLANNED' if args.changeset else 'PREVIEW ONLY'}")
     print(f"{'='*80}\n")
     
-    if not args.apply and changed_files > 0:
+    if args.changeset:
+        print(f"Changeset saved to: {args.changeset}")
+        print(f"Apply it with: python changeset.py \"{args.changeset}\"")
+    elif not args.apply and changed_files > 0:
         print("⚠ Changes were NOT applied. Add --apply flag to apply changes.")
     
     sys.exit(0)
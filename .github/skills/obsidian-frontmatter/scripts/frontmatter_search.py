@@ -13,81 +13,155 @@ Examples:
     
     # Find notes with status equals "done"
     python frontmatter_search.py "d:\vault" --property status --equals "done"
+    
+    # Combine operators with and/or/not
+    python frontmatter_search.py "d:\vault" --where "status = done and (priority > 2 or tags contains urgent)"
+    
+    # Stream the first 20 matches as JSON lines
+    python frontmatter_search.py "d:\vault" --property tags --contains "project" --format ndjson --limit 20
+    
+    # Return whatever is found within 30 seconds, from a 10% sample of notes
+    python frontmatter_search.py "d:\vault" --property status --equals "done" --time-budget 30 --sample 0.1
+    
+    # Filter the whole vault at once with typed columns (needs NumPy)
+    python frontmatter_search.py "d:\vault" --where "due < 2024-06-01 and priority >= 2" --columnar
 """
 
 import argparse
 import json
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, TextIO, Union
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
-from utils import (
-    find_markdown_files,
-    parse_frontmatter,
-    get_property_value,
-    property_matches,
-    format_value,
-    infer_property_type
-)
+from utils import DEFAULT_MAX_HEADER_SIZE, format_value
+from property_path import compile_path
+from scan import ScanBudget, iter_frontmatter, property_keys, resolve_jobs
+from query import QueryPlan, QuerySyntaxError, compile_query, make_target
+import columnar
 
 
-def search_notes(vault_path: str, filters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def iter_search_notes(vault_path: str, filters: Union[List[Dict[str, Any]], QueryPlan],
+                      use_index: bool = False, jobs: int = 1,
+                      use_daemon: bool = False,
+                      use_columnar: bool = False,
+                      budget: Optional[ScanBudget] = None,
+                      max_header_size: Optional[int] = DEFAULT_MAX_HEADER_SIZE) -> Iterator[Dict[str, Any]]:
     """
-    Search notes by frontmatter properties.
+    Search notes by frontmatter properties, yielding each match as it is found.
+    
+    Stopping iteration early also stops the vault walk.
     
     Args:
         vault_path: Path to Obsidian vault
         filters: List of filter dictionaries with 'property', 'operator', 'value'
+            (AND logic), or a compiled QueryPlan
+        use_index: Answer from the persistent frontmatter index, using its
+            value indexes to skip notes that cannot match
+        jobs: Number of worker processes used to parse notes
+        use_daemon: Ask the vault daemon when one is running
+        use_columnar: Evaluate the query as vectorized masks over the columnar
+            property cache (needs NumPy; see columnar.py for its typing rules)
+        budget: Time budget, sample and progress reporting for the scan; when
+            it runs out, the matches found so far are all that is yielded
+        max_header_size: Bytes read looking for the end of each note's
+            frontmatter before the whole note is parsed (None for no limit)
         
-    Returns:
-        List of matching notes with file path and matching properties
+    Yields:
+        Matching notes with file path and the properties the query references
     """
-    results = []
-    md_files = find_markdown_files(vault_path)
+    plan = filters if isinstance(filters, QueryPlan) else compile_query(filters=filters)
+    if use_columnar:
+        if budget is not None:
+            raise ValueError("A scan budget does not apply to columnar searches")
+        yield from _iter_columnar_matches(vault_path, plan, jobs)
+        return
+    keys = property_keys(plan.properties)
+    accessors = {prop_name: compile_path(prop_name).get for prop_name in plan.properties}
     
-    for file_path in md_files:
+    for file_path, frontmatter, error in iter_frontmatter(vault_path, use_index=use_index,
+                                                          jobs=jobs, keys=keys, plan=plan,
+                                                          use_daemon=use_daemon, budget=budget,
+                                                          max_header_size=max_header_size):
+        if error is not None:
+            print(f"Warning: Skipping {file_path}: {error}", file=sys.stderr)
+            continue
+        
         try:
-            frontmatter, _ = parse_frontmatter(file_path)
-            
-            # Check if all filters match (AND logic)
-            all_match = True
-            matched_properties = {}
-            
-            for filter_spec in filters:
-                prop_name = filter_spec['property']
-                operator = filter_spec['operator']
-                target = filter_spec.get('value')
-                
-                prop_value = get_property_value(frontmatter, prop_name)
-                
-                if not property_matches(prop_value, operator, target):
-                    all_match = False
-                    break
-                
-                matched_properties[prop_name] = prop_value
-            
-            if all_match and matched_properties:
-                results.append({
-                    'file': file_path,
-                    'properties': matched_properties
-                })
+            if not plan.matches(frontmatter):
+                continue
+            matched_properties = {
+                prop_name: get(frontmatter)
+                for prop_name, get in accessors.items()
+            }
         
         except Exception as e:
-            # Skip files with errors (malformed YAML, etc.)
+            # Skip files with errors
             print(f"Warning: Skipping {file_path}: {e}", file=sys.stderr)
             continue
+        
+        yield {
+            'file': file_path,
+            'properties': matched_properties
+        }
+
+
+def _iter_columnar_matches(vault_path: str, plan: QueryPlan, jobs: int) -> Iterator[Dict[str, Any]]:
+    store = columnar.open_store(vault_path, plan.properties, jobs=jobs)
+    for file_path, matched_properties, error in store.scan(plan):
+        if error is not None:
+            print(f"Warning: Skipping {file_path}: {error}", file=sys.stderr)
+            continue
+        yield {
+            'file': file_path,
+            'properties': matched_properties
+        }
+
+
+def search_notes(vault_path: str, filters: Union[List[Dict[str, Any]], QueryPlan],
+                 use_index: bool = False, jobs: int = 1,
+                 limit: Optional[int] = None, use_daemon: bool = False,
+                 use_columnar: bool = False,
+                 budget: Optional[ScanBudget] = None,
+                 max_header_size: Optional[int] = DEFAULT_MAX_HEADER_SIZE) -> List[Dict[str, Any]]:
+    """
+    Search notes by frontmatter properties.
     
-    return results
+    Args:
+        vault_path: Path to Obsidian vault
+        filters: List of filter dictionaries with 'property', 'operator', 'value'
+            (AND logic), or a compiled QueryPlan
+        use_index: Answer from the persistent frontmatter index
+        jobs: Number of worker processes used to parse notes
+        limit: Stop after this many matches (None for all)
+        use_daemon: Ask the vault daemon when one is running
+        use_columnar: Filter with the columnar property cache (needs NumPy)
+        budget: Time budget, sample and progress reporting for the scan; check
+            budget.partial afterwards to see if the results cover every note
+        max_header_size: Bytes read looking for the end of each note's
+            frontmatter before the whole note is parsed (None for no limit)
+        
+    Returns:
+        List of matching notes with file path and matching properties
+    """
+    matches = iter_search_notes(vault_path, filters, use_index=use_index, jobs=jobs,
+                                use_daemon=use_daemon, use_columnar=use_columnar,
+                                budget=budget, max_header_size=max_header_size)
+    return list(islice(matches, limit))
 
 
-def format_results_table(results: List[Dict[str, Any]]) -> str:
-    """Format search results as a table."""
+def format_results_table(results: List[Dict[str, Any]],
+                         budget: Optional[ScanBudget] = None) -> str:
+    """Format search results as a table, noting when they are partial."""
+    output = []
+    if budget is not None and budget.partial:
+        output.append(budget.describe())
     if not results:
-        return "No matching notes found."
+        output.append("No matching notes found.")
+        return "\n".join(output)
     
-    output = []
     output.append(f"\nFound {len(results)} matching note(s):\n")
     output.append("=" * 80)
     
@@ -109,22 +183,51 @@ def format_results_table(results: List[Dict[str, Any]]) -> str:
     return "\n".join(output)
 
 
-def format_results_json(results: List[Dict[str, Any]]) -> str:
-    """Format search results as JSON."""
+def serialize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a search result into JSON-serializable form."""
     # Convert datetime objects to strings for JSON serialization
-    serializable_results = []
-    for result in results:
-        serializable_result = {
-            'file': result['file'],
-            'properties': {}
-        }
-        for key, value in result['properties'].items():
-            serializable_result['properties'][key] = format_value(value)
-        serializable_results.append(serializable_result)
+    return {
+        'file': result['file'],
+        'properties': {key: format_value(value) for key, value in result['properties'].items()}
+    }
+
+
+def format_results_json(results: List[Dict[str, Any]],
+                        budget: Optional[ScanBudget] = None) -> str:
+    """
+    Format search results as JSON.
     
+    With a budget, the list is wrapped as {"scan": ..., "results": [...]},
+    where "scan" says whether the results are partial (see ScanBudget.summary).
+    """
+    serializable_results = [serialize_result(result) for result in results]
+    if budget is not None:
+        return json.dumps({'scan': budget.summary(), 'results': serializable_results},
+                          indent=2, ensure_ascii=False)
     return json.dumps(serializable_results, indent=2, ensure_ascii=False)
 
 
+def write_results_ndjson(results: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """
+    Write each search result as one JSON line as soon as it is produced.
+    
+    Returns:
+        Number of results written
+    """
+    count = 0
+    for result in results:
+        stream.write(json.dumps(serialize_result(result), ensure_ascii=False) + "\n")
+        stream.flush()
+        count += 1
+    return count
+
+
+def write_scan_ndjson(budget: ScanBudget, stream: TextIO) -> None:
+    """Close an ndjson stream with a {"scan": ...} line saying how much was scanned."""
+    stream.write(json.dumps({'scan': budget.summary()}, ensure_ascii=False) + "\n")
+    stream.flush()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Search Obsidian notes by frontmatter properties',
@@ -147,16 +250,45 @@ def main():
                         help='Check if property is greater than value')
     parser.add_argument('--lt', metavar='VALUE',
                         help='Check if property is less than value')
-    parser.add_argument('--format', choices=['json', 'table'], default='table',
-                        help='Output format (default: table)')
+    parser.add_argument('--where', metavar='QUERY',
+                        help='Boolean query, e.g. "status = done and (priority > 2 or tags contains urgent)"')
+    parser.add_argument('--explain', action='store_true',
+                        help='Print the compiled, reordered query plan to stderr')
+    parser.add_argument('--format', choices=['json', 'ndjson', 'table'], default='table',
+                        help='Output format; ndjson streams one match per line (default: table)')
+    parser.add_argument('--limit', type=int, metavar='N',
+                        help='Stop after N matches')
     parser.add_argument('--output', metavar='FILE',
                         help='Save output to file instead of printing to console')
+    parser.add_argument('--index', action=argparse.BooleanOptionalAction, default=False,
+                        help='Answer from the persistent frontmatter index (default: --no-index)')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='Parse notes in N worker processes (0 = all CPUs, default: 1)')
+    parser.add_argument('--daemon', action=argparse.BooleanOptionalAction, default=True,
+                        help='Ask the vault daemon when one is running (default: --daemon)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Filter the whole vault at once with the typed columnar cache (needs NumPy)')
+    parser.add_argument('--max-header-size', type=int, default=DEFAULT_MAX_HEADER_SIZE,
+                        metavar='BYTES', dest='max_header_size',
+                        help='Read at most BYTES looking for the end of a note\'s frontmatter '
+                             'before parsing the whole note (0 = no limit, default: %(default)s)')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS', dest='time_budget',
+                        help='Stop scanning after SECONDS and return the partial results')
+    parser.add_argument('--sample', type=float, metavar='FRACTION',
+                        help='Scan only this fraction of notes (0-1], picked the same way every run')
+    parser.add_argument('--progress', action=argparse.BooleanOptionalAction, default=None,
+                        help='Show a progress line with throughput and ETA on stderr '
+                             '(default: when stderr is a terminal)')
     
     args = parser.parse_args()
     
     # Validate arguments
-    if not args.properties:
-        parser.error("At least one --property must be specified")
+    if not args.properties and not args.where:
+        parser.error("At least one --property or a --where query must be specified")
+    if args.max_header_size < 0:
+        parser.error("--max-header-size must not be negative")
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit must be at least 0")
     
     # Determine operator
     operators = []
@@ -173,42 +305,96 @@ def main():
     if args.lt:
         operators.append('lt')
     
-    if len(operators) == 0:
-        parser.error("Must specify at least one operator: --exists, --not-exists, --equals, --contains, --gt, or --lt")
-    if len(operators) > 1:
-        parser.error("Can only specify one operator per search")
-    
-    operator = operators[0]
-    
-    # Get target value
-    target = None
-    if operator == 'equals':
-        target = infer_property_type(args.equals)
-    elif operator == 'contains':
-        target = args.contains
-    elif operator == 'gt':
-        target = infer_property_type(args.gt)
-    elif operator == 'lt':
-        target = infer_property_type(args.lt)
-    
-    # Build filters (one filter per property)
     filters = []
-    for prop_name in args.properties:
-        filters.append({
-            'property': prop_name,
-            'operator': operator,
-            'value': target
-        })
+    if args.properties:
+        if len(operators) == 0:
+            parser.error("Must specify at least one operator: --exists, --not-exists, --equals, --contains, --gt, or --lt")
+        if len(operators) > 1:
+            parser.error("Can only specify one operator per search (use --where to combine operators)")
+        
+        operator = operators[0]
+        
+        # Get target value
+        target = None
+        if operator == 'equals':
+            target = make_target(operator, args.equals)
+        elif operator == 'contains':
+            target = make_target(operator, args.contains)
+        elif operator == 'gt':
+            target = make_target(operator, args.gt)
+        elif operator == 'lt':
+            target = make_target(operator, args.lt)
+        
+        # Build filters (one filter per property)
+        for prop_name in args.properties:
+            filters.append({
+                'property': prop_name,
+                'operator': operator,
+                'value': target
+            })
+    elif operators:
+        parser.error("Operator flags need --property")
+    if args.columnar and not columnar.numpy_available():
+        parser.error("--columnar needs NumPy (pip install numpy)")
+    
+    # Partial-result limits; the output is marked with how much was scanned
+    limited = args.time_budget is not None or args.sample is not None
+    if args.columnar and limited:
+        parser.error("--time-budget and --sample do not apply to --columnar")
+    progress = args.progress if args.progress is not None else sys.stderr.isatty()
+    budget = None
+    if (limited or progress) and not args.columnar:
+        try:
+            budget = ScanBudget(time_budget=args.time_budget, sample=args.sample,
+                                progress=progress)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    # Compile flags and query into one plan
+    try:
+        plan = compile_query(query=args.where, filters=filters)
+    except QuerySyntaxError as e:
+        parser.error(f"Invalid --where query: {e}")
+    
+    if args.explain:
+        print(f"Plan: {plan}", file=sys.stderr)
     
     # Execute search
     try:
-        results = search_notes(args.vault_path, filters)
+        if args.format == 'ndjson':
+            # Stream matches as they are found
+            matches = islice(iter_search_notes(args.vault_path, plan, use_index=args.index,
+                                               jobs=resolve_jobs(args.jobs),
+                                               use_daemon=args.daemon,
+                                               use_columnar=args.columnar,
+                                               budget=budget,
+                                               max_header_size=args.max_header_size or None),
+                           args.limit)
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    found = write_results_ndjson(matches, f)
+                    if limited:
+                        write_scan_ndjson(budget, f)
+                print(f"Results saved to: {args.output}")
+            else:
+                found = write_results_ndjson(matches, sys.stdout)
+                if limited:
+                    write_scan_ndjson(budget, sys.stdout)
+            if budget is not None and budget.partial:
+                print(budget.describe(), file=sys.stderr)
+            
+            sys.exit(0 if found else 1)
+        
+        results = search_notes(args.vault_path, plan, use_index=args.index,
+                               jobs=resolve_jobs(args.jobs), limit=args.limit,
+                               use_daemon=args.daemon, use_columnar=args.columnar,
+                               budget=budget, max_header_size=args.max_header_size or None)
         
         # Format output
         if args.format == 'json':
-            output = format_results_json(results)
+            output = format_results_json(results, budget if limited else None)
         else:
-            output = format_results_table(results)
+            output = format_results_table(results, budget)
         
         # Write to file or print
         if args.output:
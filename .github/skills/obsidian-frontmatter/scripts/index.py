@@ -0,0 +1,225 @@
+"""
+Persistent frontmatter index for Obsidian vaults.
+Stores each note's parsed frontmatter in SQLite, keyed by path, mtime and size,
+so repeated queries only re-parse notes whose stat changed. Property values
+are also posted to value indexes (see value_index.py) so queries can skip
+notes that cannot match.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Iterable, Iterator, Set, Tuple, Union
+
+from utils import DEFAULT_MAX_HEADER_SIZE, read_frontmatter
+from value_index import POSTINGS_SCHEMA, iter_postings
+
+
+INDEX_DIR = '.obsidian'
+INDEX_FILENAME = 'frontmatter-index.sqlite'
+
+# Bump when the stored payload format changes; older indexes are rebuilt.
+SCHEMA_VERSION = 3
+
+
+def default_index_path(vault_path: str) -> Path:
+    """Return the index location inside the vault's hidden directory."""
+    return Path(vault_path) / INDEX_DIR / INDEX_FILENAME
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Convert a parsed YAML value into a JSON-safe structure.
+
+    Dates are tagged so they decode back to the same type. Raises TypeError for
+    values that cannot round-trip exactly (non-string keys, binary, sets).
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, list):
+        return [encode_value(v) for v in value]
+    if isinstance(value, dict):
+        encoded = {}
+        for key, item in value.items():
+            if not isinstance(key, str) or key in ('__date__', '__datetime__'):
+                raise TypeError(f"Unsupported frontmatter key: {key!r}")
+            encoded[key] = encode_value(item)
+        return encoded
+    raise TypeError(f"Unsupported frontmatter value type: {type(value).__name__}")
+
+
+def decode_object(obj: Dict[str, Any]) -> Any:
+    """json.loads object_hook that restores values tagged by encode_value."""
+    if len(obj) == 1:
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+    return obj
+
+
+class FrontmatterIndex:
+    """
+    SQLite-backed cache of parsed frontmatter.
+
+    Each row holds a note's relative path, st_mtime_ns, st_size and either the
+    encoded frontmatter or the parse error message, so indexed runs report the
+    same warnings as unindexed runs.
+    """
+
+    def __init__(self, vault_path: str, index_path: Optional[str] = None,
+                 max_header_size: Optional[int] = DEFAULT_MAX_HEADER_SIZE):
+        self.vault_path = str(Path(vault_path).absolute())
+        # Passed to read_frontmatter for notes parsed without parse_many
+        self.max_header_size = max_header_size
+        self.index_path = Path(index_path) if index_path else default_index_path(vault_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.index_path))
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.conn.execute('DROP TABLE IF EXISTS notes')
+            self.conn.execute('DROP TABLE IF EXISTS postings')
+            self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS notes ('
+            ' path TEXT PRIMARY KEY,'
+            ' mtime_ns INTEGER NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' frontmatter TEXT,'
+            ' error TEXT)'
+        )
+        for statement in POSTINGS_SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def refresh(self, md_files: List[Union[str, os.DirEntry]],
+                parse_many: Optional[Callable[[List[str]], Iterable[Tuple[str, Any, Any]]]] = None,
+                prune: Optional[Callable[[sqlite3.Connection], Optional[Set[str]]]] = None
+                ) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Bring the index up to date and yield every note's frontmatter.
+
+        Notes whose mtime and size match the stored row are served from the
+        index; all others are re-parsed and stored. Rows for notes that no
+        longer exist are dropped.
+
+        Args:
+            md_files: Absolute paths of the vault's markdown files, or their
+                DirEntry objects from the walk, whose cached stat is reused
+            parse_many: Optional batch parser for changed notes, yielding
+                (file_path, frontmatter, error). When given, all changed notes
+                are parsed in one batch before results are yielded.
+            prune: Optional lookup returning the relative paths of candidate
+                notes (or None for all), run once every changed note is
+                stored. Indexed notes outside the candidates are not decoded
+                or yielded; parse errors are always yielded.
+
+        Yields:
+            Tuples of (file_path, frontmatter, error_message), in md_files order
+        """
+        stored = {
+            row[0]: row[1:]
+            for row in self.conn.execute('SELECT path, mtime_ns, size, frontmatter, error FROM notes')
+        }
+        entries = []
+        for md_file in md_files:
+            file_path = os.fspath(md_file)
+            rel_path = os.path.relpath(file_path, self.vault_path)
+            try:
+                stat = md_file.stat() if isinstance(md_file, os.DirEntry) else os.stat(file_path)
+            except OSError:
+                stat = None
+            row = stored.get(rel_path)
+            fresh = stat is not None and row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size
+            entries.append((file_path, rel_path, stat, row if fresh else None))
+
+        parsed = {}
+        if parse_many is not None:
+            stale_files = [file_path for file_path, _, _, row in entries if row is None]
+            for file_path, frontmatter, error in parse_many(stale_files):
+                parsed[file_path] = (frontmatter, str(error) if error is not None else None)
+
+        try:
+            candidates = None
+            if prune is not None:
+                # Postings must be current before they can narrow the scan
+                for file_path, rel_path, stat, row in entries:
+                    if row is None:
+                        if file_path not in parsed:
+                            parsed[file_path] = self._parse(file_path)
+                        self._store(rel_path, stat, *parsed[file_path])
+                candidates = prune(self.conn)
+
+            for file_path, rel_path, stat, row in entries:
+                if row is not None:
+                    payload, error = row[2], row[3]
+                    if error is not None:
+                        yield file_path, None, error
+                    elif candidates is None or rel_path in candidates:
+                        yield file_path, json.loads(payload, object_hook=decode_object), None
+                    continue
+
+                if prune is not None:
+                    frontmatter, error = parsed[file_path]
+                else:
+                    frontmatter, error = parsed.get(file_path) or self._parse(file_path)
+                    self._store(rel_path, stat, frontmatter, error)
+                yield file_path, frontmatter, error
+
+            seen = {rel_path for _, rel_path, _, _ in entries}
+            stale = [(path,) for path in stored if path not in seen]
+            self.conn.executemany('DELETE FROM notes WHERE path = ?', stale)
+            self.conn.executemany('DELETE FROM postings WHERE path = ?', stale)
+        finally:
+            self.conn.commit()
+
+    def _parse(self, file_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            frontmatter, _ = read_frontmatter(file_path, self.max_header_size)
+            return frontmatter, None
+        except Exception as e:
+            return None, str(e)
+
+    def _store(self, rel_path: str, stat: Optional[os.stat_result],
+               frontmatter: Optional[Dict[str, Any]], error: Optional[str]) -> None:
+        self.conn.execute('DELETE FROM postings WHERE path = ?', (rel_path,))
+        if stat is None:
+            self.conn.execute('DELETE FROM notes WHERE path = ?', (rel_path,))
+            return
+
+        payload = None
+        if error is None:
+            try:
+                payload = json.dumps(encode_value(frontmatter), ensure_ascii=False)
+            except TypeError:
+                # Not representable exactly; leave it out so it is re-parsed next time
+                self.conn.execute('DELETE FROM notes WHERE path = ?', (rel_path,))
+                return
+
+        self.conn.execute(
+            'INSERT OR REPLACE INTO notes (path, mtime_ns, size, frontmatter, error) VALUES (?, ?, ?, ?, ?)',
+            (rel_path, stat.st_mtime_ns, stat.st_size, payload, error)
+        )
+        if payload is not None:
+            self.conn.executemany(
+                'INSERT INTO postings (prop, domain, item, key, path) VALUES (?, ?, ?, ?, ?)',
+                (posting + (rel_path,) for posting in iter_postings(frontmatter))
+            )
@@ -0,0 +1,427 @@
+"""
+Crash-safe note writes.
+
+Single notes are written to a temp file next to the note and renamed over it,
+so a note is never left truncated. Multi-note edits go through a
+NoteTransaction, which journals every change in the vault's .obsidian folder
+(created for the journal and removed again when the notes are not in a vault)
+and commits the whole batch:
+
+1. Stage: each new note text goes to a temp file and the original is kept
+   as a hard link (or copy) in the journal.
+2. Prepare: every staged file is made durable (one os.sync() on Linux,
+   file by file elsewhere), then the journal is marked prepared.
+3. Apply: temp files are renamed over their notes, and each touched folder
+   is synced once.
+4. Done: the journal is removed.
+
+That costs two sync barriers per batch instead of one fsync per note. If a
+run is interrupted, the journal is left behind, and the batch can be
+finished (--resume, only once prepared) or undone (--rollback).
+
+Usage:
+    python note_writer.py <vault_path> [--resume | --rollback]
+
+Examples:
+    # List interrupted edits
+    python note_writer.py "d:\\vault"
+
+    # Finish them, or restore the notes they touched
+    python note_writer.py "d:\\vault" --resume
+    python note_writer.py "d:\\vault" --rollback
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+JOURNAL_DIR = os.path.join('.obsidian', 'note-transactions')
+ENTRIES_PREFIX = 'entries-'
+PREPARED_FILENAME = 'PREPARED'
+BACKUP_DIR = 'backups'
+
+
+def _fsync(fd: int) -> None:
+    if sys.platform == 'darwin':
+        # fsync() on macOS returns before the drive has written its cache
+        import fcntl
+        try:
+            fcntl.fcntl(fd, fcntl.F_FULLFSYNC)
+            return
+        except OSError:
+            pass
+    os.fsync(fd)
+
+
+def _fsync_path(path: str, directory: bool = False) -> None:
+    """fsync a file or folder by path (folders are skipped where unsupported)."""
+    if directory:
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        flags = os.O_RDONLY | os.O_DIRECTORY
+    else:
+        flags = os.O_RDWR
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        if directory:
+            return
+        raise
+    try:
+        _fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _temp_path(path: str, tag: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{tag}.tmp")
+
+
+def _write_text(path: str, content: str, like: Optional[str] = None,
+                newline: Optional[str] = None) -> None:
+    # Text mode, so newlines are written the way open(path, 'w') always did
+    with open(path, 'w', encoding='utf-8', newline=newline) as f:
+        f.write(content)
+    if like is not None:
+        try:
+            shutil.copymode(like, path)
+        except OSError:
+            pass
+
+
+def atomic_write(file_path: str, content: str, newline: Optional[str] = None) -> None:
+    """
+    Replace one note's text so that a crash leaves either the old or the new note.
+
+    Args:
+        file_path: Path to the note
+        content: Full new text
+        newline: Passed to open(); '' writes line endings exactly as given
+    """
+    # Write through symlinks, as open(path, 'w') did
+    path = os.path.realpath(file_path)
+    tmp = _temp_path(path, uuid.uuid4().hex[:8])
+    try:
+        _write_text(tmp, content, like=path if os.path.exists(path) else None, newline=newline)
+        _fsync_path(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    _fsync_path(os.path.dirname(path), directory=True)
+
+
+def find_vault_root(path: str) -> str:
+    """Return the nearest folder at or above path that has an .obsidian folder."""
+    current = os.path.abspath(path)
+    if not os.path.isdir(current):
+        current = os.path.dirname(current)
+    probe = current
+    while True:
+        if os.path.isdir(os.path.join(probe, '.obsidian')):
+            return probe
+        parent = os.path.dirname(probe)
+        if parent == probe:
+            return current
+        probe = parent
+
+
+def stage_note(journal: str, file_path: str, content: str) -> Dict[str, Any]:
+    """
+    Stage one note's new text for a transaction.
+
+    Safe to call from worker processes: each process appends to its own
+    entries file, and the entry is journaled before any file is created.
+
+    Args:
+        journal: The transaction's journal folder (NoteTransaction.journal)
+        file_path: Note to rewrite (or create)
+        content: Full new text
+
+    Returns:
+        The journal entry, to pass to NoteTransaction.add()
+    """
+    path = os.path.realpath(file_path)
+    tag = os.path.basename(journal)
+    backup_id = uuid.uuid4().hex
+    exists = os.path.exists(path)
+    entry = {
+        'path': path,
+        'tmp': _temp_path(path, tag),
+        'backup': os.path.join(journal, BACKUP_DIR, backup_id) if exists else None,
+    }
+
+    with open(os.path.join(journal, f"{ENTRIES_PREFIX}{os.getpid()}.jsonl"), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    if exists:
+        # A hard link keeps the original bytes alive after the rename at no
+        # copying cost; fall back to a copy where links are not supported
+        try:
+            os.link(path, entry['backup'])
+        except OSError:
+            shutil.copy2(path, entry['backup'])
+    _write_text(entry['tmp'], content, like=path if exists else None)
+    return entry
+
+
+def _read_entries(journal: str) -> List[Dict[str, Any]]:
+    entries = []
+    for name in sorted(os.listdir(journal)):
+        if not name.startswith(ENTRIES_PREFIX):
+            continue
+        with open(os.path.join(journal, name), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # Torn last line from a crash; its files were never written
+                    pass
+    return entries
+
+
+def _sync_staged(journal: str, entries: List[Dict[str, Any]]) -> None:
+    """One durability barrier for every staged file and the journal."""
+    if sys.platform.startswith('linux'):
+        # Waits for the writes of every filesystem, in one call
+        os.sync()
+        return
+    # Elsewhere os.sync() may return before the data is written (macOS) or
+    # does not exist (Windows): sync the transaction's files one by one
+    paths = [entry['tmp'] for entry in entries]
+    paths.extend(os.path.join(journal, name) for name in os.listdir(journal)
+                 if name.startswith(ENTRIES_PREFIX))
+    backups = os.path.join(journal, BACKUP_DIR)
+    paths.extend(os.path.join(backups, name) for name in os.listdir(backups))
+    for path in paths:
+        _fsync_path(path)
+
+
+def _sync_folders(paths: List[str]) -> None:
+    for folder in sorted({os.path.dirname(path) for path in paths}):
+        _fsync_path(folder, directory=True)
+
+
+def _remove_journal(journal: str, drop_config: bool = False) -> None:
+    shutil.rmtree(journal, ignore_errors=True)
+    # Drop the transactions folder once the last journal is gone, and the
+    # .obsidian folder too if it was only created for the journal
+    folders = [os.path.dirname(journal)]
+    if drop_config:
+        folders.append(os.path.dirname(folders[0]))
+    for folder in folders:
+        try:
+            os.rmdir(folder)
+        except OSError:
+            break
+
+
+def _roll_forward(entries: List[Dict[str, Any]]) -> int:
+    applied = 0
+    for entry in entries:
+        if os.path.exists(entry['tmp']):
+            os.replace(entry['tmp'], entry['path'])
+            applied += 1
+    _sync_folders([entry['path'] for entry in entries])
+    return applied
+
+
+def _roll_back(entries: List[Dict[str, Any]], prepared: bool) -> int:
+    restored = 0
+    for entry in reversed(entries):
+        if os.path.exists(entry['tmp']):
+            os.remove(entry['tmp'])
+        elif prepared:
+            # Already renamed into place: put the original back
+            if entry['backup'] is None:
+                if os.path.exists(entry['path']):
+                    os.remove(entry['path'])
+            elif os.path.exists(entry['backup']):
+                os.replace(entry['backup'], entry['path'])
+            restored += 1
+    _sync_folders([entry['path'] for entry in entries])
+    return restored
+
+
+class NoteTransaction:
+    """
+    A journaled batch of note rewrites that is applied all together.
+
+    Use as a context manager: the batch commits when the block exits normally
+    and is rolled back if it raises.
+
+        with NoteTransaction(vault_path) as tx:
+            tx.stage(path, new_text)
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        if not os.path.isdir(self.root):
+            raise ValueError(f"Folder does not exist: {root}")
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.journal = os.path.join(self.root, JOURNAL_DIR, name)
+        # Notes outside a vault get an .obsidian folder just for the journal
+        self.owns_config = not os.path.isdir(os.path.dirname(os.path.dirname(self.journal)))
+        os.makedirs(os.path.join(self.journal, BACKUP_DIR))
+        self.entries: List[Dict[str, Any]] = []
+        self.paths = set()
+        self.closed = False
+
+    def stage(self, file_path: str, content: str) -> None:
+        """Stage a note's new text; nothing is visible until commit()."""
+        self.add(stage_note(self.journal, file_path, content))
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Adopt an entry staged by stage_note(), e.g. in a worker process."""
+        if entry['path'] in self.paths:
+            # Both stagings share one temp file, so the first text is lost
+            raise ValueError(f"Note staged twice in one transaction: {entry['path']}")
+        self.paths.add(entry['path'])
+        self.entries.append(entry)
+
+    def commit(self) -> int:
+        """
+        Apply every staged note.
+
+        If the batch cannot be made durable, nothing is written and the error
+        is raised; if applying it fails part way, the journal is kept for
+        recover().
+
+        Returns:
+            Number of notes written
+        """
+        if self.closed:
+            raise RuntimeError("Transaction already closed")
+        self.closed = True
+        if not self.entries:
+            _remove_journal(self.journal, self.owns_config)
+            return 0
+
+        try:
+            _sync_staged(self.journal, self.entries)
+            prepared = os.path.join(self.journal, PREPARED_FILENAME)
+            _write_text(prepared, f"{len(self.entries)}\n")
+            _fsync_path(prepared)
+            _fsync_path(self.journal, directory=True)
+        except BaseException:
+            # No note was replaced yet, so the batch is simply discarded
+            _roll_back(_read_entries(self.journal), prepared=False)
+            _remove_journal(self.journal, self.owns_config)
+            raise
+
+        applied = _roll_forward(self.entries)
+        _remove_journal(self.journal, self.owns_config)
+        return applied
+
+    def rollback(self) -> None:
+        """Discard every staged note; no note is changed."""
+        if self.closed:
+            return
+        self.closed = True
+        # Entries staged by workers that never reached add() are in the journal too
+        _roll_back(_read_entries(self.journal), prepared=False)
+        _remove_journal(self.journal, self.owns_config)
+
+    def __enter__(self) -> 'NoteTransaction':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+def pending_transactions(root: str) -> List[str]:
+    """Return the journal folders of interrupted transactions under a vault."""
+    base = os.path.join(os.path.abspath(root), JOURNAL_DIR)
+    try:
+        names = sorted(os.listdir(base))
+    except OSError:
+        return []
+    return [os.path.join(base, name) for name in names if os.path.isdir(os.path.join(base, name))]
+
+
+def is_prepared(journal: str) -> bool:
+    """Return True if a transaction got far enough to be resumed."""
+    return os.path.exists(os.path.join(journal, PREPARED_FILENAME))
+
+
+def recover(journal: str, resume: bool = True) -> int:
+    """
+    Finish or undo an interrupted transaction.
+
+    Args:
+        journal: Journal folder from pending_transactions()
+        resume: Finish a prepared transaction; False (or a transaction that
+            was not prepared yet) restores every note it touched
+
+    Returns:
+        Number of notes written (resume) or restored (rollback)
+    """
+    entries = _read_entries(journal)
+    prepared = is_prepared(journal)
+    if resume and prepared:
+        count = _roll_forward(entries)
+    else:
+        count = _roll_back(entries, prepared)
+    _remove_journal(journal)
+    return count
+
+
+def warn_pending(root: str) -> None:
+    """Print a warning for each interrupted transaction in the vault."""
+    for journal in pending_transactions(root):
+        print(f"Warning: Found an interrupted edit in {journal}. "
+              f"Run note_writer.py \"{root}\" --resume or --rollback.", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Resume or roll back interrupted multi-note edits',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    parser.add_argument('vault_path', help='Path to Obsidian vault')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--resume', action='store_true',
+                       help='Finish interrupted edits that were fully staged (others are rolled back)')
+    group.add_argument('--rollback', action='store_true',
+                       help='Restore every note touched by interrupted edits')
+
+    args = parser.parse_args()
+
+    journals = pending_transactions(args.vault_path)
+    if not journals:
+        print("No interrupted edits found.")
+        sys.exit(0)
+
+    for journal in journals:
+        name = os.path.basename(journal)
+        state = 'prepared' if is_prepared(journal) else 'staging'
+        if not args.resume and not args.rollback:
+            print(f"{name}: {len(_read_entries(journal))} note(s), {state}")
+            continue
+        try:
+            count = recover(journal, resume=args.resume)
+        except OSError as e:
+            print(f"Error: Could not recover {name}: {e}", file=sys.stderr)
+            sys.exit(1)
+        if args.resume and state == 'prepared':
+            print(f"{name}: finished, {count} note(s) written")
+        else:
+            print(f"{name}: rolled back, {count} note(s) restored")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""
+Compiled property paths.
+
+A property name is parsed once into a PropertyPath whose accessors are
+reused for every note. On top of dot notation for nested mappings, a path
+can address list items and wildcard children:
+
+    metadata.author     nested mapping key
+    links[0].title      list item (negative indexes count from the end)
+    authors[*].name     every item of a list
+    metadata.*.status   every value of a mapping (or item of a list)
+
+A segment that is not valid selector syntax, such as `notes[draft]`, is
+taken literally as a key, so existing property names keep working.
+
+A wildcard path selects any number of values. get() returns them as a list
+(None when none matched), and a query condition on it holds when any
+selected value satisfies it, each value being tested the way a single
+property value is: `authors[*].name = Ann` matches when one author is Ann,
+and `projects.*.tags contains urgent` when one project's tags contain it.
+"""
+
+import copy
+import functools
+import re
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+_SEGMENT_RE = re.compile(r'(?P<name>[^\[\]]*)(?P<subscripts>(?:\[(?:-?\d+|\*)\])*)\Z')
+_SUBSCRIPT_RE = re.compile(r'\[(-?\d+|\*)\]')
+
+# (kind, argument): ('key', name), ('index', n) or ('each', None)
+Step = Tuple[str, Any]
+
+
+def _parse(path: str) -> List[Step]:
+    steps: List[Step] = []
+    for segment in path.split('.'):
+        match = _SEGMENT_RE.match(segment)
+        if not match or (not match.group('name') and not match.group('subscripts')):
+            steps.append(('key', segment))
+            continue
+        name = match.group('name')
+        if name == '*':
+            steps.append(('each', None))
+        elif name:
+            steps.append(('key', name))
+        for subscript in _SUBSCRIPT_RE.findall(match.group('subscripts')):
+            steps.append(('each', None) if subscript == '*' else ('index', int(subscript)))
+    return steps
+
+
+def _children(value: Any, step: Step) -> Iterator[Any]:
+    """Values one step below value, if any."""
+    kind, argument = step
+    if kind == 'key':
+        if isinstance(value, dict) and argument in value:
+            yield value[argument]
+    elif kind == 'index':
+        if isinstance(value, list) and -len(value) <= argument < len(value):
+            yield value[argument]
+    elif isinstance(value, dict):
+        yield from value.values()
+    elif isinstance(value, list):
+        yield from value
+
+
+def _compile_select(steps: List[Step]) -> Callable[[Any], Iterator[Any]]:
+    """Chain the steps into one function yielding every selected value."""
+    def select(value: Any) -> Iterator[Any]:
+        yield value
+
+    for step in steps:
+        def select(value: Any, _inner=select, _step=step) -> Iterator[Any]:
+            for parent in _inner(value):
+                yield from _children(parent, _step)
+    return select
+
+
+class PropertyPath:
+    """
+    A property name compiled into accessors for frontmatter dictionaries.
+
+    get(frontmatter) returns the property value, or None if it is missing.
+    A wildcard path returns the list of non-null values it selects, or None
+    if there are none. Paths of plain keys get a specialized closure.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.steps = _parse(path)
+        # Selects any number of values
+        self.wildcard = any(kind == 'each' for kind, _ in self.steps)
+        # Only mapping keys, as the value indexes post them
+        self.plain = all(kind == 'key' for kind, _ in self.steps)
+        # Top-level key a note must keep for the path to resolve (None: any)
+        first_kind, first_argument = self.steps[0]
+        self.root_key: Optional[str] = first_argument if first_kind == 'key' else None
+        self._select = _compile_select(self.steps)
+
+        self.get: Callable[[Any], Any]
+        if self.plain and len(self.steps) == 1:
+            key = first_argument
+            self.get = lambda fm: fm.get(key) if isinstance(fm, dict) else None
+        elif self.plain:
+            self.get = self._get_plain
+        elif self.wildcard:
+            self.get = lambda fm: self.values(fm) or None
+        else:
+            self.get = lambda fm: next(self._select(fm), None)
+
+    def _get_plain(self, frontmatter: Any) -> Any:
+        value = frontmatter
+        for _, key in self.steps:
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                return None
+        return value
+
+    def select(self, frontmatter: Any) -> List[Any]:
+        """Return every value the path reaches, including nulls."""
+        return list(self._select(frontmatter))
+
+    def values(self, frontmatter: Any) -> List[Any]:
+        """Return the non-null values to test conditions against (one unless wildcard)."""
+        if self.wildcard:
+            return [value for value in self._select(frontmatter) if value is not None]
+        value = self.get(frontmatter)
+        return [] if value is None else [value]
+
+    def set(self, frontmatter: dict, value: Any) -> dict:
+        """
+        Set the property, creating missing mappings along key steps.
+
+        Index and wildcard steps only follow items that exist, so a wildcard
+        path sets the property on each existing child, each to its own copy
+        of value (shared objects would be dumped as YAML anchors).
+        """
+        if self.plain:
+            current = frontmatter
+            for _, key in self.steps[:-1]:
+                if key not in current:
+                    current[key] = {}
+                current = current[key]
+            current[self.steps[-1][1]] = value
+            return frontmatter
+
+        kind, argument = self.steps[-1]
+        for parent in self._containers(frontmatter, create=True):
+            if kind == 'key' and isinstance(parent, dict):
+                parent[argument] = copy.deepcopy(value)
+            elif kind == 'index' and isinstance(parent, list) and -len(parent) <= argument < len(parent):
+                parent[argument] = copy.deepcopy(value)
+            elif kind == 'each' and isinstance(parent, dict):
+                for key in parent:
+                    parent[key] = copy.deepcopy(value)
+            elif kind == 'each' and isinstance(parent, list):
+                parent[:] = [copy.deepcopy(value) for _ in parent]
+        return frontmatter
+
+    def delete(self, frontmatter: dict) -> dict:
+        """Remove the property (each selected one for a wildcard path) if present."""
+        kind, argument = self.steps[-1]
+        for parent in self._containers(frontmatter, create=False):
+            if kind == 'key' and isinstance(parent, dict):
+                parent.pop(argument, None)
+            elif kind == 'index' and isinstance(parent, list) and -len(parent) <= argument < len(parent):
+                del parent[argument]
+            elif kind == 'each' and isinstance(parent, (dict, list)):
+                parent.clear()
+        return frontmatter
+
+    def _containers(self, frontmatter: Any, create: bool) -> List[Any]:
+        """The values the path reaches before its last step."""
+        parents = [frontmatter]
+        for kind, argument in self.steps[:-1]:
+            if create and kind == 'key':
+                for parent in parents:
+                    if isinstance(parent, dict) and argument not in parent:
+                        parent[argument] = {}
+            parents = [child for parent in parents for child in _children(parent, (kind, argument))]
+        return parents
+
+    def __repr__(self) -> str:
+        return f"PropertyPath({self.path!r})"
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_path(path: str) -> PropertyPath:
+    """Return the compiled PropertyPath for a property name (cached per name)."""
+    return PropertyPath(path)
@@ -0,0 +1,399 @@
+"""
+Boolean query language for frontmatter filters.
+
+A query is compiled once into a predicate plan that every note is checked
+against. Conditions inside each and/or group are ordered so that cheap,
+selective checks run first, and evaluation short-circuits.
+
+Grammar:
+    query     := or_expr
+    or_expr   := and_expr ('or' and_expr)*
+    and_expr  := not_expr ('and' not_expr)*
+    not_expr  := 'not' not_expr | '(' query ')' | condition
+    condition := property 'exists'
+               | property ('=' | '==' | '!=' | '>' | '<' | '>=' | '<=' | 'contains') value
+
+Property names are paths: dot notation for nested properties, [n] for list
+items, and * or [*] wildcards, e.g. `links[0].title` or `authors[*].name`. A
+condition on a wildcard path holds when any selected value satisfies it (see
+property_path.py). Property names and values may be quoted with '...' or
+"..." when they contain spaces or punctuation. Unquoted values are typed like the CLI flags
+(numbers, booleans, dates); quoted values are always strings.
+
+Examples:
+    status = done and (priority > 2 or tags contains urgent)
+    not draft exists and "상태" != 완료
+"""
+
+import re
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from utils import infer_property_type, VALUE_OPERATORS
+from property_path import compile_path
+
+
+class QuerySyntaxError(ValueError):
+    """Raised when a query string cannot be parsed."""
+
+
+# Estimated (cost, probability of matching) per operator, used to order
+# conditions. Existence checks are cheapest; equality is the most selective;
+# 'contains' may scan a list or string.
+OPERATOR_ESTIMATES = {
+    'exists': (0.5, 0.5),
+    'not-exists': (0.5, 0.5),
+    'equals': (1.0, 0.1),
+    'gt': (1.5, 0.5),
+    'lt': (1.5, 0.5),
+    'gte': (1.5, 0.5),
+    'lte': (1.5, 0.5),
+    'contains': (2.0, 0.2),
+}
+
+COMPARISON_OPERATORS = {
+    '=': 'equals',
+    '==': 'equals',
+    '>': 'gt',
+    '<': 'lt',
+    '>=': 'gte',
+    '<=': 'lte',
+    'contains': 'contains',
+}
+
+OPERATOR_SYMBOLS = {
+    'equals': '=',
+    'gt': '>',
+    'lt': '<',
+    'gte': '>=',
+    'lte': '<=',
+    'contains': 'contains',
+}
+
+
+class Node:
+    """A node of a compiled query plan."""
+
+    cost = 0.0
+    probability = 1.0
+
+    def compile(self) -> Callable[[Any], bool]:
+        raise NotImplementedError
+
+    def properties(self) -> List[str]:
+        raise NotImplementedError
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the node as plain data, e.g. to send a plan to the vault daemon."""
+        raise NotImplementedError
+
+
+class Condition(Node):
+    """A single property check, e.g. `priority > 2`."""
+
+    def __init__(self, prop: str, operator: str, target: Any = None):
+        self.prop = prop
+        self.operator = operator
+        self.target = target
+        self.cost, self.probability = OPERATOR_ESTIMATES[operator]
+
+    def compile(self) -> Callable[[Any], bool]:
+        path, target = compile_path(self.prop), self.target
+        get = path.get
+        if self.operator == 'exists':
+            return lambda fm: get(fm) is not None
+        if self.operator == 'not-exists':
+            return lambda fm: get(fm) is None
+
+        match = VALUE_OPERATORS[self.operator]
+
+        if path.wildcard:
+            # Any selected value may satisfy the condition
+            values = path.values
+            return lambda fm: any(match(value, target) for value in values(fm))
+
+        def check(fm):
+            value = get(fm)
+            return value is not None and match(value, target)
+        return check
+
+    def properties(self) -> List[str]:
+        return [self.prop]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'condition': [self.prop, self.operator, self.target]}
+
+    def __str__(self) -> str:
+        if self.operator == 'exists':
+            return f"{self.prop} exists"
+        if self.operator == 'not-exists':
+            return f"not {self.prop} exists"
+        return f"{self.prop} {OPERATOR_SYMBOLS[self.operator]} {self.target!r}"
+
+
+class Not(Node):
+    def __init__(self, child: Node):
+        self.child = child
+        self.cost = child.cost
+        self.probability = 1.0 - child.probability
+
+    def compile(self) -> Callable[[Any], bool]:
+        check = self.child.compile()
+        return lambda fm: not check(fm)
+
+    def properties(self) -> List[str]:
+        return self.child.properties()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'not': self.child.to_dict()}
+
+    def __str__(self) -> str:
+        return f"not ({self.child})"
+
+
+class And(Node):
+    def __init__(self, children: List[Node]):
+        # Flatten nested groups, then put cheap checks that are likely to
+        # fail first: rank = cost / P(fail)
+        flat = []
+        for child in children:
+            flat.extend(child.source if isinstance(child, And) else [child])
+        self.source = flat
+        self.children = sorted(flat, key=lambda c: c.cost / max(1.0 - c.probability, 1e-6))
+        self.cost = sum(c.cost for c in flat)
+        self.probability = 1.0
+        for child in flat:
+            self.probability *= child.probability
+
+    def compile(self) -> Callable[[Any], bool]:
+        checks = tuple(child.compile() for child in self.children)
+        return lambda fm: all(check(fm) for check in checks)
+
+    def properties(self) -> List[str]:
+        return [prop for child in self.source for prop in child.properties()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'and': [child.to_dict() for child in self.source]}
+
+    def __str__(self) -> str:
+        return '(' + ' and '.join(str(c) for c in self.children) + ')'
+
+
+class Or(Node):
+    def __init__(self, children: List[Node]):
+        # Flatten nested groups, then put cheap checks that are likely to
+        # succeed first: rank = cost / P(match)
+        flat = []
+        for child in children:
+            flat.extend(child.source if isinstance(child, Or) else [child])
+        self.source = flat
+        self.children = sorted(flat, key=lambda c: c.cost / max(c.probability, 1e-6))
+        self.cost = sum(c.cost for c in flat)
+        miss = 1.0
+        for child in flat:
+            miss *= 1.0 - child.probability
+        self.probability = 1.0 - miss
+
+    def compile(self) -> Callable[[Any], bool]:
+        checks = tuple(child.compile() for child in self.children)
+        return lambda fm: any(check(fm) for check in checks)
+
+    def properties(self) -> List[str]:
+        return [prop for child in self.source for prop in child.properties()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'or': [child.to_dict() for child in self.source]}
+
+    def __str__(self) -> str:
+        return '(' + ' or '.join(str(c) for c in self.children) + ')'
+
+
+class QueryPlan:
+    """
+    A compiled query: a predicate over frontmatter plus the properties it reads.
+    """
+
+    def __init__(self, root: Node):
+        self.root = root
+        self.matches = root.compile()
+        # Query order, without duplicates; these are reported for each match
+        self.properties = list(dict.fromkeys(root.properties()))
+
+    def __str__(self) -> str:
+        return str(self.root)
+
+
+_TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\()
+      | (?P<rparen>\))
+      | (?P<op>>=|<=|!=|==|=|>|<)
+      | "(?P<dq>(?:[^"\\]|\\.)*)"
+      | '(?P<sq>[^']*)'
+      | (?P<word>[^\s()=!<>"']+)
+    )''', re.VERBOSE)
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise QuerySyntaxError(f"Unexpected character at position {pos}: {text[pos:pos + 10]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'dq':
+            tokens.append(('string', re.sub(r'\\(.)', r'\1', value)))
+        elif kind == 'sq':
+            tokens.append(('string', value))
+        elif kind == 'word' and value.lower() in ('and', 'or', 'not', 'contains', 'exists'):
+            tokens.append(('keyword', value.lower()))
+        else:
+            tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise QuerySyntaxError("Unexpected end of query")
+        self.pos += 1
+        return token
+
+    def accept_keyword(self, keyword: str) -> bool:
+        if self.peek() == ('keyword', keyword):
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self) -> Node:
+        node = self.or_expr()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Unexpected token: {self.peek()[1]!r}")
+        return node
+
+    def or_expr(self) -> Node:
+        children = [self.and_expr()]
+        while self.accept_keyword('or'):
+            children.append(self.and_expr())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def and_expr(self) -> Node:
+        children = [self.not_expr()]
+        while self.accept_keyword('and'):
+            children.append(self.not_expr())
+        return children[0] if len(children) == 1 else And(children)
+
+    def not_expr(self) -> Node:
+        if self.accept_keyword('not'):
+            child = self.not_expr()
+            if isinstance(child, Condition) and child.operator == 'exists':
+                return Condition(child.prop, 'not-exists')
+            return Not(child)
+        if self.peek() == ('lparen', '('):
+            self.take()
+            node = self.or_expr()
+            if self.take() != ('rparen', ')'):
+                raise QuerySyntaxError("Expected ')'")
+            return node
+        return self.condition()
+
+    def condition(self) -> Node:
+        kind, prop = self.take()
+        if kind not in ('word', 'string'):
+            raise QuerySyntaxError(f"Expected a property name, got {prop!r}")
+
+        kind, operator = self.take()
+        if (kind, operator) == ('keyword', 'exists'):
+            return Condition(prop, 'exists')
+        negate = operator == '!='
+        if negate:
+            operator = '='
+        if operator not in COMPARISON_OPERATORS:
+            raise QuerySyntaxError(f"Expected an operator after {prop!r}, got {operator!r}")
+        operator = COMPARISON_OPERATORS[operator]
+
+        kind, raw = self.take()
+        if kind == 'string':
+            target = raw
+        elif kind == 'word':
+            target = make_target(operator, raw)
+        else:
+            raise QuerySyntaxError(f"Expected a value after {prop!r}, got {raw!r}")
+
+        node = Condition(prop, operator, target)
+        return Not(node) if negate else node
+
+
+def node_from_dict(data: Dict[str, Any]) -> Node:
+    """Rebuild a plan tree from Node.to_dict() output."""
+    if 'condition' in data:
+        return Condition(*data['condition'])
+    if 'not' in data:
+        return Not(node_from_dict(data['not']))
+    if 'and' in data:
+        return And([node_from_dict(child) for child in data['and']])
+    if 'or' in data:
+        return Or([node_from_dict(child) for child in data['or']])
+    raise QuerySyntaxError(f"Unknown plan node: {data!r}")
+
+
+def make_target(operator: str, value: str) -> Any:
+    """Type a target value the same way the --equals/--contains/--gt/--lt flags do."""
+    if operator == 'contains':
+        return value
+    return infer_property_type(value)
+
+
+def parse_query(text: str) -> Node:
+    """
+    Parse a query string into an (uncompiled) plan tree.
+
+    Raises:
+        QuerySyntaxError: If the query is malformed
+    """
+    if not text.strip():
+        raise QuerySyntaxError("Empty query")
+    return _Parser(text).parse()
+
+
+def filters_to_node(filters: List[Dict[str, Any]]) -> Node:
+    """Convert legacy filter dictionaries (AND logic) into a plan tree."""
+    conditions = [Condition(f['property'], f['operator'], f.get('value')) for f in filters]
+    if not conditions:
+        raise QuerySyntaxError("No filters given")
+    return conditions[0] if len(conditions) == 1 else And(conditions)
+
+
+def compile_query(query: Optional[str] = None,
+                  filters: Optional[List[Dict[str, Any]]] = None) -> QueryPlan:
+    """
+    Compile a query string and/or legacy filters into one plan.
+
+    When both are given they are combined with AND.
+
+    Args:
+        query: Query string in the language described above
+        filters: List of filter dictionaries with 'property', 'operator', 'value'
+
+    Returns:
+        Compiled QueryPlan
+    """
+    nodes = []
+    if filters:
+        nodes.append(filters_to_node(filters))
+    if query is not None:
+        nodes.append(parse_query(query))
+    if not nodes:
+        raise QuerySyntaxError("No query or filters given")
+    return QueryPlan(nodes[0] if len(nodes) == 1 else And(nodes))
@@ -0,0 +1,395 @@
+"""
+Vault scanning for frontmatter queries.
+Yields each note's parsed frontmatter, either by parsing every file or through
+the persistent frontmatter index, optionally across a process pool, or from
+the vault daemon when one is running. A ScanBudget limits a scan to a time
+budget or a sample of the notes and reports its progress.
+"""
+
+import hashlib
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Callable, List, Optional, Iterable, Iterator, Tuple, Union
+
+from utils import DEFAULT_MAX_HEADER_SIZE, iter_markdown_files, read_frontmatter
+from vault_walk import walk_markdown
+from daemon_client import daemon_files, daemon_scan
+from index import FrontmatterIndex
+from query import QueryPlan
+from property_path import compile_path
+from value_index import candidate_paths
+
+
+ScanRecord = Tuple[str, Optional[Dict[str, Any]], Optional[Union[str, Exception]]]
+
+# Files per worker task. Large enough to amortize pickling and IPC overhead,
+# small enough that the pool stays balanced when note sizes vary.
+CHUNK_SIZE = 64
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Translate a --jobs value into a worker count (0 means all CPUs)."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def project_keys(frontmatter: Any, keys: Optional[frozenset]) -> Any:
+    """Keep only the top-level keys a query needs."""
+    if keys is None or frontmatter is None:
+        return frontmatter
+    if not isinstance(frontmatter, dict):
+        return {}
+    return {key: frontmatter[key] for key in keys if key in frontmatter}
+
+
+def _parse_chunk(chunk: List[str], keys: Optional[frozenset],
+                 max_header_size: Optional[int]) -> List[ScanRecord]:
+    """Worker entry point: parse a chunk of files and return compact records."""
+    records = []
+    for file_path in chunk:
+        try:
+            frontmatter, _ = read_frontmatter(file_path, max_header_size)
+        except Exception as e:
+            records.append((file_path, None, str(e)))
+            continue
+        records.append((file_path, project_keys(frontmatter, keys), None))
+    return records
+
+
+def parse_files(md_files: Iterable[str], jobs: int = 1,
+                keys: Optional[Iterable[str]] = None,
+                max_header_size: Optional[int] = DEFAULT_MAX_HEADER_SIZE) -> Iterator[ScanRecord]:
+    """
+    Parse frontmatter for a stream of files, serially or in a process pool.
+
+    Files are consumed lazily, so a caller that stops iterating also stops
+    the walk and any pending work.
+
+    Args:
+        md_files: Paths of markdown files to parse
+        jobs: Number of worker processes (1 parses in this process)
+        keys: Top-level property names to keep; None keeps the whole frontmatter
+        max_header_size: Bytes read line by line looking for the end of a
+            note's frontmatter before the whole note is parsed (see
+            read_frontmatter)
+
+    Yields:
+        Tuples of (file_path, frontmatter, error) in md_files order
+    """
+    keys = frozenset(keys) if keys is not None else None
+
+    if jobs == 1:
+        for file_path in md_files:
+            try:
+                frontmatter, _ = read_frontmatter(file_path, max_header_size)
+            except Exception as e:
+                yield file_path, None, e
+                continue
+            yield file_path, project_keys(frontmatter, keys), None
+        return
+
+    yield from map_chunks(_parse_chunk, md_files, jobs, keys, max_header_size)
+
+
+def map_chunks(worker: Callable[..., List[Any]], items: Iterable[Any], jobs: int,
+               *args: Any) -> Iterator[Any]:
+    """
+    Run worker(chunk, *args) over CHUNK_SIZE chunks of items in a process pool.
+
+    worker must be a picklable module-level function returning a list of
+    records. Items are consumed lazily and a caller that stops iterating
+    cancels the remaining chunks.
+
+    Yields:
+        The records of every chunk, in items order
+    """
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, CHUNK_SIZE)), [])
+
+    if jobs == 1:
+        for chunk in chunks:
+            yield from worker(chunk, *args)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        # Keep a bounded window of chunks in flight and collect them in
+        # submission order, which keeps output and warnings identical to a
+        # serial run and lets an early stop cancel the rest.
+        pending = deque(executor.submit(worker, chunk, *args)
+                        for chunk in islice(chunks, jobs * 2))
+        while pending:
+            records = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(worker, chunk, *args))
+            yield from records
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ScanBudget:
+    """
+    Time budget, sampling and progress reporting for one vault scan.
+
+    The scan stops once time_budget seconds have passed, and with sample it
+    reads only that fraction of the notes. Notes are sampled by a hash of
+    their vault-relative path, so repeated runs read the same notes. The
+    results are then partial; scanned and total say how much was read.
+    """
+
+    # Seconds between progress line updates
+    REPORT_INTERVAL = 0.25
+
+    def __init__(self, time_budget: Optional[float] = None, sample: Optional[float] = None,
+                 progress: bool = False):
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError(f"Time budget must be positive, got {time_budget}")
+        if sample is not None and not 0 < sample <= 1:
+            raise ValueError(f"Sample fraction must be in (0, 1], got {sample}")
+        self.time_budget = time_budget
+        self.sample = sample if sample != 1 else None
+        self.progress = progress
+        self.started = time.monotonic()
+        self.deadline = self.started + time_budget if time_budget is not None else None
+        # Notes in the vault, and those of them in the sample; None until
+        # (or unless) the walk finishes
+        self.total: Optional[int] = None
+        self.selected: Optional[int] = None
+        self.scanned = 0
+        # Set when the budget ran out before every note was read
+        self.truncated = False
+        self._threshold = int(sample * (1 << 64)) if sample is not None else None
+        self._reported = 0.0
+        self._line_width = 0
+
+    @property
+    def partial(self) -> bool:
+        """True if the results cover only part of the vault."""
+        return self.truncated or self.sample is not None
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def sampled(self, root: str, file_path: str) -> bool:
+        """Return True if a note is in the sample."""
+        if self._threshold is None:
+            return True
+        rel_path = os.path.relpath(file_path, root).replace(os.sep, '/')
+        digest = hashlib.blake2b(rel_path.encode('utf-8', 'surrogateescape'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') < self._threshold
+
+    def walk(self, root: str, entries: Iterable[Any]) -> List[Any]:
+        """
+        List and count the vault's notes, and those in the sample.
+
+        Stops early, with the scan truncated and the total unknown, if the
+        budget runs out while the folders are still being listed.
+
+        Args:
+            root: Vault path the sample is keyed on
+            entries: Paths or DirEntry objects from the walk
+        """
+        listed = []
+        selected = 0
+        for entry in entries:
+            if self.expired():
+                self.truncated = True
+                return listed
+            listed.append(entry)
+            if self.sampled(root, getattr(entry, 'path', entry)):
+                selected += 1
+        self.total = len(listed)
+        self.selected = selected
+        return listed
+
+    def track(self, records: Iterator[ScanRecord]) -> Iterator[ScanRecord]:
+        """Count records as the caller takes them, stopping once the budget runs out."""
+        try:
+            if not self.truncated:
+                for record in records:
+                    self.scanned += 1
+                    if record[2] is not None:
+                        # The caller prints a warning; start it on a clean line
+                        self._clear()
+                    else:
+                        self._report()
+                    yield record
+                    if self.expired():
+                        self.truncated = True
+                        break
+                else:
+                    # Pruned notes were looked at too, if never yielded
+                    if self.selected is not None:
+                        self.scanned = max(self.scanned, self.selected)
+        finally:
+            close = getattr(records, 'close', None)
+            if close is not None:
+                close()
+            if self.progress:
+                self._report(final=True)
+
+    def _clear(self) -> None:
+        if self.progress and self._line_width:
+            print(f"\r{' ' * self._line_width}\r", end='', file=sys.stderr, flush=True)
+            self._line_width = 0
+
+    def _report(self, final: bool = False) -> None:
+        if not self.progress:
+            return
+        now = time.monotonic()
+        if not final and now - self._reported < self.REPORT_INTERVAL:
+            return
+        self._reported = now
+        elapsed = max(now - self.started, 1e-6)
+        rate = self.scanned / elapsed
+        line = f"Scanned {self.scanned}"
+        if self.selected is not None:
+            line += f"/{self.selected}"
+        line += f" notes, {rate:.0f}/s"
+        if final:
+            line += f", {elapsed:.1f}s"
+        elif self.selected is not None and rate > 0:
+            line += f", ETA {max(self.selected - self.scanned, 0) / rate:.0f}s"
+        # Pad over the previous, possibly longer line
+        padding = ' ' * max(self._line_width - len(line), 0)
+        self._line_width = len(line)
+        print(f"\r{line}{padding}", end='\n' if final else '', file=sys.stderr, flush=True)
+
+    def summary(self) -> Dict[str, Any]:
+        """Describe the scan for JSON output."""
+        reasons = []
+        if self.truncated:
+            reasons.append('time budget')
+        if self.sample is not None:
+            reasons.append('sample')
+        return {
+            'partial': self.partial,
+            'reason': ', '.join(reasons) or None,
+            'scanned': self.scanned,
+            'sampled': self.selected if self.sample is not None else None,
+            'total': self.total,
+            'sample': self.sample,
+            'time_budget': self.time_budget,
+        }
+
+    def describe(self) -> str:
+        """One-line note on how partial the results are, for table output."""
+        total = self.total if self.total is not None else "an unknown number of"
+        text = f"Scanned {self.scanned} of {total} notes"
+        details = []
+        if self.sample is not None:
+            sampled = f" of {self.selected}" if self.selected is not None else ""
+            details.append(f"{self.sample:.0%} sample{sampled}")
+        if self.truncated:
+            details.append(f"time budget of {self.time_budget:g}s reached")
+        if details:
+            text = "Partial results: " + text + " (" + "; ".join(details) + ")"
+        return text
+
+
+def property_keys(property_names: Iterable[str]) -> Optional[List[str]]:
+    """
+    Return the top-level frontmatter keys needed to resolve property names.
+
+    Returns None, meaning every key, when a path starts with a wildcard.
+    """
+    keys = set()
+    for name in property_names:
+        root_key = compile_path(name).root_key
+        if root_key is None:
+            return None
+        keys.add(root_key)
+    return sorted(keys)
+
+
+def iter_frontmatter(vault_path: str, use_index: bool = False, jobs: int = 1,
+                     keys: Optional[Iterable[str]] = None,
+                     plan: Optional[QueryPlan] = None,
+                     use_daemon: bool = False,
+                     budget: Optional[ScanBudget] = None,
+                     max_header_size: Optional[int] = DEFAULT_MAX_HEADER_SIZE) -> Iterator[ScanRecord]:
+    """
+    Iterate over the frontmatter of every note in the vault.
+
+    Args:
+        vault_path: Path to Obsidian vault
+        use_index: Answer from the persistent index, re-parsing only changed notes
+        jobs: Number of worker processes used for parsing
+        keys: Top-level property names the caller needs; None keeps everything.
+            Workers only send these back, not whole frontmatter.
+        plan: Query the caller will apply. With use_index, the value indexes
+            narrow the scan and notes that cannot match are left out.
+        use_daemon: Ask the vault daemon when one is running for the vault
+            (see vault_daemon.py); use_index and jobs then do not apply.
+        budget: Time budget, sample and progress reporting for the scan. The
+            vault is listed up front to count the notes, and the scan stops
+            when the budget runs out.
+        max_header_size: Bytes read line by line looking for the end of a
+            note's frontmatter before the whole note is parsed (None for no
+            limit). Only affects speed; the daemon uses its own setting.
+
+    Yields:
+        Tuples of (file_path, frontmatter, error). When error is set the note
+        could not be read or parsed and frontmatter is None.
+    """
+    records = _scan_records(vault_path, use_index, jobs, keys, plan, use_daemon, budget,
+                            max_header_size)
+    yield from records if budget is None else budget.track(records)
+
+
+def _scan_records(vault_path: str, use_index: bool, jobs: int, keys: Optional[Iterable[str]],
+                  plan: Optional[QueryPlan], use_daemon: bool,
+                  budget: Optional[ScanBudget],
+                  max_header_size: Optional[int]) -> Iterator[ScanRecord]:
+    wanted = frozenset(keys) if keys is not None else None
+
+    if use_daemon:
+        records = daemon_scan(vault_path, keys=keys, plan=plan)
+        if records is not None:
+            if budget is not None:
+                budget.walk(vault_path, daemon_files(vault_path) or [])
+            for file_path, frontmatter, error in records:
+                if budget is None or budget.sampled(vault_path, file_path):
+                    yield file_path, project_keys(frontmatter, wanted), error
+            return
+
+    if use_index:
+        # The index stores whole frontmatter, so workers cannot project here
+        parse_many = None
+        if jobs != 1:
+            def parse_many(stale_files):
+                return parse_files(stale_files, jobs=jobs, max_header_size=max_header_size)
+
+        prune = None
+        if plan is not None:
+            def prune(conn):
+                return candidate_paths(conn, plan.root)
+
+        # Refreshing drops deleted notes, so the index needs the full file
+        # list; the walk's DirEntry stats validate the cached rows
+        if budget is None:
+            md_files = list(walk_markdown(vault_path))
+        else:
+            md_files = budget.walk(vault_path, walk_markdown(vault_path))
+            if budget.truncated:
+                # A partial file list would drop the other notes' rows
+                return
+        with FrontmatterIndex(vault_path, max_header_size=max_header_size) as index:
+            for file_path, frontmatter, error in index.refresh(md_files, parse_many=parse_many,
+                                                                 prune=prune):
+                if budget is None or budget.sampled(vault_path, file_path):
+                    yield file_path, project_keys(frontmatter, wanted), error
+        return
+
+    if budget is None:
+        yield from parse_files(iter_markdown_files(vault_path), jobs=jobs, keys=keys,
+                               max_header_size=max_header_size)
+        return
+    md_files = [file_path for file_path in budget.walk(vault_path, iter_markdown_files(vault_path))
+                if budget.sampled(vault_path, file_path)]
+    yield from parse_files(md_files, jobs=jobs, keys=keys, max_header_size=max_header_size)
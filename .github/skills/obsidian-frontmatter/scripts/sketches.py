@@ -0,0 +1,117 @@
+"""
+Fixed-memory summaries of property values.
+
+frontmatter_list.py --approx uses these instead of one counter per
+distinct value, so memory stays the same however many values a vault has:
+
+- HyperLogLog estimates the number of distinct values. With precision p
+  it keeps 2**p one-byte registers, and its standard error is
+  1.04 / sqrt(2**p) (0.8% at the default p = 14, 16 KB).
+- SpaceSaving keeps the `capacity` most frequent values. A reported
+  count is never below the true count and overestimates it by at most
+  that value's `error`. The error is at most total / capacity, and every
+  value seen more often than that is guaranteed to be kept.
+"""
+
+import hashlib
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+DEFAULT_PRECISION = 14
+DEFAULT_CAPACITY = 1000
+
+
+def _hash64(value: str) -> int:
+    # Stable across runs and processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    """Distinct-count estimate in 2**precision bytes."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"HyperLogLog precision must be 4-18, got {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        h = _hash64(value)
+        index = h >> (64 - self.precision)
+        rest_bits = 64 - self.precision
+        rest = h & ((1 << rest_bits) - 1)
+        # Position of the first 1 bit in the remaining bits
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    @property
+    def standard_error(self) -> float:
+        """Relative standard error of estimate()."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Small cardinalities: linear counting is more accurate
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+
+class SpaceSaving:
+    """Top values by frequency with a bounded number of counters (Metwally et al.)."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError(f"SpaceSaving capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+        # Min-heap of (count, value); entries go stale as counts grow and are
+        # skipped when popped
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, value: str) -> None:
+        self.total += 1
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self.capacity:
+            counts[value] = 1
+            self.errors[value] = 0
+        else:
+            # Replace the least frequent value; the newcomer inherits its
+            # count as the bound on how much it may be overcounted
+            while True:
+                count, victim = heapq.heappop(self._heap)
+                if counts.get(victim) == count:
+                    break
+            del counts[victim]
+            del self.errors[victim]
+            counts[value] = count + 1
+            self.errors[value] = count
+        heapq.heappush(self._heap, (counts[value], value))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, key) for key, count in counts.items()]
+            heapq.heapify(self._heap)
+
+    @property
+    def error_bound(self) -> int:
+        """Most any reported count can exceed the true count by."""
+        return self.total // self.capacity if len(self.counts) >= self.capacity else 0
+
+    def top(self, k: int = 0) -> List[Tuple[str, int, int]]:
+        """
+        Return (value, count, error) for the k most frequent values (0 for all kept).
+
+        The true count of each value lies between count - error and count.
+        """
+        items = self.counts.items()
+        ranked = (heapq.nlargest(k, items, key=lambda x: x[1]) if k
+                  else sorted(items, key=lambda x: x[1], reverse=True))
+        return [(value, count, self.errors[value]) for value, count in ranked]
@@ -0,0 +1,261 @@
+"""
+Generate a deterministic synthetic Obsidian vault for benchmarks.
+
+The same options and seed always produce byte-identical notes: nested
+folders, frontmatter in several shapes, inline tags (including near-duplicate
+spellings and '#'-prefixed frontmatter tags for the tag tools), code blocks,
+links and a configurable share of malformed frontmatter.
+
+Usage:
+    python synth_vault.py <output_dir> [options]
+
+Examples:
+    # 10,000 notes, up to 4 folders deep
+    python synth_vault.py /tmp/vault-10k --notes 10000 --depth 4
+
+    # Large bodies with dense inline tags and nested frontmatter
+    python synth_vault.py /tmp/vault-rich --shape rich --body-words 2000 --tag-density 3
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List
+
+MANIFEST_FILENAME = '.synth-vault.json'
+
+SHAPES = ('minimal', 'obsidian', 'rich')
+
+_WORDS = (
+    'project meeting idea research book article draft review plan goal habit health '
+    'finance travel recipe code python rust design team client weekly daily journal '
+    'reading writing learning music film garden home work study paper note archive '
+    'inbox reference tool process system data model query index search tag link'
+).split()
+
+_FOLDER_LEVELS = ('area', 'topic', 'series', 'part', 'section', 'chunk')
+_STATUSES = ('todo', 'in-progress', 'done', 'blocked', 'someday')
+_OWNERS = ('alice', 'bob', 'carol', 'dave', '민수', '지영')
+
+_CODE_BLOCK = '```python\n# comment, not a tag\nprint("#not-a-tag")\n```'
+
+
+def build_tag_vocabulary(rng: random.Random, size: int) -> List[str]:
+    """
+    Build `size` distinct tags, most common first.
+
+    Includes nested tags (parent/child), compound tags and near-duplicate
+    spellings (plurals, '_' for '-', capitalised) like real vaults collect.
+    """
+    tags: List[str] = []
+    seen = set()
+
+    def add(tag: str) -> None:
+        if tag not in seen:
+            seen.add(tag)
+            tags.append(tag)
+
+    while len(tags) < size:
+        word = rng.choice(_WORDS)
+        kind = rng.random()
+        if kind < 0.35:
+            add(word)
+        elif kind < 0.6:
+            add(f"{word}-{rng.choice(_WORDS)}")
+        elif kind < 0.8:
+            add(f"{word}/{rng.choice(_WORDS)}")
+        elif tags:
+            base = rng.choice(tags)
+            variant = rng.choice((base + 's', base.replace('-', '_'), base.capitalize(),
+                                  base + '-' + str(rng.randrange(1, 4))))
+            add(variant)
+    return tags[:size]
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _frontmatter(rng: random.Random, index: int, shape: str, tags: List[str]) -> str:
+    title = ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(2, 5))).capitalize()
+    lines = [f"title: {_quote(title) if rng.random() < 0.3 else title}"]
+
+    if shape != 'minimal':
+        created = date(2020, 1, 1) + timedelta(days=rng.randrange(1500))
+        updated = datetime(created.year, created.month, created.day) + timedelta(
+            days=rng.randrange(200), seconds=rng.randrange(86400))
+        lines.append(f"status: {rng.choice(_STATUSES)}")
+        lines.append(f"priority: {rng.randint(1, 5)}")
+        lines.append(f"created: {created.isoformat()}")
+        lines.append(f"updated: {updated.strftime('%Y-%m-%dT%H:%M:%S')}")
+        lines.append(f"done: {rng.choice(('true', 'false'))}")
+        if rng.random() < 0.5:
+            lines.append(f"rating: {rng.randint(0, 50) / 10}")
+        if rng.random() < 0.2:
+            lines.append(f"aliases: [{title.lower()}, note {index}]")
+
+    if tags:
+        # Some vaults write '#tag' in frontmatter, which fix_tags.py cleans up
+        rendered = [('#' + tag if rng.random() < 0.05 else tag) for tag in tags]
+        if rng.random() < 0.5:
+            lines.append('tags:')
+            lines.extend(f"  - {_quote(tag) if tag.startswith('#') else tag}" for tag in rendered)
+        elif any(tag.startswith('#') for tag in rendered):
+            lines.append('tags: [' + ', '.join(_quote(tag) for tag in rendered) + ']')
+        else:
+            lines.append('tags: [' + ', '.join(rendered) + ']')
+
+    if shape == 'rich':
+        lines.append('metadata:')
+        lines.append(f"  owner: {rng.choice(_OWNERS)}")
+        lines.append(f"  reviewed: {rng.choice(('true', 'false'))}")
+        lines.append(f"  version: {rng.randint(1, 20)}")
+        lines.append('links:')
+        for _ in range(rng.randint(0, 3)):
+            lines.append(f"  - title: {rng.choice(_WORDS)}")
+            lines.append(f"    url: https://example.com/{rng.choice(_WORDS)}#{rng.choice(_WORDS)}")
+        lines.append('summary: |')
+        lines.append(f"  {' '.join(rng.choice(_WORDS) for _ in range(12))}")
+        lines.append(f"  {' '.join(rng.choice(_WORDS) for _ in range(8))}")
+
+    return '\n'.join(lines)
+
+
+def _body(rng: random.Random, words: int, tag_density: float, pick_tag) -> str:
+    paragraphs = [f"# {rng.choice(_WORDS).capitalize()} notes"]
+    written = 0
+    while written < words:
+        length = min(rng.randint(20, 80), words - written)
+        tokens = []
+        for _ in range(length):
+            if rng.random() * 100 < tag_density:
+                tokens.append('#' + pick_tag())
+            else:
+                tokens.append(rng.choice(_WORDS))
+        written += length
+
+        extra = rng.random()
+        if extra < 0.05:
+            tokens.append(f"https://example.com/{rng.choice(_WORDS)}#{rng.choice(_WORDS)}")
+        elif extra < 0.10:
+            tokens.append(f"[[{rng.choice(_WORDS)} {rng.choice(_WORDS)}]]")
+        elif extra < 0.13:
+            tokens.append(f"`#{rng.choice(_WORDS)}`")
+        paragraphs.append(' '.join(tokens) + '.')
+
+        if rng.random() < 0.05:
+            paragraphs.append(_CODE_BLOCK)
+        if rng.random() < 0.1:
+            paragraphs.append(f"## {rng.choice(_WORDS).capitalize()}")
+    return '\n\n'.join(paragraphs) + '\n'
+
+
+def generate_vault(output_dir: str, notes: int = 1000, depth: int = 3, fanout: int = 6,
+                   shape: str = 'obsidian', tag_density: float = 1.0, body_words: int = 300,
+                   tag_vocabulary: int = 0, malformed: float = 0.01, seed: int = 42) -> Dict[str, Any]:
+    """
+    Write a synthetic vault.
+
+    Args:
+        output_dir: Folder to create the vault in (must be empty or missing)
+        notes: Number of notes
+        depth: Maximum folder nesting below the vault root
+        fanout: Folders per nesting level
+        shape: Frontmatter shape: 'minimal', 'obsidian' or 'rich'
+        tag_density: Inline tags per 100 body words
+        body_words: Average body length in words
+        tag_vocabulary: Distinct tags to draw from (0 picks about 5 * sqrt(notes))
+        malformed: Share of notes with invalid YAML frontmatter
+        seed: Random seed; the same options and seed give the same vault
+
+    Returns:
+        The manifest written to the vault's .synth-vault.json
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape: {shape}")
+    if os.path.isdir(output_dir) and os.listdir(output_dir):
+        raise ValueError(f"Output folder is not empty: {output_dir}")
+
+    rng = random.Random(seed)
+    vocabulary = build_tag_vocabulary(rng, tag_vocabulary or max(20, int(5 * notes ** 0.5)))
+    cumulative = []
+    total = 0.0
+    for rank in range(len(vocabulary)):
+        total += 1.0 / (rank + 1)
+        cumulative.append(total)
+
+    def pick_tag() -> str:
+        # Zipf-like: the first tags in the vocabulary are the most common
+        return rng.choices(vocabulary, cum_weights=cumulative)[0]
+
+    for index in range(notes):
+        levels = rng.randint(0, depth)
+        folder = [f"{_FOLDER_LEVELS[level % len(_FOLDER_LEVELS)]}-{rng.randrange(fanout):02d}"
+                  for level in range(levels)]
+        note_tags = list(dict.fromkeys(pick_tag() for _ in range(rng.randint(0, 5))))
+
+        if rng.random() < malformed:
+            header = f"title: broken note {index}\ntags: [unclosed, list"
+        else:
+            header = _frontmatter(rng, index, shape, note_tags)
+        words = max(0, int(rng.gauss(body_words, body_words / 3)))
+        content = f"---\n{header}\n---\n{_body(rng, words, tag_density, pick_tag)}"
+
+        note_dir = os.path.join(output_dir, *folder)
+        os.makedirs(note_dir, exist_ok=True)
+        with open(os.path.join(note_dir, f"note-{index:06d}.md"), 'w', encoding='utf-8', newline='\n') as f:
+            f.write(content)
+
+    manifest = {
+        'notes': notes, 'depth': depth, 'fanout': fanout, 'shape': shape,
+        'tag_density': tag_density, 'body_words': body_words,
+        'tag_vocabulary': len(vocabulary), 'malformed': malformed, 'seed': seed,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a deterministic synthetic Obsidian vault',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    parser.add_argument('output_dir', help='Folder to create the vault in (must be empty)')
+    parser.add_argument('--notes', type=int, default=1000, help='Number of notes (default: 1000)')
+    parser.add_argument('--depth', type=int, default=3, help='Maximum folder nesting (default: 3)')
+    parser.add_argument('--fanout', type=int, default=6, help='Folders per nesting level (default: 6)')
+    parser.add_argument('--shape', choices=SHAPES, default='obsidian',
+                        help='Frontmatter shape (default: obsidian)')
+    parser.add_argument('--tag-density', type=float, default=1.0,
+                        help='Inline tags per 100 body words (default: 1.0)')
+    parser.add_argument('--body-words', type=int, default=300,
+                        help='Average body length in words (default: 300)')
+    parser.add_argument('--tag-vocabulary', type=int, default=0,
+                        help='Distinct tags (default: about 5 * sqrt(notes))')
+    parser.add_argument('--malformed', type=float, default=0.01,
+                        help='Share of notes with invalid frontmatter (default: 0.01)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+
+    args = parser.parse_args()
+
+    try:
+        manifest = generate_vault(args.output_dir, notes=args.notes, depth=args.depth,
+                                  fanout=args.fanout, shape=args.shape,
+                                  tag_density=args.tag_density, body_words=args.body_words,
+                                  tag_vocabulary=args.tag_vocabulary, malformed=args.malformed,
+                                  seed=args.seed)
+        print(f"Generated {manifest['notes']} notes in {args.output_dir}")
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Tests for changeset.py: conflicts, invalid changesets and plan-then-apply parity.
+
+Run with: python -m pytest .github/skills/obsidian-frontmatter/scripts
+"""
+
+import json
+import shutil
+
+import pytest
+
+from changeset import apply_changeset, make_record, set_edit, write_changeset
+from frontmatter_modify import bulk_modify, plan_bulk_modify
+from query import compile_query
+
+NOTES = {
+    'a.md': "---\nstatus: draft  # keep\ntags: [x, y]\n---\nBody a\n",
+    'b.md': "---\nstatus: done\n---\nBody b\n",
+    'sub/c.md': "---\n# header comment\ntitle: 'C'\nstatus: draft\n---\n",
+    'sub/d.md': "No frontmatter\n",
+    'e.md': "---\n{status: draft}\n---\nFlow header\n",
+}
+
+
+def _make_vault(root):
+    (root / '.obsidian').mkdir(parents=True)
+    for name, content in NOTES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content.encode('utf-8'))
+    return root
+
+
+def _notes(root):
+    return {path.relative_to(root).as_posix(): path.read_bytes()
+            for path in sorted(root.rglob('*.md'))}
+
+
+@pytest.fixture
+def vault(tmp_path):
+    return _make_vault(tmp_path / 'vault')
+
+
+def _plan(vault, changeset, where='status = draft', key='status', value='done'):
+    records = [record for _, status, record, _ in
+               plan_bulk_modify(str(vault), compile_query(where), 'update', key, value)
+               if status == 'changed']
+    write_changeset(str(changeset), str(vault), records, 'test')
+    return records
+
+
+def _write_records(changeset, root, records):
+    write_changeset(str(changeset), str(root), records, 'test')
+
+
+def test_plan_then_apply_matches_a_direct_apply(tmp_path, vault):
+    direct = _make_vault(tmp_path / 'direct')
+    changeset = tmp_path / 'changes.jsonl'
+
+    records = _plan(vault, changeset)
+    assert _notes(vault) == _notes(direct)  # planning writes nothing
+    assert sorted(record['path'] for record in records) == ['a.md', 'e.md', 'sub/c.md']
+
+    results = list(apply_changeset(str(changeset)))
+    assert sorted(results) == [('a.md', 'applied', None), ('e.md', 'applied', None),
+                               ('sub/c.md', 'applied', None)]
+
+    list(bulk_modify(str(direct), compile_query('status = draft'), 'update', 'status', 'done',
+                     apply=True))
+    assert _notes(vault) == _notes(direct)
+    assert _notes(vault)['a.md'] == b"---\nstatus: done\ntags: [x, y]\n---\nBody a\n"
+
+
+def test_check_writes_nothing(tmp_path, vault):
+    changeset = tmp_path / 'changes.jsonl'
+    _plan(vault, changeset)
+    before = _notes(vault)
+    assert {status for _, status, _ in apply_changeset(str(changeset), check=True)} == {'ready'}
+    assert _notes(vault) == before
+
+
+def test_changed_note_is_a_conflict(tmp_path, vault):
+    changeset = tmp_path / 'changes.jsonl'
+    _plan(vault, changeset)
+    (vault / 'a.md').write_text("---\nstatus: draft\n---\nEdited since\n", encoding='utf-8')
+
+    results = dict((path, (status, error)) for path, status, error in apply_changeset(str(changeset)))
+    assert results['a.md'] == ('conflict', 'note changed since the plan was made')
+    assert results['sub/c.md'] == ('applied', None)
+    assert (vault / 'a.md').read_text(encoding='utf-8') == "---\nstatus: draft\n---\nEdited since\n"
+
+
+def test_deleted_note_is_a_conflict(tmp_path, vault):
+    changeset = tmp_path / 'changes.jsonl'
+    _plan(vault, changeset)
+    (vault / 'e.md').unlink()
+
+    results = dict((path, (status, error)) for path, status, error in apply_changeset(str(changeset)))
+    assert results['e.md'] == ('conflict', 'note no longer exists')
+    assert not (vault / 'e.md').exists()
+    assert results['a.md'] == ('applied', None)
+
+
+def test_moved_vault(tmp_path, vault):
+    changeset = tmp_path / 'changes.jsonl'
+    _plan(vault, changeset)
+    moved = tmp_path / 'moved'
+    shutil.move(str(vault), str(moved))
+
+    results = list(apply_changeset(str(changeset), root=str(moved)))
+    assert {status for _, status, _ in results} == {'applied'}
+    assert (moved / 'sub' / 'c.md').read_text(encoding='utf-8').count('status: done') == 1
+
+
+def test_not_a_changeset(tmp_path):
+    changeset = tmp_path / 'changes.jsonl'
+    changeset.write_text(json.dumps({'changeset': 99}) + '\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(apply_changeset(str(changeset)))
+
+
+def test_note_listed_twice_is_rejected(tmp_path, vault):
+    changeset = tmp_path / 'changes.jsonl'
+    records = _plan(vault, changeset)
+    _write_records(changeset, vault, records + [dict(records[0], path='./' + records[0]['path'])])
+    before = _notes(vault)
+
+    with pytest.raises(ValueError, match='listed more than once'):
+        list(apply_changeset(str(changeset)))
+    assert _notes(vault) == before
+
+
+@pytest.mark.parametrize('escape', ['../outside.md', 'sub/../../outside.md', 'absolute'])
+def test_paths_outside_the_vault_are_rejected(tmp_path, vault, escape):
+    outside = tmp_path / 'outside.md'
+    outside.write_text("---\nstatus: draft\n---\n", encoding='utf-8')
+    record = make_record(str(vault), str(outside), outside.read_text(encoding='utf-8'),
+                         [set_edit('status', 'done')])
+    record['path'] = outside.as_posix() if escape == 'absolute' else escape
+    changeset = tmp_path / 'changes.jsonl'
+    _write_records(changeset, vault, [record])
+
+    with pytest.raises(ValueError, match='outside the vault'):
+        list(apply_changeset(str(changeset), check=True))
+    with pytest.raises(ValueError, match='outside the vault'):
+        list(apply_changeset(str(changeset)))
+    assert outside.read_text(encoding='utf-8') == "---\nstatus: draft\n---\n"
+
+
+def test_symlink_out_of_the_vault_is_not_written(tmp_path, vault):
+    outside = tmp_path / 'outside.md'
+    outside.write_text("---\nstatus: draft\n---\n", encoding='utf-8')
+    (vault / 'link.md').symlink_to(outside)
+    record = make_record(str(vault), str(vault / 'link.md'), outside.read_text(encoding='utf-8'),
+                         [set_edit('status', 'done')])
+    changeset = tmp_path / 'changes.jsonl'
+    _write_records(changeset, vault, [record])
+
+    [(path, status, error)] = apply_changeset(str(changeset))
+    assert (path, status) == ('link.md', 'error')
+    assert 'outside the vault' in error
+    assert outside.read_text(encoding='utf-8') == "---\nstatus: draft\n---\n"
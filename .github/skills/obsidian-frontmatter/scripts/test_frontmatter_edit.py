@@ -0,0 +1,134 @@
+"""
+Tests for frontmatter_edit.py: in-place splices and the fall back to a full dump.
+
+Run with: python -m pytest .github/skills/obsidian-frontmatter/scripts
+"""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from frontmatter_edit import edit_note, render_note, same_value, splice_frontmatter
+from utils import FRONTMATTER_RE
+from yaml_backend import load_yaml
+
+CORPUS = Path(__file__).parent.parent / 'tests' / 'yaml_corpus'
+
+
+def _corpus_notes():
+    notes = []
+    for path in sorted(CORPUS.glob('*.md')):
+        content = path.read_text(encoding='utf-8')
+        match = FRONTMATTER_RE.match(content)
+        try:
+            frontmatter = load_yaml(match.group(1)) if match else None
+        except (yaml.YAMLError, ValueError):
+            # Malformed notes are bench_yaml.py's concern
+            continue
+        if isinstance(frontmatter, dict):
+            notes.append(pytest.param(content, frontmatter, id=path.stem))
+    return notes
+
+
+def _edit(header, **changes):
+    """Splice header with some properties changed (None deletes one)."""
+    new = dict(load_yaml(header))
+    for key, value in changes.items():
+        if value is None:
+            new.pop(key, None)
+        else:
+            new[key] = value
+    return splice_frontmatter(header, new)
+
+
+@pytest.mark.parametrize('content, frontmatter', _corpus_notes())
+def test_unchanged_frontmatter_round_trips(content, frontmatter):
+    assert edit_note(content, frontmatter) == content
+
+
+@pytest.mark.parametrize('content, frontmatter', _corpus_notes())
+def test_added_property_round_trips(content, frontmatter):
+    new = dict(frontmatter, reviewed=True)
+    edited = edit_note(content, new)
+    assert edited is not None
+    assert same_value(load_yaml(FRONTMATTER_RE.match(edited).group(1)), new)
+
+
+def test_changed_property_is_a_one_line_diff():
+    header = "\n# Leading comment\ntitle: 'Quoted'  # kept\nstatus: draft\ncreated: 2024-05-01\n"
+    edited = _edit(header, status='done')
+    assert edited == "\n# Leading comment\ntitle: 'Quoted'  # kept\nstatus: done\ncreated: 2024-05-01\n"
+
+
+def test_deleted_property_takes_its_block_with_it():
+    header = "\ntitle: A\ntags:\n  - a\n  - b\nstatus: draft\n"
+    assert _edit(header, tags=None) == "\ntitle: A\nstatus: draft\n"
+
+
+def test_block_list_items_at_the_key_indent():
+    header = "\ntags:\n- a\n- b\nstatus: draft\n"
+    assert _edit(header, status='done') == "\ntags:\n- a\n- b\nstatus: done\n"
+
+
+def test_flow_list_stays_flow_style():
+    header = "\ntags: [a, b]\ntitle: A\n"
+    assert _edit(header, tags=['a', 'c']) == "\ntags: [a, c]\ntitle: A\n"
+
+
+def test_nested_edit_keeps_its_siblings():
+    header = "\nmetadata:\n  author: kim\n  version: '1.0'\ntitle: A\n"
+    new = {'metadata': {'author': 'lee', 'version': '1.0'}, 'title': 'A'}
+    assert splice_frontmatter(header, new) == "\nmetadata:\n  author: lee\n  version: '1.0'\ntitle: A\n"
+
+
+def test_new_property_goes_before_a_trailing_block_scalar():
+    header = "\ntitle: A\nsummary: |\n  First\n  Second"
+    edited = _edit(header, status='done')
+    assert edited is not None
+    assert load_yaml(edited) == {'title': 'A', 'summary': 'First\nSecond', 'status': 'done'}
+
+
+def test_type_change_counts_as_a_change():
+    header = "\ncount: 1\n"
+    assert _edit(header, count=True) == "\ncount: true\n"
+    assert _edit(header, count=1.0) == "\ncount: 1.0\n"
+
+
+@pytest.mark.parametrize('header', [
+    # Flow mapping as the whole header
+    "\n{title: A, status: draft}\n",
+    # Duplicate keys hide a value
+    "\nstatus: draft\nstatus: done\n",
+    # Explicit '?' key
+    "\n? title\n: A\n",
+    # Unparseable YAML
+    "\ntitle: [unclosed\n",
+])
+def test_unsupported_headers_fall_back(header):
+    try:
+        old = load_yaml(header)
+    except yaml.YAMLError:
+        old = {'title': 'A'}
+    new = dict(old, status='review')
+    assert splice_frontmatter(header, new) is None
+
+
+def test_render_note_falls_back_to_a_full_dump():
+    original = "---\n{title: A, status: draft}\n---\nBody\n"
+    frontmatter = {'title': 'A', 'status': 'draft'}
+    rendered = render_note(original, frontmatter, {'title': 'A', 'status': 'done'}, "\nBody\n")
+    assert rendered == "---\ntitle: A\nstatus: done\n---\n\nBody\n"
+
+
+def test_render_note_adds_frontmatter_to_a_plain_note():
+    rendered = render_note("Body\n", None, {'status': 'todo'}, "Body\n")
+    assert rendered == "---\nstatus: todo\n---\nBody\n"
+
+
+def test_edit_note_keeps_delimiters_and_body():
+    content = "---\r\nstatus: draft\r\n---\r\nBody --- text\r\n"
+    edited = edit_note(content, {'status': 'done'})
+    assert edited is not None
+    assert edited.endswith("---\r\nBody --- text\r\n")
+    assert edit_note("No frontmatter", {'status': 'done'}) is None
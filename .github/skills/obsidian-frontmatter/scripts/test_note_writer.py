@@ -0,0 +1,143 @@
+"""
+Tests for note_writer.py: committing, and finishing or undoing an interrupted commit.
+
+Run with: python -m pytest .github/skills/obsidian-frontmatter/scripts
+"""
+
+import os
+
+import pytest
+
+import note_writer
+from note_writer import NoteTransaction, is_prepared, pending_transactions, recover
+
+
+@pytest.fixture
+def vault(tmp_path):
+    (tmp_path / '.obsidian').mkdir()
+    for name in ('a', 'b', 'c'):
+        (tmp_path / f'{name}.md').write_text(f'old {name}\n', encoding='utf-8')
+    return tmp_path
+
+
+def _notes(folder):
+    return {path.name: path.read_text(encoding='utf-8') for path in sorted(folder.glob('*.md'))}
+
+
+def _leftovers(folder):
+    """Temp files and journals a finished transaction should not leave behind."""
+    names = [path.name for path in folder.iterdir() if path.name.endswith('.tmp')]
+    return names + pending_transactions(str(folder))
+
+
+def _interrupted_commit(vault, monkeypatch, renames):
+    """Stage new text for a.md, b.md and a new d.md, and stop the commit
+    after `renames` notes were moved into place."""
+    transaction = NoteTransaction(str(vault))
+    for name in ('a', 'b', 'd'):
+        transaction.stage(str(vault / f'{name}.md'), f'new {name}\n')
+
+    real_replace = os.replace
+    calls = []
+
+    def replace(src, dst):
+        if len(calls) == renames:
+            raise KeyboardInterrupt
+        calls.append(dst)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(note_writer.os, 'replace', replace)
+    with pytest.raises(KeyboardInterrupt):
+        transaction.commit()
+    monkeypatch.undo()
+    [journal] = pending_transactions(str(vault))
+    return journal
+
+
+def test_commit_writes_every_note(vault):
+    with NoteTransaction(str(vault)) as transaction:
+        transaction.stage(str(vault / 'a.md'), 'new a\n')
+        transaction.stage(str(vault / 'd.md'), 'new d\n')
+    assert _notes(vault) == {'a.md': 'new a\n', 'b.md': 'old b\n', 'c.md': 'old c\n', 'd.md': 'new d\n'}
+    assert _leftovers(vault) == []
+    assert os.listdir(vault / '.obsidian') == []
+
+
+def test_error_in_block_rolls_back(vault):
+    with pytest.raises(RuntimeError):
+        with NoteTransaction(str(vault)) as transaction:
+            transaction.stage(str(vault / 'a.md'), 'new a\n')
+            transaction.stage(str(vault / 'd.md'), 'new d\n')
+            raise RuntimeError('stop')
+    assert _notes(vault) == {'a.md': 'old a\n', 'b.md': 'old b\n', 'c.md': 'old c\n'}
+    assert _leftovers(vault) == []
+
+
+def test_resume_finishes_an_interrupted_commit(vault, monkeypatch):
+    journal = _interrupted_commit(vault, monkeypatch, renames=1)
+    assert is_prepared(journal)
+    assert _notes(vault)['a.md'] == 'new a\n'
+    assert _notes(vault)['b.md'] == 'old b\n'
+
+    assert recover(journal, resume=True) == 2
+    assert _notes(vault) == {'a.md': 'new a\n', 'b.md': 'new b\n', 'c.md': 'old c\n', 'd.md': 'new d\n'}
+    assert _leftovers(vault) == []
+
+
+@pytest.mark.parametrize('renames', [0, 1, 2])
+def test_rollback_restores_an_interrupted_commit(vault, monkeypatch, renames):
+    journal = _interrupted_commit(vault, monkeypatch, renames=renames)
+    assert recover(journal, resume=False) == renames
+    assert _notes(vault) == {'a.md': 'old a\n', 'b.md': 'old b\n', 'c.md': 'old c\n'}
+    assert _leftovers(vault) == []
+
+
+def test_unprepared_transaction_is_rolled_back_even_on_resume(vault):
+    transaction = NoteTransaction(str(vault))
+    transaction.stage(str(vault / 'a.md'), 'new a\n')
+    # Interrupted while staging: no PREPARED marker yet
+    [journal] = pending_transactions(str(vault))
+    assert not is_prepared(journal)
+
+    assert recover(journal, resume=True) == 0
+    assert _notes(vault)['a.md'] == 'old a\n'
+    assert _leftovers(vault) == []
+
+
+def test_failed_prepare_discards_the_batch(vault, monkeypatch):
+    def fail(*args):
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(note_writer, '_sync_staged', fail)
+    transaction = NoteTransaction(str(vault))
+    transaction.stage(str(vault / 'a.md'), 'new a\n')
+    with pytest.raises(OSError):
+        transaction.commit()
+    assert _notes(vault)['a.md'] == 'old a\n'
+    assert _leftovers(vault) == []
+
+
+def test_torn_entries_line_is_ignored(vault, monkeypatch):
+    journal = _interrupted_commit(vault, monkeypatch, renames=0)
+    [entries] = [name for name in os.listdir(journal) if name.startswith(note_writer.ENTRIES_PREFIX)]
+    with open(os.path.join(journal, entries), 'a', encoding='utf-8') as f:
+        f.write('{"path": "/torn')
+    assert recover(journal, resume=True) == 3
+    assert _notes(vault)['d.md'] == 'new d\n'
+
+
+def test_note_staged_twice_is_rejected(vault):
+    with pytest.raises(ValueError):
+        with NoteTransaction(str(vault)) as transaction:
+            transaction.stage(str(vault / 'a.md'), 'first\n')
+            transaction.stage(str(vault / 'a.md'), 'second\n')
+    assert _notes(vault)['a.md'] == 'old a\n'
+
+
+def test_no_config_folder_left_outside_a_vault(tmp_path):
+    note = tmp_path / 'n.md'
+    note.write_text('old\n', encoding='utf-8')
+    with NoteTransaction(str(tmp_path)) as transaction:
+        transaction.stage(str(note), 'new\n')
+    assert note.read_text(encoding='utf-8') == 'new\n'
+    assert os.listdir(tmp_path) == ['n.md']
@@ -0,0 +1,102 @@
+"""
+Tests for property_path.py: nested keys, list indexes and wildcards.
+
+Run with: python -m pytest .github/skills/obsidian-frontmatter/scripts
+"""
+
+import pytest
+
+from property_path import PropertyPath, compile_path
+from query import compile_query
+
+NOTE = {
+    'title': 'A',
+    'metadata': {'author': 'kim', 'version': '1.0'},
+    'links': [{'title': 'Home', 'url': 'https://example.com'}, {'title': 'Docs'}],
+    'authors': [{'name': 'Ann'}, {'name': 'Bob'}, {'role': 'editor'}],
+    'projects': {'x': {'status': 'done', 'tags': ['urgent']}, 'y': {'status': 'open'}},
+    'tags': ['a', 'b', 'c'],
+    'empty': None,
+}
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('title', 'A'),
+    ('metadata.author', 'kim'),
+    ('metadata.missing', None),
+    ('title.nested', None),
+    ('empty', None),
+    ('links[0].title', 'Home'),
+    ('links[1].url', None),
+    ('links[-1].title', 'Docs'),
+    ('links[2].title', None),
+    ('links[-3].title', None),
+    ('tags[1]', 'b'),
+    ('metadata[0]', None),
+])
+def test_get_single_values(path, expected):
+    assert compile_path(path).get(NOTE) == expected
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('authors[*].name', ['Ann', 'Bob']),
+    ('projects.*.status', ['done', 'open']),
+    ('tags[*]', ['a', 'b', 'c']),
+    ('metadata.*', ['kim', '1.0']),
+    ('links.*.title', ['Home', 'Docs']),
+    ('projects.*.tags[*]', ['urgent']),
+    ('authors[*].missing', None),
+    ('nothing[*]', None),
+])
+def test_get_wildcard_values(path, expected):
+    assert compile_path(path).get(NOTE) == expected
+
+
+def test_select_keeps_nulls_and_values_drops_them():
+    path = compile_path('*')
+    assert None in path.select(NOTE)
+    assert None not in path.values(NOTE)
+
+
+@pytest.mark.parametrize('path', ['notes[draft]', 'a[', 'a]b', 'x[a*]'])
+def test_invalid_selectors_are_literal_keys(path):
+    parsed = PropertyPath(path)
+    assert parsed.plain and not parsed.wildcard
+    assert parsed.get({path: 1}) == 1
+
+
+def test_root_key():
+    assert compile_path('links[0].title').root_key == 'links'
+    assert compile_path('*.status').root_key is None
+
+
+def test_set_creates_missing_mappings():
+    assert compile_path('a.b.c').set({}, 1) == {'a': {'b': {'c': 1}}}
+
+
+def test_set_list_index():
+    fm = {'tags': ['a', 'b']}
+    compile_path('tags[-1]').set(fm, 'z')
+    compile_path('tags[5]').set(fm, 'ignored')
+    assert fm == {'tags': ['a', 'z']}
+
+
+def test_set_wildcard_copies_the_value_per_child():
+    fm = {'authors': [{'name': 'Ann'}, {'name': 'Bob'}]}
+    compile_path('authors[*].meta').set(fm, {'checked': True})
+    assert fm['authors'][0]['meta'] == {'checked': True}
+    assert fm['authors'][0]['meta'] is not fm['authors'][1]['meta']
+
+
+def test_delete_index_and_wildcard():
+    fm = {'tags': ['a', 'b', 'c'], 'authors': [{'name': 'Ann', 'x': 1}, {'name': 'Bob'}]}
+    compile_path('tags[0]').delete(fm)
+    compile_path('authors[*].name').delete(fm)
+    assert fm == {'tags': ['b', 'c'], 'authors': [{'x': 1}, {}]}
+
+
+def test_wildcard_conditions_match_any_selected_value():
+    assert compile_query('authors[*].name = Bob').matches(NOTE)
+    assert not compile_query('authors[*].name = Eve').matches(NOTE)
+    assert compile_query('projects.*.tags contains urgent').matches(NOTE)
+    assert compile_query('links[1].title = Docs and not links[1].url exists').matches(NOTE)
@@ -0,0 +1,110 @@
+"""
+Tests for query.py: parsing, operator precedence and syntax errors.
+
+Run with: python -m pytest .github/skills/obsidian-frontmatter/scripts
+"""
+
+import re
+
+import pytest
+
+from query import And, Condition, Not, Or, QuerySyntaxError, compile_query, node_from_dict, parse_query
+
+
+def test_and_binds_tighter_than_or():
+    node = parse_query('a = 1 or b = 2 and c = 3')
+    assert isinstance(node, Or)
+    first, second = node.children
+    assert isinstance(first, Condition) and first.prop == 'a'
+    assert isinstance(second, And)
+    assert [child.prop for child in second.children] == ['b', 'c']
+
+
+def test_parentheses_override_precedence():
+    plan = compile_query('(a = 1 or b = 2) and c = 3')
+    assert isinstance(plan.root, And)
+    assert plan.matches({'a': 1, 'c': 3})
+    assert not plan.matches({'a': 1, 'c': 4})
+    assert not plan.matches({'b': 3, 'c': 3})
+
+
+def test_not_binds_tighter_than_and():
+    plan = compile_query('not a = 1 and b = 2')
+    assert plan.matches({'a': 2, 'b': 2})
+    assert not plan.matches({'a': 1, 'b': 2})
+
+
+def test_not_exists_becomes_a_condition():
+    node = parse_query('not draft exists')
+    assert isinstance(node, Condition)
+    assert node.operator == 'not-exists'
+
+
+def test_not_equals_is_a_negated_equality():
+    node = parse_query('status != done')
+    assert isinstance(node, Not)
+    assert compile_query('status != done').matches({'status': 'todo'})
+
+
+def test_keywords_are_case_insensitive():
+    plan = compile_query('a = 1 AND NOT b EXISTS')
+    assert plan.matches({'a': 1})
+    assert not plan.matches({'a': 1, 'b': 2})
+
+
+def test_unquoted_values_are_typed_and_quoted_values_are_strings():
+    plan = compile_query('done = true and count = "3" and size = 3')
+    assert plan.matches({'done': True, 'count': '3', 'size': 3})
+    assert not plan.matches({'done': True, 'count': 3, 'size': 3})
+    assert not plan.matches({'done': 'true', 'count': '3', 'size': 3})
+
+
+def test_quoted_property_names():
+    plan = compile_query('"상태" != 완료 and \'my key\' exists')
+    assert plan.matches({'상태': '진행', 'my key': 1})
+
+
+def test_properties_in_query_order_without_duplicates():
+    plan = compile_query('b = 1 or (a exists and b = 2)')
+    assert plan.properties == ['b', 'a']
+
+
+def test_filters_and_query_are_combined_with_and():
+    plan = compile_query('b = 2', filters=[{'property': 'a', 'operator': 'equals', 'value': 1}])
+    assert plan.matches({'a': 1, 'b': 2})
+    assert not plan.matches({'a': 1, 'b': 3})
+
+
+def test_plan_round_trips_through_dict():
+    node = parse_query('not (a > 1 or b contains x) and c exists')
+    assert node_from_dict(node.to_dict()).to_dict() == node.to_dict()
+
+
+@pytest.mark.parametrize('query, message', [
+    ('', 'Empty query'),
+    ('   ', 'Empty query'),
+    ('a =', 'Unexpected end of query'),
+    ('a', 'Unexpected end of query'),
+    ('(a = 1', 'Unexpected end of query'),
+    ('(a = 1 b', "Expected ')'"),
+    ('a = 1)', "Unexpected token: ')'"),
+    ('a = 1 b = 2', "Unexpected token: 'b'"),
+    ('a = 1 "', 'Unexpected character at position 5'),
+    ('a ~ 1', "Expected an operator after 'a', got '~'"),
+    ('a foo 1', "Expected an operator after 'a', got 'foo'"),
+    ('= 1', "Expected a property name, got '='"),
+    ('a = (', "Expected a value after 'a', got '('"),
+    ('and = 1', "Expected a property name, got 'and'"),
+])
+def test_syntax_errors(query, message):
+    with pytest.raises(QuerySyntaxError, match=re.escape(message)):
+        parse_query(query)
+
+
+def test_no_query_or_filters():
+    with pytest.raises(QuerySyntaxError):
+        compile_query()
+
+
+def test_syntax_error_is_a_value_error():
+    assert issubclass(QuerySyntaxError, ValueError)
@@ -6,10 +6,31 @@ Handles YAML parsing, file operations, and property type validation.
 import os
 import re
 import yaml
-from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Iterator, Tuple
 from datetime import datetime
 
+from yaml_backend import load_yaml
+from vault_walk import walk_markdown
+from note_writer import atomic_write
+from property_path import compile_path
+
+
+def iter_markdown_files(vault_path: str) -> Iterator[str]:
+    """
+    Lazily yield markdown files in the vault, so callers can stop early.
+    
+    Hidden folders and anything excluded by the vault's .vaultignore are
+    skipped (see vault_walk.py).
+    
+    Args:
+        vault_path: Path to Obsidian vault
+        
+    Yields:
+        Absolute paths to .md files
+    """
+    for entry in walk_markdown(vault_path):
+        yield entry.path
+
 
 def find_markdown_files(vault_path: str) -> List[str]:
     """
@@ -21,15 +42,40 @@ def find_markdown_files(vault_path: str) -> List[str]:
     Returns:
         List of absolute paths to .md files
     """
-    vault = Path(vault_path)
-    if not vault.exists():
-        raise ValueError(f"Vault path does not exist: {vault_path}")
-    
-    md_files = []
-    for md_file in vault.rglob("*.md"):
-        md_files.append(str(md_file.absolute()))
-    
-    return md_files
+    return list(iter_markdown_files(vault_path))
+
+
+# Default cap on how much of a note is read line by line while looking for
+# the closing delimiter. Real frontmatter is a few KB; a note whose header
+# runs past this is parsed from the whole file instead, like parse_frontmatter.
+DEFAULT_MAX_HEADER_SIZE = 64 * 1024
+
+# _read_header's result for a header longer than the limit
+_HEADER_TOO_LARGE = object()
+
+FRONTMATTER_RE = re.compile(r'^---\s*\n(.*?)\n---\s*\n(.*)', re.DOTALL)
+HEADER_RE = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+OPENING_LINE_RE = re.compile(r'---[^\S\n]*\n')
+
+
+def _load_yaml(yaml_content: str, file_path: str) -> Any:
+    """Parse a frontmatter block, raising ValueError on malformed YAML."""
+    try:
+        frontmatter = load_yaml(yaml_content)
+        if frontmatter is None:
+            frontmatter = {}
+        return frontmatter
+    except yaml.YAMLError as e:
+        # Malformed YAML
+        raise ValueError(f"Invalid YAML in {file_path}: {e}")
+
+
+def _read_text(file_path: str) -> str:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception as e:
+        raise IOError(f"Error reading file {file_path}: {e}")
 
 
 def parse_frontmatter(file_path: str) -> Tuple[Optional[Dict[str, Any]], str]:
@@ -43,35 +89,161 @@ def parse_frontmatter(file_path: str) -> Tuple[Optional[Dict[str, Any]], str]:
         Tuple of (frontmatter_dict, content_without_frontmatter)
         Returns (None, full_content) if no frontmatter found
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except Exception as e:
-        raise IOError(f"Error reading file {file_path}: {e}")
+    return split_frontmatter(_read_text(file_path), file_path)
+
+
+def split_frontmatter(content: str, file_path: str = '<string>') -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Parse YAML frontmatter from note text that is already in memory.
     
+    Args:
+        content: Full note text
+        file_path: Path used in error messages
+        
+    Returns:
+        Tuple of (frontmatter_dict, content_without_frontmatter), as parse_frontmatter
+    """
     # Check for frontmatter (must start with ---)
     if not content.startswith('---'):
         return None, content
     
     # Find the closing ---
-    match = re.match(r'^---\s*\n(.*?)\n---\s*\n(.*)', content, re.DOTALL)
+    match = FRONTMATTER_RE.match(content)
     if not match:
         return None, content
     
     yaml_content = match.group(1)
     body_content = match.group(2)
     
+    return _load_yaml(yaml_content, file_path), body_content
+
+
+class LazyBody:
+    """
+    Body of a note that is only read from disk when first requested.
+    
+    Returned by read_frontmatter so search and list runs pay only for the
+    header. read() returns the same text parse_frontmatter would.
+    """
+    
+    def __init__(self, file_path: str, has_frontmatter: bool):
+        self.file_path = file_path
+        self.has_frontmatter = has_frontmatter
+        self._text = None
+    
+    @property
+    def loaded(self) -> bool:
+        return self._text is not None
+    
+    def read(self) -> str:
+        if self._text is None:
+            content = _read_text(self.file_path)
+            match = FRONTMATTER_RE.match(content) if self.has_frontmatter else None
+            self._text = match.group(2) if match else content
+        return self._text
+    
+    def __str__(self) -> str:
+        return self.read()
+
+
+def _decode_lines(raw: bytes) -> str:
+    """Decode UTF-8 and translate newlines the way text mode does."""
+    return raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _read_header(file_path: str, max_header_size: Optional[int]) -> Any:
+    """
+    Read a note line by line until the closing '---' and return the YAML block.
+    
+    Lines are decoded and newline-translated the way text mode would, so the
+    result matches what FRONTMATTER_RE captures from the whole file. Returns
+    None when the note has no frontmatter, and _HEADER_TOO_LARGE when no
+    closing delimiter was found within max_header_size bytes.
+    """
+    limit = max_header_size if max_header_size is not None else -1
+    
+    with open(file_path, 'rb') as f:
+        consumed = 0
+        
+        def next_chunk():
+            nonlocal consumed
+            raw = f.readline(-1 if limit < 0 else limit - consumed + 1)
+            consumed += len(raw)
+            if limit >= 0 and consumed > limit:
+                return None
+            return _decode_lines(raw)
+        
+        def match_whole_file(prefix):
+            content = prefix + _decode_lines(f.read())
+            match = HEADER_RE.match(content)
+            return match.group(1) if match else None
+        
+        first = next_chunk()
+        if first is None:
+            f.seek(0)
+            return _HEADER_TOO_LARGE if f.read(3) == b'---' else None
+        if not first.startswith('---'):
+            return None
+        if not OPENING_LINE_RE.fullmatch(first):
+            # Lone-CR line endings pack several lines into one chunk
+            return match_whole_file(first) if first.count('\n') > 1 else None
+        
+        chunk = next_chunk()
+        if chunk and chunk.strip() == '':
+            # Blank lines right after the opening delimiter change where the
+            # pattern anchors, so resolve this rare layout against the whole file.
+            return match_whole_file(first + chunk)
+        
+        parts = [first]
+        while chunk:
+            parts.append(chunk)
+            if chunk.startswith('---') or '\n---' in chunk:
+                match = HEADER_RE.match(''.join(parts))
+                if match:
+                    return match.group(1)
+            chunk = next_chunk()
+        if chunk is None:
+            return _HEADER_TOO_LARGE
+    
+    return None
+
+
+def read_frontmatter(file_path: str,
+                     max_header_size: Optional[int] = DEFAULT_MAX_HEADER_SIZE
+                     ) -> Tuple[Optional[Dict[str, Any]], LazyBody]:
+    """
+    Parse YAML frontmatter without reading the note body.
+    
+    Reads line by line until the closing '---', so large notes cost only their
+    header. Parses to the same frontmatter as parse_frontmatter.
+    
+    Args:
+        file_path: Path to markdown file
+        max_header_size: Maximum bytes to read line by line looking for the
+            closing delimiter (None for no limit). A note whose header is
+            longer is parsed from the whole file.
+        
+    Returns:
+        Tuple of (frontmatter_dict, lazy_body)
+        Returns (None, lazy_body) if no frontmatter found
+    """
     try:
-        frontmatter = yaml.safe_load(yaml_content)
-        if frontmatter is None:
-            frontmatter = {}
-        return frontmatter, body_content
-    except yaml.YAMLError as e:
-        # Malformed YAML
-        raise ValueError(f"Invalid YAML in {file_path}: {e}")
+        yaml_content = _read_header(file_path, max_header_size)
+    except Exception as e:
+        raise IOError(f"Error reading file {file_path}: {e}")
+    
+    if yaml_content is _HEADER_TOO_LARGE:
+        frontmatter, _ = parse_frontmatter(file_path)
+        return frontmatter, LazyBody(file_path, has_frontmatter=frontmatter is not None)
+    
+    if yaml_content is None:
+        return None, LazyBody(file_path, has_frontmatter=False)
+    
+    return _load_yaml(yaml_content, file_path), LazyBody(file_path, has_frontmatter=True)
 
 
-def write_frontmatter(file_path: str, frontmatter: Dict[str, Any], content: str) -> None:
+def write_frontmatter(file_path: str, frontmatter: Dict[str, Any], content: str,
+                      original: Optional[str] = None) -> None:
     """
     Write frontmatter and content back to a markdown file.
     
@@ -79,19 +251,29 @@ def write_frontmatter(file_path: str, frontmatter: Dict[str, Any], content: str)
         file_path: Path to markdown file
         frontmatter: Dictionary of frontmatter properties
         content: Body content (without frontmatter)
+        original: Full note text before the change. When given, only the
+            properties that changed are rewritten and the rest of the header
+            is kept as is, if the header allows it.
     """
-    # Convert frontmatter to YAML
-    yaml_str = yaml.dump(frontmatter, 
-                         default_flow_style=False, 
-                         allow_unicode=True,
-                         sort_keys=False)
-    
-    # Construct full content
-    full_content = f"---\n{yaml_str}---\n{content}"
+    full_content = None
+    match = FRONTMATTER_RE.match(original) if original is not None else None
+    if match and match.group(2) == content:
+        from frontmatter_edit import edit_note
+        full_content = edit_note(original, frontmatter)
+    
+    if full_content is None:
+        # Convert frontmatter to YAML
+        yaml_str = yaml.dump(frontmatter, 
+                             default_flow_style=False, 
+                             allow_unicode=True,
+                             sort_keys=False)
+        
+        # Construct full content
+        full_content = f"---\n{yaml_str}---\n{content}"
     
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(full_content)
+        # Temp file + rename, so a crash never leaves the note truncated
+        atomic_write(file_path, full_content)
     except Exception as e:
         raise IOError(f"Error writing file {file_path}: {e}")
 
@@ -102,25 +284,14 @@ def get_property_value(frontmatter: Optional[Dict[str, Any]], property_name: str
     
     Args:
         frontmatter: Frontmatter dictionary
-        property_name: Property name (supports dot notation for nested)
+        property_name: Property path: dot notation for nested properties,
+            [n] for list items, * and [*] for wildcards (see property_path.py)
         
     Returns:
-        Property value or None if not found
+        Property value or None if not found (for a wildcard path, the list
+        of selected values)
     """
-    if frontmatter is None:
-        return None
-    
-    # Handle nested properties (e.g., "metadata.author")
-    parts = property_name.split('.')
-    value = frontmatter
-    
-    for part in parts:
-        if isinstance(value, dict) and part in value:
-            value = value[part]
-        else:
-            return None
-    
-    return value
+    return compile_path(property_name).get(frontmatter)
 
 
 def set_property_value(frontmatter: Dict[str, Any], property_name: str, value: Any) -> Dict[str, Any]:
@@ -129,26 +300,14 @@ def set_property_value(frontmatter: Dict[str, Any], property_name: str, value: A
     
     Args:
         frontmatter: Frontmatter dictionary
-        property_name: Property name (supports dot notation for nested)
+        property_name: Property path (dot notation, [n] and wildcards; a
+            wildcard path sets every selected property)
         value: Value to set
         
     Returns:
         Updated frontmatter dictionary
     """
-    parts = property_name.split('.')
-    
-    if len(parts) == 1:
-        frontmatter[property_name] = value
-    else:
-        # Handle nested properties
-        current = frontmatter
-        for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-        current[parts[-1]] = value
-    
-    return frontmatter
+    return compile_path(property_name).set(frontmatter, value)
 
 
 def delete_property(frontmatter: Dict[str, Any], property_name: str) -> Dict[str, Any]:
@@ -157,27 +316,12 @@ def delete_property(frontmatter: Dict[str, Any], property_name: str) -> Dict[str
     
     Args:
         frontmatter: Frontmatter dictionary
-        property_name: Property name to delete
+        property_name: Property path to delete (dot notation, [n] and wildcards)
         
     Returns:
         Updated frontmatter dictionary
     """
-    parts = property_name.split('.')
-    
-    if len(parts) == 1:
-        if property_name in frontmatter:
-            del frontmatter[property_name]
-    else:
-        # Handle nested properties
-        current = frontmatter
-        for part in parts[:-1]:
-            if part not in current:
-                return frontmatter
-            current = current[part]
-        if parts[-1] in current:
-            del current[parts[-1]]
-    
-    return frontmatter
+    return compile_path(property_name).delete(frontmatter)
 
 
 def infer_property_type(value_str: str) -> Any:
@@ -227,13 +371,65 @@ def infer_property_type(value_str: str) -> Any:
     return value_str
 
 
+def _match_equals(value: Any, target: Any) -> bool:
+    return value == target
+
+
+def _match_contains(value: Any, target: Any) -> bool:
+    if isinstance(value, list):
+        return target in value
+    if isinstance(value, str):
+        return target in value
+    return False
+
+
+def _match_gt(value: Any, target: Any) -> bool:
+    try:
+        return value > target
+    except TypeError:
+        return False
+
+
+def _match_lt(value: Any, target: Any) -> bool:
+    try:
+        return value < target
+    except TypeError:
+        return False
+
+
+def _match_gte(value: Any, target: Any) -> bool:
+    try:
+        return value >= target
+    except TypeError:
+        return False
+
+
+def _match_lte(value: Any, target: Any) -> bool:
+    try:
+        return value <= target
+    except TypeError:
+        return False
+
+
+# Comparators for operators that need a present value; a missing property
+# (None) never matches them.
+VALUE_OPERATORS = {
+    'equals': _match_equals,
+    'contains': _match_contains,
+    'gt': _match_gt,
+    'lt': _match_lt,
+    'gte': _match_gte,
+    'lte': _match_lte,
+}
+
+
 def property_matches(value: Any, operator: str, target: Any) -> bool:
     """
     Check if a property value matches a condition.
     
     Args:
         value: Property value to check
-        operator: Comparison operator (exists, not-exists, equals, contains, gt, lt)
+        operator: Comparison operator (exists, not-exists, equals, contains, gt, lt, gte, lte)
         target: Target value to compare against
         
     Returns:
@@ -248,29 +444,10 @@ def property_matches(value: Any, operator: str, target: Any) -> bool:
     if value is None:
         return False
     
-    if operator == 'equals':
-        return value == target
-    
-    if operator == 'contains':
-        if isinstance(value, list):
-            return target in value
-        if isinstance(value, str):
-            return target in value
+    match = VALUE_OPERATORS.get(operator)
+    if match is None:
         return False
-    
-    if operator == 'gt':
-        try:
-            return value > target
-        except TypeError:
-            return False
-    
-    if operator == 'lt':
-        try:
-            return value < target
-        except TypeError:
-            return False
-    
-    return False
+    return match(value, target)
 
 
 def format_value(value: Any) -> str:
@@ -0,0 +1,179 @@
+"""
+Secondary value indexes over frontmatter properties.
+
+Each note's property values are posted to a table in the persistent
+frontmatter index. Every dotted property path is posted with a typed sort key:
+
+- scalars: one posting per value, used for equality and range lookups
+- list items: one posting per element, used for 'contains' membership
+- presence: one posting per present property, used for 'exists'
+
+SQLite's B-tree index on (prop, domain, item, key) serves as both the hash
+postings (equality) and the sorted arrays (ranges, by binary search).
+Candidate sets from several conditions are intersected or unioned following
+the query plan, so most notes are never decoded. Lookups return a superset
+of the true matches, and callers re-check each candidate with the compiled
+plan, so results match a full scan exactly.
+"""
+
+import sqlite3
+from datetime import date, datetime, timezone
+from typing import Any, Iterator, Optional, Set, Tuple
+
+from query import And, Condition, Node, Or
+from property_path import compile_path
+
+
+# Postings for values that could not be given a sort key (NaN, very large
+# integers, binary data). They are included in every equality and range
+# lookup on their property so nothing is missed.
+OTHER_DOMAIN = '_other'
+EXISTS_DOMAIN = '_exists'
+
+POSTINGS_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS postings ('
+    ' prop TEXT NOT NULL,'
+    ' domain TEXT NOT NULL,'
+    ' item INTEGER NOT NULL,'
+    ' key,'
+    ' path TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS postings_lookup ON postings (prop, domain, item, key)',
+    'CREATE INDEX IF NOT EXISTS postings_path ON postings (path)',
+)
+
+
+def sort_key(value: Any) -> Optional[Tuple[str, Any]]:
+    """
+    Map a scalar to (domain, key) so that Python equality and ordering within
+    a domain match SQLite's ordering of the keys.
+
+    Values of different domains never compare equal in Python, and ordering
+    across domains raises TypeError, which property_matches treats as no match.
+    Returns None for values without a safe key.
+    """
+    if isinstance(value, (bool, int)):
+        try:
+            return 'num', float(value)
+        except OverflowError:
+            return None
+    if isinstance(value, float):
+        return None if value != value else ('num', value)
+    if isinstance(value, str):
+        return 'str', value
+    if isinstance(value, datetime):
+        if value.tzinfo is not None and value.utcoffset() is not None:
+            return 'datetime_tz', value.astimezone(timezone.utc).isoformat()
+        return 'datetime', value.isoformat()
+    if isinstance(value, date):
+        return 'date', value.isoformat()
+    return None
+
+
+def iter_postings(frontmatter: Any, prefix: str = '') -> Iterator[Tuple[str, str, int, Any]]:
+    """
+    Yield (prop, domain, item, key) postings for every reachable property path.
+
+    Only paths that get_property_value can resolve are posted: string keys
+    without dots, nested through dictionaries.
+    """
+    if not isinstance(frontmatter, dict):
+        return
+
+    for name, value in frontmatter.items():
+        if not isinstance(name, str) or '.' in name or value is None:
+            continue
+        prop = prefix + name
+        yield prop, EXISTS_DOMAIN, 0, None
+
+        if isinstance(value, dict):
+            yield from iter_postings(value, prop + '.')
+            continue
+
+        if isinstance(value, list):
+            for element in value:
+                key = sort_key(element)
+                if key is not None:
+                    yield prop, key[0], 1, key[1]
+            continue
+
+        key = sort_key(value)
+        if key is None:
+            yield prop, OTHER_DOMAIN, 0, None
+        else:
+            yield prop, key[0], 0, key[1]
+
+
+def _paths(conn: sqlite3.Connection, sql: str, params: tuple) -> Set[str]:
+    return {row[0] for row in conn.execute(sql, params)}
+
+
+def _condition_candidates(conn: sqlite3.Connection, cond: Condition) -> Optional[Set[str]]:
+    prop, target = cond.prop, cond.target
+    if not compile_path(prop).plain:
+        # Only mapping-key paths are posted
+        return None
+
+    if cond.operator == 'exists':
+        return _paths(conn, 'SELECT path FROM postings WHERE prop = ? AND domain = ?',
+                      (prop, EXISTS_DOMAIN))
+
+    if cond.operator == 'contains':
+        if not isinstance(target, str):
+            return None
+        return _paths(
+            conn,
+            "SELECT path FROM postings WHERE prop = ? AND domain = 'str' AND item = 1 AND key = ? "
+            "UNION SELECT path FROM postings WHERE prop = ? AND domain = 'str' AND item = 0 "
+            "AND instr(key, ?) > 0",
+            (prop, target, prop, target))
+
+    comparisons = {'equals': '=', 'gt': '>=', 'gte': '>=', 'lt': '<=', 'lte': '<='}
+    if cond.operator not in comparisons:
+        return None
+    key = sort_key(target)
+    if key is None:
+        return None
+
+    # Non-strict bounds keep float rounding from dropping true matches;
+    # the plan re-check removes the extras.
+    op = comparisons[cond.operator]
+    return _paths(
+        conn,
+        f"SELECT path FROM postings WHERE prop = ? AND domain = ? AND item = 0 AND key {op} ? "
+        "UNION SELECT path FROM postings WHERE prop = ? AND domain = ?",
+        (prop, key[0], key[1], prop, OTHER_DOMAIN))
+
+
+def candidate_paths(conn: sqlite3.Connection, node: Node) -> Optional[Set[str]]:
+    """
+    Return relative paths of notes that may match a plan node.
+
+    Returns None when the node cannot be narrowed with the value indexes
+    (negations, missing-property checks, list or dict targets, paths with list
+    indexes or wildcards), meaning every note is a candidate.
+    """
+    if isinstance(node, Condition):
+        return _condition_candidates(conn, node)
+
+    if isinstance(node, And):
+        result = None
+        # Plan order puts the most selective checks first
+        for child in node.children:
+            paths = candidate_paths(conn, child)
+            if paths is None:
+                continue
+            result = paths if result is None else result & paths
+            if not result:
+                break
+        return result
+
+    if isinstance(node, Or):
+        result = set()
+        for child in node.children:
+            paths = candidate_paths(conn, child)
+            if paths is None:
+                return None
+            result |= paths
+        return result
+
+    return None
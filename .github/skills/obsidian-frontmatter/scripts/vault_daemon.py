@@ -0,0 +1,455 @@
+"""
+Watch-mode daemon that keeps a vault's frontmatter in memory.
+
+The daemon parses every note once, then follows changes: through inotify on
+Linux, or elsewhere by re-checking mtimes before each query and every
+--poll-interval seconds. frontmatter_search.py, frontmatter_list.py and
+analyze_tags.py ask it over a local Unix socket whenever it is running for
+their vault, and scan the vault themselves when it is not.
+
+Usage:
+    python vault_daemon.py <vault_path> [options]
+
+Examples:
+    # Serve a vault until interrupted
+    python vault_daemon.py "d:\\vault"
+
+    # Check whether a daemon is serving the vault
+    python vault_daemon.py "d:\\vault" --status
+
+    # Stop it
+    python vault_daemon.py "d:\\vault" --stop
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import signal
+import socket
+import stat
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from daemon_client import daemon_status, daemon_stop, decode_message, encode_message, socket_path
+from query import QueryPlan, node_from_dict
+from scan import CHUNK_SIZE, parse_files, project_keys, resolve_jobs
+from vault_walk import IGNORE_FILENAME, IgnoreRules, walk_markdown
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONTFOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR | IN_DONTFOLLOW)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Minimal inotify binding through ctypes; one watch per vault folder."""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # watch descriptor -> (relative prefix, depth)
+        self.folders: Dict[int, Tuple[str, int]] = {}
+
+    def add(self, path: str, prefix: str, depth: int) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Cannot watch {path}: {os.strerror(errno)}")
+        self.folders[wd] = (prefix, depth)
+
+    def remove_prefix(self, prefix: str) -> None:
+        """Stop watching a folder and everything below it."""
+        for wd, (folder, _) in list(self.folders.items()):
+            if folder.startswith(prefix):
+                self._libc.inotify_rm_watch(self.fd, wd)
+                del self.folders[wd]
+
+    def read(self) -> List[Tuple[Optional[Tuple[str, int]], int, str]]:
+        """Return pending events as (folder, mask, name) without blocking."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_IGNORED:
+                    self.folders.pop(wd, None)
+                    continue
+                events.append((self.folders.get(wd), mask, name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class VaultModel:
+    """
+    In-memory frontmatter of every note, kept current by events or polling.
+
+    Notes are stored by vault-relative path with the mtime and size they were
+    parsed at, so polling only re-parses notes whose stat changed.
+    """
+
+    def __init__(self, vault_path: str, jobs: int = 1, use_inotify: bool = True):
+        self.root = os.path.abspath(vault_path)
+        self.jobs = jobs
+        self.rules = None
+        self._rules_stat = None
+        # relative path -> (mtime_ns, size, frontmatter, error)
+        self.notes: Dict[str, Tuple[int, int, Any, Optional[str]]] = {}
+        self._order: Optional[List[str]] = None
+
+        self.watcher = None
+        if use_inotify:
+            try:
+                self.watcher = InotifyWatcher()
+            except OSError as e:
+                print(f"Warning: {e}; falling back to polling", file=sys.stderr)
+        self.resync()
+
+    @property
+    def mode(self) -> str:
+        return 'inotify' if self.watcher is not None else 'polling'
+
+    def ordered(self) -> List[str]:
+        """Relative paths in the order walk_markdown yields them."""
+        if self._order is None:
+            # Notes sort before subfolders of the same folder, each by name
+            self._order = sorted(self.notes, key=lambda rel: [(1, part) for part in rel.split('/')[:-1]]
+                                 + [(0, rel.rsplit('/', 1)[-1])])
+        return self._order
+
+    def _watch(self, path: str, prefix: str, depth: int) -> None:
+        if self.watcher is None:
+            return
+        try:
+            self.watcher.add(path, prefix, depth)
+        except OSError as e:
+            print(f"Warning: {e}; falling back to polling", file=sys.stderr)
+            self.watcher.close()
+            self.watcher = None
+
+    def _parse(self, entries: List[Tuple[str, os.stat_result]]) -> None:
+        """Parse notes given as (relative path, stat) and store them."""
+        paths = [os.path.join(self.root, *rel_path.split('/')) for rel_path, _ in entries]
+        # A pool only pays off for bulk changes, not single edits
+        jobs = self.jobs if len(paths) > CHUNK_SIZE else 1
+        for (rel_path, st), (_, frontmatter, error) in zip(entries, parse_files(paths, jobs=jobs)):
+            if rel_path not in self.notes:
+                self._order = None
+            self.notes[rel_path] = (st.st_mtime_ns, st.st_size, frontmatter,
+                                    str(error) if error is not None else None)
+
+    def _sync_entries(self, entries, prefix: str = '') -> None:
+        """Re-parse changed notes among walked entries and drop vanished ones under prefix."""
+        seen = set()
+        stale = []
+        for entry in entries:
+            rel_path = os.path.relpath(entry.path, self.root).replace(os.sep, '/')
+            seen.add(rel_path)
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            note = self.notes.get(rel_path)
+            if note is None or note[0] != st.st_mtime_ns or note[1] != st.st_size:
+                stale.append((rel_path, st))
+        self._parse(stale)
+        for rel_path in [rel for rel in self.notes if rel.startswith(prefix) and rel not in seen]:
+            del self.notes[rel_path]
+            self._order = None
+
+    def _load_rules(self) -> bool:
+        """(Re)load .vaultignore if it changed; return True if it was loaded."""
+        try:
+            st = os.stat(os.path.join(self.root, IGNORE_FILENAME))
+            rules_stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            rules_stat = None
+        if self.rules is not None and rules_stat == self._rules_stat:
+            return False
+        self.rules = IgnoreRules.load(self.root)
+        self._rules_stat = rules_stat
+        return True
+
+    def resync(self) -> None:
+        """Walk the whole vault, re-parsing notes whose stat changed."""
+        if self._load_rules() and self.watcher is not None:
+            # The rules may have changed which folders are watched
+            self.watcher.remove_prefix('')
+        self._sync_entries(list(walk_markdown(self.root, rules=self.rules, on_folder=self._watch)))
+
+    def _add_folder(self, rel_folder: str, depth: int) -> None:
+        name = rel_folder.rsplit('/', 1)[-1]
+        if self.rules.max_depth is not None and depth > self.rules.max_depth:
+            return
+        if self.rules.ignores(name, rel_folder, True):
+            return
+        entries = list(walk_markdown(self.root, rules=self.rules, on_folder=self._watch, folder=rel_folder))
+        self._sync_entries(entries, prefix=rel_folder + '/')
+
+    def _drop_folder(self, rel_folder: str) -> None:
+        prefix = rel_folder + '/'
+        if self.watcher is not None:
+            self.watcher.remove_prefix(prefix)
+        for rel_path in [rel for rel in self.notes if rel.startswith(prefix)]:
+            del self.notes[rel_path]
+            self._order = None
+
+    def _update_note(self, rel_path: str) -> None:
+        name = rel_path.rsplit('/', 1)[-1]
+        st = None
+        if not self.rules.ignores(name, rel_path, False):
+            try:
+                st = os.stat(os.path.join(self.root, *rel_path.split('/')))
+            except OSError:
+                pass
+        if st is None or not stat.S_ISREG(st.st_mode):
+            if self.notes.pop(rel_path, None) is not None:
+                self._order = None
+            return
+        note = self.notes.get(rel_path)
+        if note is None or note[0] != st.st_mtime_ns or note[1] != st.st_size:
+            self._parse([(rel_path, st)])
+
+    def apply_events(self) -> None:
+        """Apply pending inotify events."""
+        if self.watcher is None:
+            return
+        for folder, mask, name in self.watcher.read():
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost; rebuild from a full walk
+                self.resync()
+                return
+            if folder is None or not name:
+                continue
+            prefix, depth = folder
+            rel_path = prefix + name
+            if mask & IN_ISDIR:
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._drop_folder(rel_path)
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_folder(rel_path, depth + 1)
+            elif not prefix and name == IGNORE_FILENAME:
+                self.resync()
+                return
+            elif name.endswith('.md'):
+                self._update_note(rel_path)
+            if self.watcher is None:
+                # Watch limit reached while adding folders; poll from now on
+                self.resync()
+                return
+
+    def refresh(self) -> None:
+        """Bring the model up to date before answering a query."""
+        if self.watcher is not None:
+            self.apply_events()
+        else:
+            self.resync()
+
+
+class VaultDaemon:
+    """Answers scan requests for one vault over a Unix socket."""
+
+    def __init__(self, model: VaultModel, poll_interval: float = 2.0):
+        self.model = model
+        self.poll_interval = poll_interval
+        self.path = socket_path(model.root)
+        self.running = False
+
+    def _respond(self, conn: socket.socket) -> None:
+        conn.settimeout(5.0)
+        reader = conn.makefile('rb')
+        writer = conn.makefile('wb')
+        try:
+            request = decode_message(reader.readline())
+            if not isinstance(request, dict) or request.get('vault') != os.path.realpath(self.model.root):
+                writer.write(encode_message({'ok': False, 'error': 'wrong vault'}))
+                return
+
+            op = request.get('op')
+            if op == 'stop':
+                self.running = False
+                writer.write(encode_message({'ok': True}))
+                return
+
+            self.model.refresh()
+            header = {'ok': True, 'vault': self.model.root, 'notes': len(self.model.notes),
+                      'mode': self.model.mode, 'pid': os.getpid()}
+            if op == 'status':
+                writer.write(encode_message(header))
+                return
+            if op not in ('scan', 'files'):
+                writer.write(encode_message({'ok': False, 'error': f'unknown op {op!r}'}))
+                return
+
+            # Responses may be long; give slow readers more time
+            conn.settimeout(60.0)
+            writer.write(encode_message(header))
+            if op == 'files':
+                for rel_path in self.model.ordered():
+                    writer.write(encode_message(rel_path))
+            else:
+                self._write_scan(writer, request)
+            writer.write(encode_message({'done': True}))
+        except (OSError, ValueError):
+            # Client went away or sent garbage; nothing to answer
+            pass
+        finally:
+            try:
+                writer.close()
+            except OSError:
+                pass
+            reader.close()
+
+    def _write_scan(self, writer, request: Dict[str, Any]) -> None:
+        keys = frozenset(request['keys']) if request.get('keys') is not None else None
+        plan = QueryPlan(node_from_dict(request['plan'])) if request.get('plan') else None
+
+        for rel_path in self.model.ordered():
+            _, _, frontmatter, error = self.model.notes[rel_path]
+            if error is not None:
+                writer.write(encode_message([rel_path, None, error, False]))
+                continue
+            if plan is not None:
+                try:
+                    if not plan.matches(frontmatter):
+                        continue
+                except Exception:
+                    # Let the client evaluate it and report the error
+                    pass
+            try:
+                line = encode_message([rel_path, project_keys(frontmatter, keys), None, False])
+            except TypeError:
+                # Values JSON cannot carry exactly; the client reads the note itself
+                line = encode_message([rel_path, None, None, True])
+            writer.write(line)
+
+    def serve(self) -> None:
+        """Accept requests until stopped."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)   # stale socket; callers checked no daemon answers
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+
+        self.running = True
+        try:
+            while self.running:
+                readable = [server]
+                if self.model.watcher is not None:
+                    readable.append(self.model.watcher.fd)
+                timeout = None if self.model.watcher is not None else self.poll_interval
+                ready, _, _ = select.select(readable, [], [], timeout)
+
+                if not ready:
+                    self.model.resync()
+                    continue
+                if self.model.watcher is not None and self.model.watcher.fd in ready:
+                    self.model.apply_events()
+                if server in ready:
+                    conn, _ = server.accept()
+                    with conn:
+                        self._respond(conn)
+        finally:
+            server.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Keep a vault\'s frontmatter in memory and answer queries over a Unix socket',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+
+    parser.add_argument('vault_path', help='Path to Obsidian vault')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='Parse notes in N worker processes (0 = all CPUs, default: 1)')
+    parser.add_argument('--poll-interval', type=float, default=2.0, metavar='SECONDS',
+                        help='Seconds between mtime checks when inotify is unavailable (default: 2)')
+    parser.add_argument('--no-inotify', action='store_true',
+                        help='Poll mtimes even where inotify is available')
+    parser.add_argument('--status', action='store_true',
+                        help='Report whether a daemon is serving the vault')
+    parser.add_argument('--stop', action='store_true',
+                        help='Stop the daemon serving the vault')
+
+    args = parser.parse_args()
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Error: Unix sockets are not available on this platform", file=sys.stderr)
+        sys.exit(2)
+
+    if args.status:
+        status = daemon_status(args.vault_path)
+        if status is None:
+            print("No daemon is running for this vault.")
+            sys.exit(1)
+        print(json.dumps(status, indent=2, ensure_ascii=False))
+        sys.exit(0)
+
+    if args.stop:
+        if not daemon_stop(args.vault_path):
+            print("No daemon is running for this vault.")
+            sys.exit(1)
+        print("Daemon stopped.")
+        sys.exit(0)
+
+    if daemon_status(args.vault_path) is not None:
+        print("Error: A daemon is already running for this vault", file=sys.stderr)
+        sys.exit(2)
+
+    # Exit cleanly (removing the socket) on SIGTERM as well as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        model = VaultModel(args.vault_path, jobs=resolve_jobs(args.jobs),
+                           use_inotify=not args.no_inotify)
+        print(f"Serving {len(model.notes)} notes from {model.root} ({model.mode})", file=sys.stderr)
+        VaultDaemon(model, poll_interval=args.poll_interval).serve()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Vault traversal shared by the frontmatter and toolkit scripts.
+
+Walks the vault with os.scandir, pruning ignored folders before descending
+into them, and yields the DirEntry of every markdown note so callers can
+reuse its cached stat instead of calling os.stat again.
+
+Hidden folders (.obsidian, .trash, .git, ...) are always skipped. A vault can
+add its own rules in a `.vaultignore` file at its root:
+
+    # Comments and blank lines are ignored
+    Attachments/          # a trailing slash matches folders only
+    *.excalidraw.md       # patterns without a slash match names at any depth
+    Archive/2019/*        # patterns with a slash match the vault-relative path
+    @max-depth 3          # notes at most 3 folders below the vault root
+
+Patterns use fnmatch syntax ('*' also matches across '/').
+"""
+
+import fnmatch
+import os
+import re
+import sys
+from typing import Callable, Iterator, List, Optional, Pattern, Tuple
+
+IGNORE_FILENAME = '.vaultignore'
+
+
+def _compile(patterns: List[str]) -> Optional[Pattern]:
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+class IgnoreRules:
+    """Compiled ignore rules for one vault."""
+
+    def __init__(self, lines: Optional[List[str]] = None, source: str = IGNORE_FILENAME):
+        self.max_depth = None
+        names = ([], [])   # (any entry, folders only), matched against the name
+        paths = ([], [])   # (any entry, folders only), matched against the relative path
+
+        for number, line in enumerate(lines or [], 1):
+            line = line.split(' #', 1)[0].strip()
+            if not line or line.startswith('#'):
+                continue
+
+            if line.startswith('@'):
+                directive, _, value = line.partition(' ')
+                if directive == '@max-depth' and value.strip().isdigit():
+                    self.max_depth = int(value)
+                else:
+                    print(f"Warning: Ignoring unknown directive in {source}:{number}: {line}",
+                          file=sys.stderr)
+                continue
+
+            dir_only = line.endswith('/')
+            pattern = line.strip('/')
+            if not pattern:
+                continue
+            target = paths if '/' in pattern else names
+            target[1 if dir_only else 0].append(pattern)
+
+        self._name_re = _compile(names[0])
+        self._dir_name_re = _compile(names[0] + names[1])
+        self._path_re = _compile(paths[0])
+        self._dir_path_re = _compile(paths[0] + paths[1])
+
+    @classmethod
+    def load(cls, vault_path: str) -> 'IgnoreRules':
+        """Read the vault's ignore file; a vault without one gets the defaults."""
+        ignore_path = os.path.join(vault_path, IGNORE_FILENAME)
+        try:
+            with open(ignore_path, 'r', encoding='utf-8') as f:
+                return cls(f.read().splitlines(), source=ignore_path)
+        except FileNotFoundError:
+            return cls()
+
+    def ignores(self, name: str, rel_path: str, is_dir: bool) -> bool:
+        """Return True if an entry is excluded by the rules."""
+        if is_dir and name.startswith('.'):
+            return True
+        name_re, path_re = (self._dir_name_re, self._dir_path_re) if is_dir else (self._name_re, self._path_re)
+        if name_re is not None and name_re.match(os.path.normcase(name)):
+            return True
+        return path_re is not None and bool(path_re.match(os.path.normcase(rel_path)))
+
+
+def walk_markdown(vault_path: str, rules: Optional[IgnoreRules] = None,
+                  on_folder: Optional[Callable[[str, str, int], None]] = None,
+                  folder: Optional[str] = None) -> Iterator[os.DirEntry]:
+    """
+    Lazily yield a DirEntry for every markdown note in the vault.
+
+    Notes in each folder come first, in name order, followed by its subfolders
+    in name order, so output is the same on every platform.
+
+    Args:
+        vault_path: Path to Obsidian vault
+        rules: Ignore rules; defaults to the vault's .vaultignore
+        on_folder: Called with (path, relative prefix, depth) for every folder
+            visited, before it is listed
+        folder: Vault-relative folder ('Projects/2024') to walk instead of
+            the whole vault; the caller checks that it is not ignored
+
+    Yields:
+        os.DirEntry objects whose .path is absolute
+    """
+    root = os.path.abspath(vault_path)
+    if not os.path.isdir(root):
+        raise ValueError(f"Vault path does not exist: {vault_path}")
+    if rules is None:
+        rules = IgnoreRules.load(root)
+
+    # Stack of (directory, relative path prefix, depth)
+    stack: List[Tuple[str, str, int]] = [(root, '', 0)]
+    if folder:
+        parts = folder.strip('/').split('/')
+        stack = [(os.path.join(root, *parts), '/'.join(parts) + '/', len(parts))]
+
+    while stack:
+        directory, prefix, depth = stack.pop()
+        if on_folder is not None:
+            on_folder(directory, prefix, depth)
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"Warning: Skipping folder {directory}: {e}", file=sys.stderr)
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if rules.max_depth is None or depth < rules.max_depth:
+                        if not rules.ignores(entry.name, rel_path, True):
+                            subdirs.append((entry.path, rel_path + '/', depth + 1))
+                    continue
+                if not entry.name.endswith('.md') or not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if not rules.ignores(entry.name, rel_path, False):
+                yield entry
+
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,214 @@
+"""
+YAML parser backends for frontmatter parsing.
+
+Frontmatter is parsed by the fastest backend that gives the same result as
+yaml.safe_load:
+
+- fast: hand-written parser for the common Obsidian subset (flat keys with
+  plain or quoted scalars, block and flow lists of scalars, ISO dates). It
+  gives up on anything it cannot prove it handles exactly.
+- libyaml: PyYAML's C-accelerated CSafeLoader, when PyYAML was built with it.
+- pyyaml: pure-Python yaml.SafeLoader, the reference behaviour.
+"""
+
+import re
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    CSafeLoader = None
+
+
+BACKENDS = ('auto', 'fast', 'libyaml', 'pyyaml')
+
+_resolver = yaml.resolver.Resolver()
+_STR_TAG = 'tag:yaml.org,2002:str'
+_INT_TAG = 'tag:yaml.org,2002:int'
+_FLOAT_TAG = 'tag:yaml.org,2002:float'
+_BOOL_TAG = 'tag:yaml.org,2002:bool'
+_NULL_TAG = 'tag:yaml.org,2002:null'
+_TIMESTAMP_TAG = 'tag:yaml.org,2002:timestamp'
+
+_SIMPLE_INT_RE = re.compile(r'-?(?:0|[1-9][0-9]*)')
+_SIMPLE_FLOAT_RE = re.compile(r'-?(?:0|[1-9][0-9]*)\.[0-9]+')
+_DATE_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+_DATETIME_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})')
+_KEY_LINE_RE = re.compile(r'([^\s:][^:]*):(?: +(.*))?')
+_LIST_ITEM_RE = re.compile(r'( *)- +(.*)')
+
+# Characters that start a YAML construct the fast path does not parse
+_INDICATORS = frozenset('-?:,[]{}#&*!|>\'"%@`')
+# Characters that YAML treats specially (line breaks, BOM, tabs) or rejects
+_UNSAFE_RE = re.compile('[\t\r\x85\u2028\u2029\ufeff]')
+
+
+class FastPathUnsupported(Exception):
+    """Raised when the fast parser cannot guarantee safe_load's result."""
+
+
+def _plain_scalar(text: str, flow: bool = False) -> Any:
+    """Resolve a plain scalar exactly as PyYAML's SafeLoader would."""
+    if not text:
+        raise FastPathUnsupported('empty scalar')
+    first = text[0]
+    if first in _INDICATORS and not (first == '-' and len(text) > 1 and text[1] not in ' -'):
+        raise FastPathUnsupported('indicator')
+    if text.endswith(':') or ': ' in text or ' #' in text:
+        raise FastPathUnsupported('mapping or comment inside scalar')
+    if flow and any(ch in text for ch in ':#\'"'):
+        raise FastPathUnsupported('ambiguous flow scalar')
+
+    tag = _resolver.resolve(yaml.ScalarNode, text, (True, False))
+    if tag == _STR_TAG:
+        return text
+    if tag == _INT_TAG and _SIMPLE_INT_RE.fullmatch(text):
+        return int(text)
+    if tag == _FLOAT_TAG and _SIMPLE_FLOAT_RE.fullmatch(text):
+        return float(text)
+    if tag == _BOOL_TAG:
+        return text.lower() in ('yes', 'true', 'on')
+    if tag == _NULL_TAG:
+        return None
+    if tag == _TIMESTAMP_TAG:
+        try:
+            match = _DATE_RE.fullmatch(text)
+            if match:
+                return date(*(int(part) for part in match.groups()))
+            match = _DATETIME_RE.fullmatch(text)
+            if match:
+                return datetime(*(int(part) for part in match.groups()))
+        except ValueError:
+            pass
+    raise FastPathUnsupported(f'unsupported scalar: {text!r}')
+
+
+def _scalar(text: str) -> Any:
+    """Resolve a block-context scalar: quoted without escapes, or plain."""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in '\'"':
+        inner = text[1:-1]
+        if '\'' in inner or '"' in inner or '\\' in inner:
+            raise FastPathUnsupported('quoted scalar with escapes')
+        return inner
+    return _plain_scalar(text)
+
+
+def _flow_list(text: str) -> List[Any]:
+    inner = text[1:-1]
+    if any(ch in inner for ch in '[]{}'):
+        raise FastPathUnsupported('nested flow collection')
+    if not inner.strip():
+        return []
+    return [_plain_scalar(item.strip(), flow=True) for item in inner.split(',')]
+
+
+def fast_load(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse the common Obsidian frontmatter subset without PyYAML's parser.
+
+    Handles top-level `key: value` lines whose values are plain or quoted
+    scalars, flow lists of plain scalars, or block lists of scalars, plus
+    comment and blank lines.
+
+    Raises:
+        FastPathUnsupported: If the text uses anything outside that subset
+    """
+    if _UNSAFE_RE.search(text) or yaml.reader.Reader.NON_PRINTABLE.search(text):
+        raise FastPathUnsupported('special characters')
+
+    result: Dict[str, Any] = {}
+    current_list: Optional[List[Any]] = None
+    list_indent = None
+    pending_key = None
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+
+        item = _LIST_ITEM_RE.fullmatch(line.rstrip(' '))
+        if item and pending_key is not None:
+            indent = len(item.group(1))
+            if current_list is None:
+                current_list, list_indent = [], indent
+                result[pending_key] = current_list
+            elif indent != list_indent:
+                raise FastPathUnsupported('inconsistent list indentation')
+            current_list.append(_scalar(item.group(2)))
+            continue
+
+        if line[0] == ' ' or line.startswith(('---', '...')):
+            raise FastPathUnsupported('nested or multi-document content')
+
+        match = _KEY_LINE_RE.fullmatch(line.rstrip(' '))
+        if not match:
+            raise FastPathUnsupported(f'unrecognised line: {line!r}')
+        key, value = match.group(1), match.group(2)
+        if key != key.rstrip() or key[0] in _INDICATORS or ' #' in key:
+            raise FastPathUnsupported('complex key')
+        if _resolver.resolve(yaml.ScalarNode, key, (True, False)) != _STR_TAG:
+            raise FastPathUnsupported('non-string key')
+
+        current_list, list_indent, pending_key = None, None, None
+        if value is None or not value.strip():
+            # Either null or the start of a block list on the following lines
+            result[key] = None
+            pending_key = key
+        elif value.startswith('[') and value.endswith(']'):
+            result[key] = _flow_list(value)
+        else:
+            result[key] = _scalar(value)
+
+    if not result:
+        # Comments or blank text only; safe_load returns None for these
+        return None
+    return result
+
+
+def _load_pyyaml(text: str) -> Any:
+    return yaml.load(text, Loader=yaml.SafeLoader)
+
+
+def _load_libyaml(text: str) -> Any:
+    if CSafeLoader is None:
+        return _load_pyyaml(text)
+    try:
+        return yaml.load(text, Loader=CSafeLoader)
+    except yaml.YAMLError:
+        # Re-parse with the reference loader so errors, and the rare inputs
+        # libyaml rejects but PyYAML accepts, behave exactly like safe_load.
+        return _load_pyyaml(text)
+
+
+def load_yaml(text: str, backend: str = 'auto') -> Any:
+    """
+    Parse YAML text with the same result as yaml.safe_load.
+
+    Args:
+        text: YAML document
+        backend: 'auto' (fast path, then libyaml, then pure PyYAML), 'fast'
+            (fast path with pure PyYAML fallback), 'libyaml' or 'pyyaml'
+
+    Returns:
+        Parsed YAML value
+
+    Raises:
+        yaml.YAMLError: If the text is not valid YAML
+    """
+    if backend == 'pyyaml':
+        return _load_pyyaml(text)
+    if backend == 'libyaml':
+        return _load_libyaml(text)
+    if backend not in ('auto', 'fast'):
+        raise ValueError(f"Unknown YAML backend: {backend}")
+
+    try:
+        return fast_load(text)
+    except FastPathUnsupported:
+        pass
+    if backend == 'fast':
+        return _load_pyyaml(text)
+    return _load_libyaml(text)
@@ -1,8 +1,9 @@
 import argparse
+import math
 import os
 import sys
-import re
 from collections import defaultdict, Counter
+from itertools import islice
 from difflib import SequenceMatcher
 
 try:
@@ -11,6 +12,14 @@ except ImportError:
     print("Error: PyYAML is required. Install with: pip install PyYAML")
     sys.exit(1)
 
+import frontmatter_lib  # noqa: F401  (makes the obsidian-frontmatter helpers importable)
+from daemon_client import daemon_files
+from scan import CHUNK_SIZE, map_chunks, resolve_jobs
+from vault_walk import walk_markdown
+from tag_cache import TagCache
+from tag_scanner import extract_inline_tags
+from yaml_backend import load_yaml
+
 
 def extract_frontmatter_tags(content):
     """Extract tags from YAML frontmatter."""
@@ -28,7 +37,7 @@ def extract_frontmatter_tags(content):
     frontmatter = parts[1]
     
     try:
-        metadata = yaml.safe_load(frontmatter)
+        metadata = load_yaml(frontmatter)
         if metadata and 'tags' in metadata:
             tag_data = metadata['tags']
             if isinstance(tag_data, list):
@@ -41,71 +50,121 @@ def extract_frontmatter_tags(content):
     return tags
 
 
-def extract_inline_tags(content):
-    """Extract inline tags (#tag format) from markdown content."""
-    # Remove code blocks to avoid false positives
-    content = re.sub(r'```.*?```', '', content, flags=re.DOTALL)
-    content = re.sub(r'`[^`]+`', '', content)
-    
-    # Find all #tags (allowing letters, numbers, underscores, hyphens, slashes)
-    # Tags must start with a letter
-    pattern = r'#([a-zA-Z][a-zA-Z0-9_\-/]*)'
-    tags = re.findall(pattern, content)
-    
-    return tags
+def extract_note_tags(content):
+    """Return (frontmatter tags, inline tags) of a note's text."""
+    return extract_frontmatter_tags(content), extract_inline_tags(content)
 
 
-def scan_vault(vault_path, verbose=False):
-    """Scan all markdown files in the vault and extract tags."""
-    tag_frequency = Counter()
-    tag_files = defaultdict(list)  # tag -> list of files using it
-    total_files = 0
-    files_with_tags = 0
-    
+def read_note_tags(note_paths):
+    """Read and extract the tags of each note.
+    
+    Yields (file_path, frontmatter_tags, inline_tags, error) like
+    TagCache.refresh, with the tags None when the note could not be read.
+    """
+    for note_path in note_paths:
+        full_path = os.fspath(note_path)
+        try:
+            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+            frontmatter_tags, inline_tags = extract_note_tags(content)
+        except Exception as e:
+            yield full_path, None, None, str(e)
+            continue
+        yield full_path, frontmatter_tags, inline_tags, None
+
+
+def tally_notes(records, vault_path, verbose=False):
+    """Aggregate the tags of a batch of notes.
+    
+    Takes (file_path, frontmatter_tags, inline_tags, error) records and
+    returns scan_vault's result for just these notes, plus 'log': the
+    verbose lines for them as (is_warning, message), in note order.
+    """
+    tally = {
+        'tag_frequency': Counter(),
+        'tag_files': defaultdict(list),  # tag -> list of files using it
+        'total_files': 0,
+        'files_with_tags': 0,
+        'log': [],
+    }
+    for full_path, frontmatter_tags, inline_tags, error in records:
+        tally['total_files'] += 1
+        rel_path = os.path.relpath(full_path, vault_path)
+        
+        if error is not None:
+            if verbose:
+                tally['log'].append((True, f"Warning: Could not read {rel_path}: {error}"))
+            continue
+        
+        all_tags = frontmatter_tags + inline_tags
+        if all_tags:
+            tally['files_with_tags'] += 1
+        
+        # Update statistics
+        for tag in all_tags:
+            tally['tag_frequency'][tag] += 1
+            tally['tag_files'][tag].append(rel_path)
+        
+        if verbose and all_tags:
+            tally['log'].append((False, f"  {rel_path}: {', '.join(all_tags)}"))
+    return tally
+
+
+def merge_tally(total, part):
+    """Add the tally of the next batch of notes to total and print its log.
+    
+    Merging batches in note order gives the same counts, file lists and
+    tag order as tallying all the notes at once.
+    """
+    total['tag_frequency'].update(part['tag_frequency'])
+    for tag, files in part['tag_files'].items():
+        total['tag_files'][tag].extend(files)
+    total['total_files'] += part['total_files']
+    total['files_with_tags'] += part['files_with_tags']
+    for is_warning, message in part['log']:
+        print(message, file=sys.stderr if is_warning else sys.stdout)
+
+
+def _scan_chunk(chunk, vault_path, verbose):
+    """Worker entry point: read a chunk of notes and return its tally."""
+    return [tally_notes(read_note_tags(chunk), vault_path, verbose)]
+
+
+def scan_vault(vault_path, verbose=False, use_daemon=False, use_cache=False, verify_cache=False,
+               jobs=1):
+    """Scan all markdown files in the vault and extract tags.
+    
+    With use_daemon, the note list comes from the vault daemon when one is
+    running, which skips walking the vault. With use_cache, each note's tags
+    are kept in the tag cache (see tag_cache.py) and only notes that changed
+    since the last cached run are read again; verify_cache reads and hashes
+    every note to catch edits that kept the mtime and size.
+    
+    With jobs > 1, notes are read in that many worker processes. Each
+    returns the tally of a chunk of notes, and the tallies are merged in
+    walk order, so the result is the same as a serial scan.
+    """
     if not os.path.exists(vault_path):
         print(f"Error: Vault path '{vault_path}' does not exist.")
         sys.exit(1)
     
-    for root, dirs, files in os.walk(vault_path):
-        # Skip hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        
-        for file in files:
-            if file.endswith('.md'):
-                total_files += 1
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, vault_path)
-                
-                try:
-                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                    
-                    # Extract tags
-                    frontmatter_tags = extract_frontmatter_tags(content)
-                    inline_tags = extract_inline_tags(content)
-                    all_tags = frontmatter_tags + inline_tags
-                    
-                    if all_tags:
-                        files_with_tags += 1
-                    
-                    # Update statistics
-                    for tag in all_tags:
-                        tag_frequency[tag] += 1
-                        tag_files[tag].append(rel_path)
-                    
-                    if verbose and all_tags:
-                        print(f"  {rel_path}: {', '.join(all_tags)}")
-                        
-                except Exception as e:
-                    if verbose:
-                        print(f"Warning: Could not read {rel_path}: {e}", file=sys.stderr)
-    
-    return {
-        'tag_frequency': tag_frequency,
-        'tag_files': tag_files,
-        'total_files': total_files,
-        'files_with_tags': files_with_tags
-    }
+    note_paths = daemon_files(vault_path) if use_daemon else None
+    if note_paths is None:
+        note_paths = walk_markdown(vault_path)
+    
+    result = tally_notes([], vault_path)
+    if use_cache:
+        with TagCache(vault_path) as cache:
+            records = cache.refresh(note_paths, extract_note_tags, verify=verify_cache, jobs=jobs)
+            for batch in iter(lambda: list(islice(records, CHUNK_SIZE)), []):
+                merge_tally(result, tally_notes(batch, vault_path, verbose))
+    else:
+        file_paths = (os.fspath(note_path) for note_path in note_paths)
+        for part in map_chunks(_scan_chunk, file_paths, jobs, vault_path, verbose):
+            merge_tally(result, part)
+    
+    del result['log']
+    return result
 
 
 def analyze_tag_hierarchy(tags):
@@ -122,24 +181,87 @@ def analyze_tag_hierarchy(tags):
     return hierarchy
 
 
+def _char_tokens(text):
+    """Characters of text as a set, numbering repeats: 'aba' -> a#0, b#0, a#1."""
+    seen = Counter()
+    tokens = []
+    for char in text:
+        tokens.append((char, seen[char]))
+        seen[char] += 1
+    return tokens
+
+
+def _prefix_index(names, threshold):
+    """Index names by the rarest few of their characters (prefix filtering).
+    
+    A SequenceMatcher ratio is 2 * matches / (len(a) + len(b)), and every match
+    is a shared character, so a pair at threshold t shares at least
+    t * (len(a) + len(b)) / 2 characters. With each name's characters ordered
+    rarest first, two names sharing that many also share one of their first
+    len - overlap + 1 characters. Probing the index with a name's prefix
+    therefore finds every name it could reach the threshold with.
+    
+    Returns (prefixes, index): each name's prefix tokens, and token -> indexes
+    of the names whose prefix holds it.
+    """
+    tokens = [_char_tokens(name) or [("", 0)] for name in names]  # empty names share a token
+    rarity = Counter(token for record in tokens for token in record)
+    
+    prefixes = []
+    index = defaultdict(list)
+    for i, record in enumerate(tokens):
+        record.sort(key=lambda token: (rarity[token], token))
+        length = len(names[i])
+        # Fewest characters shared with any partner, which is at least
+        # threshold / (2 - threshold) times as long
+        min_overlap = max(1, math.ceil(threshold * length / (2 - threshold) - 1e-9))
+        prefix = record[:max(length - min_overlap + 1, 1)]
+        prefixes.append(prefix)
+        for token in prefix:
+            index[token].append(i)
+    return prefixes, index
+
+
 def find_similar_tags(tags, threshold=0.8):
-    """Find tags with similar names that might be duplicates."""
-    similar_groups = []
+    """Find tags with similar names that might be duplicates.
+    
+    Each tag, in order, collects every later tag not yet grouped whose
+    SequenceMatcher ratio with it reaches threshold. Instead of comparing
+    all pairs, only tags sharing a prefix character (see _prefix_index)
+    and passing the length and character-count bounds are scored.
+    """
     tags_list = list(tags)
+    names = [tag.lower() for tag in tags_list]
+    if threshold > 0:
+        prefixes, index = _prefix_index(names, threshold)
+    
+    matcher = SequenceMatcher(None)
+    similar_groups = []
     checked = set()
     
     for i, tag1 in enumerate(tags_list):
         if tag1 in checked:
             continue
         
+        if threshold > 0:
+            candidates = sorted({j for token in prefixes[i] for j in index[token] if j > i})
+        else:
+            candidates = range(i + 1, len(tags_list))
+        
         similar = [tag1]
-        for tag2 in tags_list[i+1:]:
+        a = names[i]
+        for j in candidates:
+            tag2 = tags_list[j]
             if tag2 in checked:
                 continue
             
-            # Compare similarity
-            ratio = SequenceMatcher(None, tag1.lower(), tag2.lower()).ratio()
-            if ratio >= threshold:
+            b = names[j]
+            # Upper bounds on the ratio before the full comparison
+            if a or b:
+                if 2 * min(len(a), len(b)) / (len(a) + len(b)) < threshold:
+                    continue
+            matcher.set_seqs(a, b)
+            if matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold:
                 similar.append(tag2)
                 checked.add(tag2)
         
@@ -238,13 +360,22 @@ if __name__ == "__main__":
     parser.add_argument("--vault", required=True, help="Path to the Obsidian vault root")
     parser.add_argument("--output", help="Output file for the report (default: print to stdout)")
     parser.add_argument("--verbose", action="store_true", help="Show detailed progress")
+    parser.add_argument("--no-daemon", action="store_true", help="Walk the vault even if a vault daemon is running")
+    parser.add_argument("--cache", action="store_true",
+                        help="Keep each note's tags in <vault>/.obsidian/tag-analysis.sqlite and only re-read changed notes")
+    parser.add_argument("--verify-cache", action="store_true",
+                        help="With --cache, read and hash every note to catch edits that kept mtime and size")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="Read notes in N worker processes (0 = all CPUs, default: 1)")
     
     args = parser.parse_args()
     
     if args.verbose:
         print(f"Scanning vault: {args.vault}")
     
-    analysis = scan_vault(args.vault, verbose=args.verbose)
+    analysis = scan_vault(args.vault, verbose=args.verbose, use_daemon=not args.no_daemon,
+                          use_cache=args.cache, verify_cache=args.verify_cache,
+                          jobs=resolve_jobs(args.jobs))
     
     if args.verbose:
         print(f"\nFound {len(analysis['tag_frequency'])} unique tags in {analysis['files_with_tags']} files")
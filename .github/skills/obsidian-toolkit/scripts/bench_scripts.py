@@ -0,0 +1,213 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import frontmatter_lib  # noqa: F401  (makes the obsidian-frontmatter helpers importable)
+from frontmatter_list import list_property_values
+from frontmatter_search import search_notes as frontmatter_search_notes
+from synth_vault import MANIFEST_FILENAME, SHAPES, generate_vault
+from utils import find_markdown_files, parse_frontmatter
+
+import analyze_tags
+import search_notes
+from fix_tags import TagFixer, strip_hash_prefix, tag_remover
+
+BENCHMARKS = [
+    "parse_frontmatter",
+    "search_notes",
+    "list_property_values",
+    "scan_vault",
+    "find_similar_tags",
+    "tag_fixer",
+    "toolkit_search_notes",
+]
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def prepare_vault(workdir, notes, options):
+    """Return a synthetic vault with the given options, reusing a matching one."""
+    vault = os.path.join(workdir, f"vault-{notes}-{options['shape']}-{options['seed']}")
+    manifest_path = os.path.join(vault, MANIFEST_FILENAME)
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        wanted = dict(options, notes=notes)
+        if all(manifest.get(key) == value for key, value in wanted.items()):
+            return vault
+        # Only ever delete folders this script generated
+        shutil.rmtree(vault)
+    elif os.path.exists(vault):
+        print(f"Error: {vault} exists but is not a generated vault.")
+        sys.exit(1)
+
+    print(f"Generating {notes} notes in {vault} ...", file=sys.stderr)
+    generate_vault(vault, notes=notes, **options)
+    return vault
+
+
+def make_benchmarks(vault):
+    """Return benchmark name -> zero-argument callable for one vault."""
+    files = find_markdown_files(vault)
+    similar_input = {}
+
+    def parse_all():
+        for file_path in files:
+            try:
+                parse_frontmatter(file_path)
+            except Exception:
+                pass
+
+    def tag_scan():
+        similar_input["tags"] = analyze_tags.scan_vault(vault)["tag_frequency"].keys()
+
+    def similar_tags():
+        if "tags" not in similar_input:
+            tag_scan()
+        analyze_tags.find_similar_tags(similar_input["tags"], threshold=0.75)
+
+    def tag_fixer():
+        # Dry run, so the vault stays identical between rounds
+        fixer = TagFixer(vault, dry_run=True)
+        fixer.run([strip_hash_prefix, tag_remover(pattern=r".*-3$")])
+
+    return {
+        "parse_frontmatter": parse_all,
+        "search_notes": lambda: frontmatter_search_notes(
+            vault, [{"property": "tags", "operator": "contains", "value": "project"}]),
+        "list_property_values": lambda: list_property_values(vault, "tags"),
+        "scan_vault": tag_scan,
+        "find_similar_tags": similar_tags,
+        "tag_fixer": tag_fixer,
+        "toolkit_search_notes": lambda: search_notes.search_notes(vault, "project"),
+    }
+
+
+def time_benchmark(func, repeat):
+    """Run func repeat times with its output silenced; return the durations."""
+    runs = []
+    with open(os.devnull, "w") as devnull:
+        for _ in range(repeat):
+            with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+                start = time.perf_counter()
+                func()
+                runs.append(time.perf_counter() - start)
+    return runs
+
+
+def git_revision():
+    """Return the current commit of the scripts, if they are in a git checkout."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(sizes, names, repeat, workdir, options):
+    """Time each benchmark on a synthetic vault of each size."""
+    results = []
+    for notes in sizes:
+        vault = prepare_vault(workdir, notes, options)
+        benchmarks = make_benchmarks(vault)
+        for name in names:
+            runs = time_benchmark(benchmarks[name], repeat)
+            best = min(runs)
+            results.append({
+                "notes": notes,
+                "benchmark": name,
+                "best_seconds": round(best, 6),
+                "mean_seconds": round(sum(runs) / len(runs), 6),
+                "runs": [round(run, 6) for run in runs],
+                "notes_per_second": round(notes / best, 1) if best else None,
+            })
+            print(f"{notes:>8} notes  {name:<22} {best:>10.3f}s", file=sys.stderr)
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "vault_options": options,
+        "results": results,
+    }
+
+
+def format_results_table(report):
+    """Format benchmark results as a table."""
+    output = []
+    output.append(f"\nRevision: {report['revision'] or 'unknown'}  Python {report['python']}  {report['platform']}\n")
+    output.append("=" * 80)
+    output.append(f"{'Notes':>8}  {'Benchmark':<22} {'Best (s)':>12} {'Mean (s)':>12} {'Notes/s':>14}")
+    output.append("=" * 80)
+    for result in report["results"]:
+        rate = result["notes_per_second"] or 0
+        output.append(f"{result['notes']:>8}  {result['benchmark']:<22} {result['best_seconds']:>12.3f} "
+                      f"{result['mean_seconds']:>12.3f} {rate:>14,.0f}")
+    output.append("=" * 80)
+    return "\n".join(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Obsidian scripts on synthetic vaults",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Full run at 1k, 10k and 100k notes, saved for later comparison
+  %(prog)s --output bench-results.json
+
+  # Quick check of the tag tools on a small vault
+  %(prog)s --sizes 1000 --only scan_vault find_similar_tags tag_fixer
+        """
+    )
+
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Vault sizes in notes (default: 1000 10000 100000)")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, metavar="NAME",
+                        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Rounds per benchmark; the best round is reported (default: 3)")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "obsidian-bench"),
+                        help="Where generated vaults are kept and reused")
+    parser.add_argument("--shape", choices=SHAPES, default="obsidian", help="Frontmatter shape (default: obsidian)")
+    parser.add_argument("--depth", type=int, default=3, help="Maximum folder nesting (default: 3)")
+    parser.add_argument("--body-words", type=int, default=300, help="Average body length in words (default: 300)")
+    parser.add_argument("--tag-density", type=float, default=1.0, help="Inline tags per 100 body words (default: 1.0)")
+    parser.add_argument("--seed", type=int, default=42, help="Vault generator seed (default: 42)")
+    parser.add_argument("--format", choices=["json", "table"], default="table", help="Output format (default: table)")
+    parser.add_argument("--output", help="Also save the JSON results to this file")
+
+    args = parser.parse_args()
+
+    options = {
+        "depth": args.depth,
+        "shape": args.shape,
+        "tag_density": args.tag_density,
+        "body_words": args.body_words,
+        "seed": args.seed,
+    }
+    os.makedirs(args.workdir, exist_ok=True)
+    report = run_benchmarks(args.sizes, args.only or BENCHMARKS, args.repeat, args.workdir, options)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to: {args.output}", file=sys.stderr)
+
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_results_table(report))
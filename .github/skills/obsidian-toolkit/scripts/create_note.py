@@ -2,6 +2,9 @@ import argparse
 import os
 import sys
 
+import frontmatter_lib  # noqa: F401  (makes the obsidian-frontmatter helpers importable)
+from note_writer import atomic_write
+
 def create_note(vault_path, note_name, content, overwrite=False):
     # Ensure .md extension
     if not note_name.endswith('.md'):
@@ -18,8 +21,7 @@ def create_note(vault_path, note_name, content, overwrite=False):
     os.makedirs(os.path.dirname(full_path), exist_ok=True)
     
     try:
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        atomic_write(full_path, content)
         print(f"Successfully created note: {full_path}")
     except Exception as e:
         print(f"Error creating note: {e}")
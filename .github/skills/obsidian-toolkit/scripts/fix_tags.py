@@ -1,4 +1,5 @@
 import argparse
+import contextlib
 import os
 import sys
 import re
@@ -10,35 +11,152 @@ except ImportError:
     print("Error: PyYAML is required. Install with: pip install PyYAML")
     sys.exit(1)
 
+import frontmatter_lib  # noqa: F401  (makes the obsidian-frontmatter helpers importable)
+from vault_walk import walk_markdown
+from changeset import delete_edit, make_record, set_edit, write_changeset
+from frontmatter_edit import splice_frontmatter
+from note_writer import NoteTransaction, warn_pending
+from yaml_backend import load_yaml
+
+
+def rebuild_content(frontmatter, metadata, body):
+    """Put a note back together, rewriting only the frontmatter lines that changed."""
+    new_frontmatter = splice_frontmatter(frontmatter, metadata)
+    if new_frontmatter is not None:
+        return f"---{new_frontmatter}---{body}"
+    new_frontmatter = yaml.dump(metadata, allow_unicode=True, sort_keys=False)
+    return f"---\n{new_frontmatter}---{body}"
+
+
+def strip_hash_prefix(metadata, changes):
+    """Transform: fix tags written with a # prefix in frontmatter (#tag → tag)."""
+    tags = metadata['tags']
+    modified = False
+    
+    if isinstance(tags, list):
+        new_tags = []
+        for tag in tags:
+            tag_str = str(tag).strip()
+            if tag_str.startswith('#'):
+                old_tag = tag_str
+                new_tag = tag_str.lstrip('#')
+                new_tags.append(new_tag)
+                changes.append(f"Tag: {old_tag} → {new_tag}")
+                modified = True
+            else:
+                new_tags.append(tag_str)
+        
+        if modified:
+            metadata['tags'] = new_tags
+    
+    elif isinstance(tags, str):
+        if tags.startswith('#'):
+            old_tag = tags
+            new_tag = tags.lstrip('#')
+            metadata['tags'] = new_tag
+            changes.append(f"Tag: {old_tag} → {new_tag}")
+            modified = True
+    
+    return modified
+
+
+def tag_remover(tags_to_remove=None, pattern=None):
+    """Return a transform removing specific tags and tags matching a pattern."""
+    pattern_re = re.compile(pattern) if pattern else None
+    
+    def should_remove(tag_str):
+        if tags_to_remove and tag_str in tags_to_remove:
+            return True
+        return bool(pattern_re and pattern_re.match(tag_str))
+    
+    def remove_tags(metadata, changes):
+        tags = metadata['tags']
+        modified = False
+        
+        if isinstance(tags, list):
+            new_tags = []
+            for tag in tags:
+                tag_str = str(tag).strip()
+                if should_remove(tag_str):
+                    changes.append(f"Removed tag: {tag_str}")
+                    modified = True
+                else:
+                    new_tags.append(tag_str)
+            
+            if modified:
+                if new_tags:
+                    metadata['tags'] = new_tags
+                else:
+                    # Remove tags key if no tags left
+                    del metadata['tags']
+        
+        elif isinstance(tags, str):
+            tag_str = tags.strip()
+            if should_remove(tag_str):
+                changes.append(f"Removed tag: {tag_str}")
+                del metadata['tags']
+                modified = True
+        
+        return modified
+    
+    return remove_tags
+
 
 class TagFixer:
-    def __init__(self, vault_path, dry_run=False, verbose=False):
+    def __init__(self, vault_path, dry_run=False, verbose=False, plan=False):
         self.vault_path = vault_path
-        self.dry_run = dry_run
+        # Planning never writes notes; the edits go to a changeset instead
+        self.dry_run = dry_run or plan
         self.verbose = verbose
         self.changes = defaultdict(list)
+        # Changeset records of the planned notes when planning
+        self.planned = [] if plan else None
         
+    def begin_transaction(self):
+        """Start collecting a pass's rewrites (see note_writer.py); a no-op in dry-run mode."""
+        if self.dry_run:
+            return contextlib.nullcontext()
+        warn_pending(self.vault_path)
+        return NoteTransaction(self.vault_path)
+    
+    def write_changeset(self, output_path):
+        """Write the planned tag edits as a changeset for changeset.py; return the note count."""
+        return write_changeset(output_path, self.vault_path, self.planned, "fix_tags")
+    
     def log(self, message, force=False):
         """Log message if verbose or force is True."""
         if self.verbose or force:
             print(message)
     
-    def fix_formatting_issues(self):
-        """Fix tag formatting issues like #tag in frontmatter."""
+    def run(self, transforms):
+        """Apply a chain of tag transforms to the vault in one pass.
+        
+        Each note is read and parsed once, its frontmatter goes through every
+        transform in order, and it is written (or planned) once if any of
+        them changed it. A transform takes (metadata, changes), edits
+        metadata['tags'] in place, appends a description of each change to
+        changes and returns True if it changed anything.
+        
+        The modified notes are written together at the end of the pass; if
+        that fails, the OSError is raised and no note is changed.
+        
+        Returns:
+            Number of notes modified
+        """
         files_modified = 0
+        staged = []
+        # changeset.py hashes notes read as strict UTF-8, so a planned note
+        # must be read the same way or it could never be applied
+        errors = 'strict' if self.planned is not None else 'ignore'
         
-        for root, dirs, files in os.walk(self.vault_path):
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                if not file.endswith('.md'):
-                    continue
-                    
-                full_path = os.path.join(root, file)
+        # Every modified note is written together when the block exits
+        with self.begin_transaction() as transaction:
+            for entry in walk_markdown(self.vault_path):
+                full_path = entry.path
                 rel_path = os.path.relpath(full_path, self.vault_path)
                 
                 try:
-                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    with open(full_path, 'r', encoding='utf-8', errors=errors) as f:
                         content = f.read()
                     
                     # Check if file has frontmatter
@@ -55,166 +173,55 @@ class TagFixer:
                     
                     # Parse frontmatter
                     try:
-                        metadata = yaml.safe_load(frontmatter)
+                        metadata = load_yaml(frontmatter)
                     except yaml.YAMLError:
                         continue
                     
                     if not metadata or 'tags' not in metadata:
                         continue
                     
-                    # Fix tags with # prefix
-                    tags = metadata['tags']
                     modified = False
-                    
-                    if isinstance(tags, list):
-                        new_tags = []
-                        for tag in tags:
-                            tag_str = str(tag).strip()
-                            if tag_str.startswith('#'):
-                                old_tag = tag_str
-                                new_tag = tag_str.lstrip('#')
-                                new_tags.append(new_tag)
-                                self.changes[rel_path].append(f"Tag: {old_tag} → {new_tag}")
-                                modified = True
-                            else:
-                                new_tags.append(tag_str)
-                        
-                        if modified:
-                            metadata['tags'] = new_tags
-                    
-                    elif isinstance(tags, str):
-                        if tags.startswith('#'):
-                            old_tag = tags
-                            new_tag = tags.lstrip('#')
-                            metadata['tags'] = new_tag
-                            self.changes[rel_path].append(f"Tag: {old_tag} → {new_tag}")
+                    for transform in transforms:
+                        if 'tags' not in metadata:
+                            # An earlier transform removed every tag
+                            break
+                        if transform(metadata, self.changes[rel_path]):
                             modified = True
+                    if not self.changes[rel_path]:
+                        del self.changes[rel_path]
                     
                     if modified:
                         files_modified += 1
                         
+                        if self.planned is not None:
+                            edit = set_edit("tags", metadata["tags"]) if "tags" in metadata else delete_edit("tags")
+                            self.planned.append(make_record(self.vault_path, full_path, content, [edit]))
+                        
                         if not self.dry_run:
                             # Reconstruct file
-                            new_frontmatter = yaml.dump(metadata, allow_unicode=True, sort_keys=False)
-                            new_content = f"---\n{new_frontmatter}---{body}"
-                            
-                            with open(full_path, 'w', encoding='utf-8') as f:
-                                f.write(new_content)
-                            
-                            self.log(f"✓ Fixed: {rel_path}")
+                            new_content = rebuild_content(frontmatter, metadata, body)
+                            transaction.stage(full_path, new_content)
+                            staged.append(rel_path)
                         else:
-                            self.log(f"[DRY RUN] Would fix: {rel_path}")
+                            self.log(f"[DRY RUN] Would modify: {rel_path}")
                 
                 except Exception as e:
                     self.log(f"Warning: Could not process {rel_path}: {e}", force=True)
         
+        for rel_path in staged:
+            self.log(f"✓ Modified: {rel_path}")
+    
         return files_modified
     
+    def fix_formatting_issues(self):
+        """Fix tag formatting issues like #tag in frontmatter."""
+        return self.run([strip_hash_prefix])
+    
     def remove_tags(self, tags_to_remove=None, pattern=None):
         """Remove specific tags or tags matching a pattern."""
         if not tags_to_remove and not pattern:
             return 0
-        
-        files_modified = 0
-        pattern_re = re.compile(pattern) if pattern else None
-        
-        for root, dirs, files in os.walk(self.vault_path):
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                if not file.endswith('.md'):
-                    continue
-                    
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, self.vault_path)
-                
-                try:
-                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                    
-                    # Check if file has frontmatter
-                    if not content.startswith('---'):
-                        continue
-                    
-                    # Split frontmatter and body
-                    parts = content.split('---', 2)
-                    if len(parts) < 3:
-                        continue
-                    
-                    frontmatter = parts[1]
-                    body = parts[2]
-                    
-                    # Parse frontmatter
-                    try:
-                        metadata = yaml.safe_load(frontmatter)
-                    except yaml.YAMLError:
-                        continue
-                    
-                    if not metadata or 'tags' not in metadata:
-                        continue
-                    
-                    # Remove specified tags
-                    tags = metadata['tags']
-                    modified = False
-                    
-                    if isinstance(tags, list):
-                        new_tags = []
-                        for tag in tags:
-                            tag_str = str(tag).strip()
-                            should_remove = False
-                            
-                            # Check if tag should be removed
-                            if tags_to_remove and tag_str in tags_to_remove:
-                                should_remove = True
-                            elif pattern_re and pattern_re.match(tag_str):
-                                should_remove = True
-                            
-                            if should_remove:
-                                self.changes[rel_path].append(f"Removed tag: {tag_str}")
-                                modified = True
-                            else:
-                                new_tags.append(tag_str)
-                        
-                        if modified:
-                            if new_tags:
-                                metadata['tags'] = new_tags
-                            else:
-                                # Remove tags key if no tags left
-                                del metadata['tags']
-                    
-                    elif isinstance(tags, str):
-                        tag_str = tags.strip()
-                        should_remove = False
-                        
-                        if tags_to_remove and tag_str in tags_to_remove:
-                            should_remove = True
-                        elif pattern_re and pattern_re.match(tag_str):
-                            should_remove = True
-                        
-                        if should_remove:
-                            self.changes[rel_path].append(f"Removed tag: {tag_str}")
-                            del metadata['tags']
-                            modified = True
-                    
-                    if modified:
-                        files_modified += 1
-                        
-                        if not self.dry_run:
-                            # Reconstruct file
-                            new_frontmatter = yaml.dump(metadata, allow_unicode=True, sort_keys=False)
-                            new_content = f"---\n{new_frontmatter}---{body}"
-                            
-                            with open(full_path, 'w', encoding='utf-8') as f:
-                                f.write(new_content)
-                            
-                            self.log(f"✓ Modified: {rel_path}")
-                        else:
-                            self.log(f"[DRY RUN] Would modify: {rel_path}")
-                
-                except Exception as e:
-                    self.log(f"Warning: Could not process {rel_path}: {e}", force=True)
-        
-        return files_modified
+        return self.run([tag_remover(tags_to_remove, pattern)])
     
     def print_summary(self):
         """Print summary of changes."""
@@ -253,6 +260,9 @@ Examples:
   
   # Remove tags matching pattern
   %(prog)s --vault /path/to/vault --remove-pattern "^step-.*" --dry-run
+  
+  # Plan the fixes now and apply them later with obsidian-frontmatter's changeset.py
+  %(prog)s --vault /path/to/vault --fix-format --remove-tags "cate2" --changeset tags.jsonl
         """
     )
     
@@ -262,6 +272,8 @@ Examples:
     parser.add_argument("--remove-pattern", help="Regex pattern for tags to remove")
     parser.add_argument("--dry-run", action="store_true", help="Preview changes without modifying files")
     parser.add_argument("--verbose", action="store_true", help="Show detailed progress")
+    parser.add_argument("--changeset", metavar="FILE",
+                        help="Write the planned edits to a changeset file for changeset.py instead of changing notes")
     
     args = parser.parse_args()
     
@@ -273,14 +285,15 @@ Examples:
         print("Error: Must specify at least one action (--fix-format, --remove-tags, or --remove-pattern)")
         sys.exit(1)
     
-    fixer = TagFixer(args.vault, dry_run=args.dry_run, verbose=args.verbose)
+    fixer = TagFixer(args.vault, dry_run=args.dry_run, verbose=args.verbose, plan=bool(args.changeset))
     
-    total_files = 0
+    # Every requested operation is applied to each note in a single pass
+    transforms = []
     
     # Fix formatting issues
     if args.fix_format:
         print("Fixing tag formatting issues...")
-        total_files += fixer.fix_formatting_issues()
+        transforms.append(strip_hash_prefix)
     
     # Remove tags
     if args.remove_tags or args.remove_pattern:
@@ -292,12 +305,22 @@ Examples:
         if args.remove_pattern:
             print(f"Removing tags matching pattern: {args.remove_pattern}")
         
-        total_files += fixer.remove_tags(tags_to_remove=tags_list, pattern=args.remove_pattern)
+        transforms.append(tag_remover(tags_to_remove=tags_list, pattern=args.remove_pattern))
+    
+    try:
+        total_files = fixer.run(transforms)
+    except OSError as e:
+        print(f"Error: Could not write the modified notes: {e}", file=sys.stderr)
+        sys.exit(1)
     
     # Print summary
     fixer.print_summary()
     
-    if args.dry_run:
+    if args.changeset:
+        count = fixer.write_changeset(args.changeset)
+        print(f"\n📝 Planned changes for {count} files saved to: {args.changeset}")
+        print("Apply them with obsidian-frontmatter's changeset.py")
+    elif args.dry_run:
         print("\n⚠️  DRY RUN MODE - No files were modified")
         print("Remove --dry-run flag to apply changes")
     else:
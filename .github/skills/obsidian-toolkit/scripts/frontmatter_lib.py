@@ -0,0 +1,20 @@
+"""
+Shared helpers from the sibling obsidian-frontmatter skill.
+
+Importing this module makes obsidian-frontmatter/scripts importable, so the
+toolkit parses frontmatter with the same code as the frontmatter scripts.
+"""
+
+import os
+import sys
+
+FRONTMATTER_SCRIPTS = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'obsidian-frontmatter', 'scripts'))
+
+if not os.path.isdir(FRONTMATTER_SCRIPTS):
+    print("Error: obsidian-toolkit requires the obsidian-frontmatter skill next to it "
+          f"(expected {FRONTMATTER_SCRIPTS}).")
+    sys.exit(1)
+
+if FRONTMATTER_SCRIPTS not in sys.path:
+    sys.path.append(FRONTMATTER_SCRIPTS)
@@ -0,0 +1,172 @@
+"""
+Persistent cache of the tags extracted from each note, for analyze_tags.py.
+
+Each note's frontmatter and inline tags are stored in SQLite at
+<vault>/.obsidian/tag-analysis.sqlite, keyed by relative path, mtime and
+size, together with a hash of the note text. A run reads only the notes
+whose mtime or size changed, and re-extracts only those whose text hash
+changed too (a note that was merely touched or checked out again is not
+re-extracted). With verify, every note is read and hashed, which also
+catches edits that keep both mtime and size. Rows of deleted notes are
+dropped.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import frontmatter_lib  # noqa: F401  (makes the obsidian-frontmatter helpers importable)
+from scan import map_chunks
+
+CACHE_DIR = ".obsidian"
+CACHE_FILENAME = "tag-analysis.sqlite"
+
+# Bump when the stored format or the tag extraction rules change; older
+# caches are rebuilt.
+SCHEMA_VERSION = 1
+
+
+def default_cache_path(vault_path):
+    """Return the cache location inside the vault's hidden directory."""
+    return Path(vault_path) / CACHE_DIR / CACHE_FILENAME
+
+
+def content_hash(content):
+    """Return the hash the cache keeps of a note's text."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _read_chunk(chunk, extract):
+    """Worker entry point: read, hash and extract a chunk of notes.
+    
+    chunk holds (file_path, stored hash or None) pairs. A note whose hash
+    matches the stored one is not extracted; its tags come back as None.
+    """
+    results = []
+    for file_path, stored_hash in chunk:
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+            digest = content_hash(content)
+            if digest == stored_hash:
+                results.append((file_path, digest, None, None, None))
+                continue
+            frontmatter_tags, inline_tags = extract(content)
+        except Exception as e:
+            results.append((file_path, None, None, None, str(e)))
+            continue
+        results.append((file_path, digest, frontmatter_tags, inline_tags, None))
+    return results
+
+
+class TagCache:
+    """SQLite-backed cache of per-note tag extraction results."""
+
+    def __init__(self, vault_path, cache_path=None):
+        self.vault_path = str(Path(vault_path).absolute())
+        self.cache_path = Path(cache_path) if cache_path else default_cache_path(vault_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.cache_path))
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS notes")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS notes ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " frontmatter_tags TEXT NOT NULL,"
+            " inline_tags TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def refresh(self, note_paths, extract, verify=False, jobs=1):
+        """Bring the cache up to date and yield every note's tags.
+
+        Args:
+            note_paths: Paths of the vault's markdown files, or their DirEntry
+                objects from the walk, whose cached stat is reused
+            extract: Module-level function returning (frontmatter_tags,
+                inline_tags) for a note's text
+            verify: Read and hash every note, not only those whose mtime or
+                size changed
+            jobs: Number of worker processes reading the changed notes
+
+        Yields:
+            Tuples of (file_path, frontmatter_tags, inline_tags, error), in
+            note_paths order; the tags are None when error is set
+        """
+        stored = {
+            row[0]: row[1:]
+            for row in self.conn.execute(
+                "SELECT path, mtime_ns, size, sha256, frontmatter_tags, inline_tags FROM notes")
+        }
+        entries = []
+        for note_path in note_paths:
+            file_path = os.fspath(note_path)
+            rel_path = os.path.relpath(file_path, self.vault_path)
+            try:
+                stat = note_path.stat() if isinstance(note_path, os.DirEntry) else os.stat(file_path)
+            except OSError:
+                stat = None
+            row = stored.get(rel_path)
+            fresh = (not verify and stat is not None and row is not None
+                     and row[0] == stat.st_mtime_ns and row[1] == stat.st_size)
+            entries.append((file_path, rel_path, stat, row, fresh))
+
+        # Changed notes are read lazily, in entries order
+        stale = ((file_path, row[2] if row is not None else None)
+                 for file_path, _, _, row, fresh in entries if not fresh)
+        results = map_chunks(_read_chunk, stale, jobs, extract)
+
+        try:
+            for file_path, rel_path, stat, row, fresh in entries:
+                if fresh:
+                    yield file_path, json.loads(row[3]), json.loads(row[4]), None
+                    continue
+
+                _, digest, frontmatter_tags, inline_tags, error = next(results)
+                if error is not None:
+                    # Not stored, so the note is tried again next time
+                    self.conn.execute("DELETE FROM notes WHERE path = ?", (rel_path,))
+                    yield file_path, None, None, error
+                    continue
+                if frontmatter_tags is None:
+                    # Same text as when it was cached
+                    frontmatter_tags, inline_tags = json.loads(row[3]), json.loads(row[4])
+
+                if stat is None:
+                    self.conn.execute("DELETE FROM notes WHERE path = ?", (rel_path,))
+                else:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO notes"
+                        " (path, mtime_ns, size, sha256, frontmatter_tags, inline_tags)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (rel_path, stat.st_mtime_ns, stat.st_size, digest,
+                         json.dumps(frontmatter_tags, ensure_ascii=False),
+                         json.dumps(inline_tags, ensure_ascii=False))
+                    )
+                yield file_path, frontmatter_tags, inline_tags, None
+
+            seen = {rel_path for _, rel_path, _, _, _ in entries}
+            self.conn.executemany("DELETE FROM notes WHERE path = ?",
+                                  [(path,) for path in stored if path not in seen])
+        finally:
+            results.close()
+            self.conn.commit()
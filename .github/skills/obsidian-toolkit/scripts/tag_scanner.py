@@ -0,0 +1,152 @@
+"""
+Single-pass scanner for inline #tags in Markdown notes.
+
+The note text is walked once: tags are matched in the plain text up to the
+next place code or a comment may open, the scanner skips past that code or
+comment, and carries on from its end. A '#' counts as a tag when it starts a
+word (at the start of a line or after whitespace) outside of:
+
+- the YAML frontmatter block at the top of the note
+- fenced code blocks, indented or not (``` or ~~~, closed by a fence at
+  least as long, or running to the end of the note when unclosed)
+- inline code spans (a run of backticks closed by a run of the same length
+  in the same paragraph)
+- HTML comments (<!-- -->) and Obsidian comments (%% %%)
+
+Because the '#' must start a word, URL fragments (https://example.com/#part),
+heading links ([[Note#Heading]]), headings ('# Title') and escaped hashes
+(\\#) are never tags.
+
+A tag name starts with a letter and continues with letters, digits, '_', '-'
+and '/'. Letters are any Unicode letters, so tags such as #회의/주간 are
+found as Obsidian shows them.
+"""
+
+import functools
+import re
+
+# A '#' at the start of a word and the tag name after it. The check on the
+# character before the '#' comes after it so that the regex engine can still
+# search for the '#' itself quickly.
+_TAG_RE = re.compile(r"#(?<!\S#)([^\W\d_][\w\-/]*)")
+_RUN_RE = {"`": re.compile(r"`+"), "~": re.compile(r"~+")}
+
+# First characters of code fences and spans and of comments. They are
+# searched for one by one, which is much faster than searching for the
+# longer openers, and each hit is then checked.
+_OPENERS = "`~<%"
+
+_FRONTMATTER_OPEN_RE = re.compile(r"---[^\S\n]*\n")
+_FRONTMATTER_CLOSE_RE = re.compile(r"^---[^\S\n]*$", re.MULTILINE)
+_PARAGRAPH_END_RE = re.compile(r"\n[^\S\n]*\n")
+
+_COMMENT_CLOSE = {"<!--": "-->", "%%": "%%"}
+
+
+@functools.lru_cache(maxsize=None)
+def _fence_close_re(fence):
+    """A closing fence for an opening fence of the given characters."""
+    return re.compile(rf"^[^\S\n]*{re.escape(fence[0])}{{{len(fence)},}}[^\S\n]*$", re.MULTILINE)
+
+
+def frontmatter_end(content):
+    """Return the offset just past the frontmatter block (0 if the note has none)."""
+    opening = _FRONTMATTER_OPEN_RE.match(content)
+    if not opening:
+        return 0
+    closing = _FRONTMATTER_CLOSE_RE.search(content, opening.end())
+    if not closing:
+        return 0
+    return closing.end()
+
+
+def _plain_spans(content):
+    """Yield (start, end) offsets of the note text outside frontmatter, code and comments."""
+    pos = frontmatter_end(content)
+    end = len(content)
+    find = content.find
+    # Next offset of each opener, refreshed once pos passes it (-1: none left)
+    upcoming = {char: find(char, pos) for char in _OPENERS}
+
+    while pos < end:
+        start, char = end, None
+        for candidate, at in upcoming.items():
+            if 0 <= at < pos:
+                at = upcoming[candidate] = find(candidate, pos)
+            if 0 <= at < start:
+                start, char = at, candidate
+
+        yield pos, start
+        if char is None:
+            return
+        pos = start + 1
+
+        if char in "<%":
+            comment = "<!--" if char == "<" else "%%"
+            if content.startswith(comment, start):
+                closing = find(_COMMENT_CLOSE[comment], start + len(comment))
+                if closing == -1:
+                    return
+                pos = closing + len(_COMMENT_CLOSE[comment])
+            continue
+
+        run = _RUN_RE[char].match(content, start).group()
+        pos = start + len(run)
+        line_start = content.rfind("\n", 0, start) + 1
+        if len(run) >= 3 and not content[line_start:start].strip():
+            opening_end = find("\n", pos)
+            if opening_end == -1:
+                # Fence line at the very end of the note
+                opening_end = end
+            if char == "~" or "`" not in content[pos:opening_end]:
+                closing = _fence_close_re(run).search(content, opening_end)
+                if not closing:
+                    return
+                pos = closing.end()
+                continue
+            # Backticks in the info string: not a fence but inline code
+        if char == "`":
+            pos = _skip_code(content, start, run)
+
+
+def scan_inline_tags(content):
+    """Yield the inline tags of a note in order.
+
+    Args:
+        content: Full note text, including any frontmatter
+
+    Yields:
+        Tuples of (tag, line, offset): the tag name without '#', its 1-based
+        line number and the offset of its '#' in content
+    """
+    line = 1
+    counted = 0  # line is the line number at offset counted
+    for start, end in _plain_spans(content):
+        for match in _TAG_RE.finditer(content, start, end):
+            offset = match.start()
+            line += content.count("\n", counted, offset)
+            counted = offset
+            yield match.group(1), line, offset
+
+
+def _skip_code(content, start, ticks):
+    """Return the offset past the code span opened at start, or past the
+    backticks alone when the span is not closed within its paragraph."""
+    after = start + len(ticks)
+    pos = content.find("`", after)
+    while pos != -1:
+        run_end = _RUN_RE["`"].match(content, pos).end()
+        if run_end - pos == len(ticks):
+            if _PARAGRAPH_END_RE.search(content, after, pos):
+                break
+            return run_end
+        pos = content.find("`", run_end)
+    return after
+
+
+def extract_inline_tags(content):
+    """Return the inline tags of a note, in order, without the '#'."""
+    tags = []
+    for start, end in _plain_spans(content):
+        tags.extend(_TAG_RE.findall(content, start, end))
+    return tags
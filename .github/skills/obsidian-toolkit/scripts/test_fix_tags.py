@@ -0,0 +1,53 @@
+"""
+Tests for fix_tags.py: planning tag fixes into a changeset and applying it.
+
+Run with: python -m pytest .github/skills/obsidian-toolkit/scripts
+"""
+
+import pytest
+
+import frontmatter_lib  # noqa: F401  (makes the obsidian-frontmatter helpers importable)
+from changeset import apply_changeset
+from fix_tags import TagFixer, strip_hash_prefix, tag_remover
+
+
+@pytest.fixture
+def vault(tmp_path):
+    root = tmp_path / "vault"
+    (root / ".obsidian").mkdir(parents=True)
+    (root / "a.md").write_text("---\ntags:\n  - '#one'\n  - two\n---\nBody\n", encoding="utf-8")
+    (root / "b.md").write_text("---\ntags: [two, old-3]\n---\n", encoding="utf-8")
+    (root / "c.md").write_text("---\ntags: [keep]\n---\n", encoding="utf-8")
+    return root
+
+
+def _notes(folder):
+    return {path.name: path.read_bytes() for path in sorted(folder.glob("*.md"))}
+
+
+def test_plan_then_apply_matches_a_direct_run(tmp_path, vault):
+    transforms = [strip_hash_prefix, tag_remover(pattern=r".*-3$")]
+    direct = tmp_path / "direct"
+    direct.mkdir()
+    for name, content in _notes(vault).items():
+        (direct / name).write_bytes(content)
+
+    planner = TagFixer(str(vault), plan=True)
+    assert planner.run(transforms) == 2
+    changeset = tmp_path / "tags.jsonl"
+    assert planner.write_changeset(str(changeset)) == 2
+    assert {status for _, status, _ in apply_changeset(str(changeset))} == {"applied"}
+
+    assert TagFixer(str(direct)).run(transforms) == 2
+    assert _notes(vault) == _notes(direct)
+
+
+def test_plan_skips_notes_that_are_not_utf8(tmp_path, vault, capsys):
+    (vault / "bad.md").write_bytes(b"---\ntags: ['#x']\n---\n\xff\n")
+
+    planner = TagFixer(str(vault), plan=True)
+    planner.run([strip_hash_prefix])
+    assert "Could not process bad.md" in capsys.readouterr().out
+    changeset = tmp_path / "tags.jsonl"
+    assert planner.write_changeset(str(changeset)) == 1
+    assert list(apply_changeset(str(changeset))) == [("a.md", "applied", None)]
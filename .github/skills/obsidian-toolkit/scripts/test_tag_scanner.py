@@ -0,0 +1,69 @@
+"""
+Tests for tag_scanner.py: which '#' words count as inline tags.
+
+Run with: python -m pytest .github/skills/obsidian-toolkit/scripts
+"""
+
+import pytest
+
+from tag_scanner import extract_inline_tags, frontmatter_end, scan_inline_tags
+
+
+@pytest.mark.parametrize("content, expected", [
+    # Fenced code blocks
+    ("```\n#no\n```\n#yes", ["yes"]),
+    ("~~~\n#no\n~~~\n#yes", ["yes"]),
+    ("````\n```\n#no\n````\n#yes", ["yes"]),
+    ("```\n#no\n~~~\n#no\n```\n#yes", ["yes"]),
+    ("  ```python\n  #no\n  ```\n#yes", ["yes"]),
+    ("```\n#no", []),
+    ("#yes\n```python", ["yes"]),
+    ("```python #no", []),
+    ("a\n~~~ `x` #no", []),
+    # Backticks in the info string: inline code, not a fence
+    ("``` `x` #yes", ["yes"]),
+    ("a\n``` `x` #yes", ["yes"]),
+    ("``` `x` #yes\n#also", ["yes", "also"]),
+    ("a ```\n#no\n``` #yes", ["yes"]),
+    # Inline code spans
+    ("`#no` #yes", ["yes"]),
+    ("``#no ` #no`` #yes", ["yes"]),
+    ("` #yes", ["yes"]),
+    ("`a\n\n#yes`", ["yes"]),
+    ("`a\n#no` #yes", ["yes"]),
+    ("``a` #yes", ["yes"]),
+    # Comments
+    ("<!-- #no --> #yes", ["yes"]),
+    ("<!--\n#no\n-->\n#yes", ["yes"]),
+    ("%% #no %% #yes", ["yes"]),
+    ("%%\n#no\n%%\n#yes", ["yes"]),
+    ("<!-- #no", []),
+    ("%% #no", []),
+    ("<b> #yes % 5 #also", ["yes", "also"]),
+    # Tags start a word
+    ("#yes a#no [[Note#no]] https://x.com/#no \\#no", ["yes"]),
+    ("# Heading\n#yes", ["yes"]),
+    ("#1no #_no #-no #yes-1/sub_x", ["yes-1/sub_x"]),
+    ("#회의/주간 (#no", ["회의/주간"]),
+])
+def test_extract_inline_tags(content, expected):
+    assert extract_inline_tags(content) == expected
+
+
+def test_frontmatter_is_skipped():
+    content = "---\ntags: [a]\ncomment: '#no'\n---\n#yes"
+    assert frontmatter_end(content) == len(content) - len("\n#yes")
+    assert extract_inline_tags(content) == ["yes"]
+
+
+@pytest.mark.parametrize("content", ["---\n#yes", "--- #yes", "text\n---\n#yes\n---"])
+def test_unclosed_or_late_frontmatter_is_text(content):
+    assert "yes" in extract_inline_tags(content)
+
+
+def test_scan_reports_lines_and_offsets():
+    content = "---\na: 1\n---\n#one\n```\n#no\n```\ntext #two `#no` #three"
+    found = list(scan_inline_tags(content))
+    assert [(tag, line) for tag, line, _ in found] == [("one", 4), ("two", 8), ("three", 8)]
+    assert all(content[offset] == "#" and content[offset + 1:].startswith(tag)
+               for tag, _, offset in found)
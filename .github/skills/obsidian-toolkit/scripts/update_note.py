@@ -2,6 +2,9 @@ import argparse
 import os
 import sys
 
+import frontmatter_lib  # noqa: F401  (makes the obsidian-frontmatter helpers importable)
+from note_writer import atomic_write
+
 def update_note(vault_path, note_name, content, mode='append'):
     # Ensure .md extension
     if not note_name.endswith('.md'):
@@ -14,18 +17,22 @@ def update_note(vault_path, note_name, content, mode='append'):
         sys.exit(1)
         
     try:
-        file_mode = 'a' if mode == 'append' else 'w'
         # Add a newline before appending if not empty and adhering to markdown style
+        existing = ""
         prefix = ""
         if mode == 'append':
              # check if file ends with newline
-             with open(full_path, 'r', encoding='utf-8') as check_f:
+             with open(full_path, 'r', encoding='utf-8', newline='') as check_f:
                  existing = check_f.read()
                  if existing and not existing.endswith('\n'):
                      prefix = "\n"
 
-        with open(full_path, file_mode, encoding='utf-8') as f:
-            f.write(prefix + content)
+        # Rewrite the whole note through a temp file, so a crash never truncates it;
+        # existing text is read and written untranslated so its line endings stay
+        if mode == 'append':
+            atomic_write(full_path, existing + prefix + content, newline='')
+        else:
+            atomic_write(full_path, content)
             
         print(f"Successfully updated note: {full_path} (mode: {mode})")
     except Exception as e: